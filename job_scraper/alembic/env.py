@@ -7,9 +7,13 @@ from alembic import context
 # Import all models so Alembic can detect them
 from src.hoarder.models import Base  # noqa: E402
 from src.hoarder.models.company import Company  # noqa: E402, F401
+from src.hoarder.models.compression_dictionary import CompressionDictionary  # noqa: E402, F401
 from src.hoarder.models.job_page import JobPage  # noqa: E402, F401
 from src.hoarder.models.job_post import JobPost  # noqa: E402, F401
+from src.hoarder.models.page_blob import PageBlob  # noqa: E402, F401
 from src.hoarder.models.summarized_job import SummarizedJob  # noqa: E402, F401
+from src.hoarder.models.summary_cache_entry import SummaryCacheEntry  # noqa: E402, F401
+from src.hoarder.models.task_outbox import TaskOutbox  # noqa: E402, F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,124 @@
+"""Move page HTML into compressed, content-addressed page_blob table
+
+Revision ID: a3c91f5e7d20
+Revises: e598cd96fac0
+Create Date: 2026-10-18 09:12:41.208315
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import zstandard
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c91f5e7d20"
+down_revision: Union[str, Sequence[str], None] = "e598cd96fac0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COMPRESSION_LEVEL = 10
+BATCH_SIZE = 200
+
+page_blob = sa.table(
+    "page_blob",
+    sa.column("sha256", sa.String),
+    sa.column("compression", sa.String),
+    sa.column("size", sa.Integer),
+    sa.column("compressed_size", sa.Integer),
+    sa.column("data", sa.LargeBinary),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "page_blob",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("compression", sa.String(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("compressed_size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.add_column(sa.Column("html_sha256", sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column("html_size", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("html_compression", sa.String(), nullable=True))
+
+    # Move existing HTML into page_blob, a batch of rows at a time
+    conn = op.get_bind()
+    compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+    stored: set[str] = set()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT page_id, page_html FROM job_page "
+                "WHERE page_id > :last_id ORDER BY page_id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+
+        for page_id, page_html in rows:
+            raw = page_html.encode("utf-8")
+            sha256 = hashlib.sha256(raw).hexdigest()
+            if sha256 not in stored:
+                data = compressor.compress(raw)
+                conn.execute(
+                    page_blob.insert().values(
+                        sha256=sha256,
+                        compression="zstd",
+                        size=len(raw),
+                        compressed_size=len(data),
+                        data=data,
+                    )
+                )
+                stored.add(sha256)
+            conn.execute(
+                sa.text(
+                    "UPDATE job_page SET html_sha256 = :sha256, html_size = :size, "
+                    "html_compression = 'zstd' WHERE page_id = :page_id"
+                ),
+                {"sha256": sha256, "size": len(raw), "page_id": page_id},
+            )
+        last_id = rows[-1].page_id
+
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.alter_column("html_sha256", existing_type=sa.String(length=64), nullable=False)
+        batch_op.alter_column("html_size", existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column("html_compression", existing_type=sa.String(), nullable=False)
+        batch_op.create_foreign_key(
+            "fk_job_page_html_sha256_page_blob", "page_blob", ["html_sha256"], ["sha256"]
+        )
+        batch_op.create_index("ix_job_page_html_sha256", ["html_sha256"])
+        batch_op.drop_column("page_html")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.add_column(sa.Column("page_html", sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    decompressor = zstandard.ZstdDecompressor()
+    blobs = conn.execute(sa.text("SELECT sha256, data FROM page_blob"))
+    for sha256, data in blobs.fetchall():
+        conn.execute(
+            sa.text("UPDATE job_page SET page_html = :page_html WHERE html_sha256 = :sha256"),
+            {"page_html": decompressor.decompress(data).decode("utf-8"), "sha256": sha256},
+        )
+
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.alter_column("page_html", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_index("ix_job_page_html_sha256")
+        batch_op.drop_constraint("fk_job_page_html_sha256_page_blob", type_="foreignkey")
+        batch_op.drop_column("html_compression")
+        batch_op.drop_column("html_size")
+        batch_op.drop_column("html_sha256")
+    op.drop_table("page_blob")
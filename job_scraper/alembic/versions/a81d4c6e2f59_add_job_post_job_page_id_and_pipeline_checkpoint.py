@@ -0,0 +1,55 @@
+"""Add job_post.job_page_id and pipeline_checkpoint table
+
+Revision ID: a81d4c6e2f59
+Revises: f2a7c5e91d36
+Create Date: 2026-10-18 18:02:41.118530
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a81d4c6e2f59"
+down_revision: Union[str, Sequence[str], None] = "f2a7c5e91d36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("job_post") as batch_op:
+        batch_op.add_column(sa.Column("job_page_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_job_post_job_page_id_job_page",
+            "job_page",
+            ["job_page_id"],
+            ["page_id"],
+            ondelete="SET NULL",
+        )
+        batch_op.create_index("ix_job_post_job_page_id", ["job_page_id"], unique=True)
+
+    op.create_table(
+        "pipeline_checkpoint",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("last_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("pipeline_checkpoint")
+    with op.batch_alter_table("job_post") as batch_op:
+        batch_op.drop_index("ix_job_post_job_page_id")
+        batch_op.drop_constraint("fk_job_post_job_page_id_job_page", type_="foreignkey")
+        batch_op.drop_column("job_page_id")
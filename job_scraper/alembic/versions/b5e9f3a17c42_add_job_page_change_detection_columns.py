@@ -0,0 +1,35 @@
+"""Add job_page etag, last_modified and content_sha256
+
+Revision ID: b5e9f3a17c42
+Revises: a81d4c6e2f59
+Create Date: 2026-10-18 19:14:27.530961
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e9f3a17c42"
+down_revision: Union[str, Sequence[str], None] = "a81d4c6e2f59"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.add_column(sa.Column("etag", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("last_modified", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("content_sha256", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.drop_column("content_sha256")
+        batch_op.drop_column("last_modified")
+        batch_op.drop_column("etag")
@@ -0,0 +1,65 @@
+"""Add compression_dictionary table and page_blob.dict_id
+
+Revision ID: b7e2d4a91c63
+Revises: a3c91f5e7d20
+Create Date: 2026-10-18 11:40:07.552190
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2d4a91c63"
+down_revision: Union[str, Sequence[str], None] = "a3c91f5e7d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "compression_dictionary",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("page_blob") as batch_op:
+        batch_op.add_column(sa.Column("dict_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_page_blob_dict_id_compression_dictionary",
+            "compression_dictionary",
+            ["dict_id"],
+            ["id"],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Blobs compressed with a dictionary can't be read without it
+    conn = op.get_bind()
+    in_use = conn.execute(
+        sa.text("SELECT COUNT(*) FROM page_blob WHERE dict_id IS NOT NULL")
+    ).scalar_one()
+    if in_use:
+        raise RuntimeError(
+            f"{in_use} page blobs are compressed with a trained dictionary; "
+            "recompress them without a dictionary before downgrading"
+        )
+
+    with op.batch_alter_table("page_blob") as batch_op:
+        batch_op.drop_constraint(
+            "fk_page_blob_dict_id_compression_dictionary", type_="foreignkey"
+        )
+        batch_op.drop_column("dict_id")
+    op.drop_table("compression_dictionary")
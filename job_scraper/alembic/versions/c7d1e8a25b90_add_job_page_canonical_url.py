@@ -0,0 +1,145 @@
+"""Add job_page.canonical_url and last_seen_at with a unique index per content version
+
+Revision ID: c7d1e8a25b90
+Revises: b5e9f3a17c42
+Create Date: 2026-10-18 20:03:52.184407
+
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d1e8a25b90"
+down_revision: Union[str, Sequence[str], None] = "b5e9f3a17c42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# Frozen copy of src.hoarder.utils.urls.canonicalize_url as of this revision,
+# so later changes to the app's rules don't change what this migration writes
+TRACKING_PARAMS = {
+    "gh_src",
+    "lever-source",
+    "lever-origin",
+    "source",
+    "src",
+    "ref",
+    "referrer",
+    "trk",
+    "trackingid",
+    "refid",
+    "gclid",
+    "fbclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+}
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _canonicalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or "").rstrip(".")
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+        host = parts.netloc.lower()
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name)
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.add_column(sa.Column("canonical_url", sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column("last_seen_at", sa.DateTime(), nullable=True))
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT page_id, url FROM job_page "
+                "WHERE page_id > :last_id ORDER BY page_id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        conn.execute(
+            sa.text("UPDATE job_page SET canonical_url = :canonical_url WHERE page_id = :page_id"),
+            [{"canonical_url": _canonicalize_url(url), "page_id": page_id} for page_id, url in rows],
+        )
+        last_id = rows[-1].page_id
+
+    # Pages stored before change detection have no content hash; key them by
+    # their HTML hash, as the repository does for pages stored without one
+    conn.execute(
+        sa.text("UPDATE job_page SET content_sha256 = html_sha256 WHERE content_sha256 IS NULL")
+    )
+
+    # Captures stored twice before the index existed: keep the newest copy and
+    # delete the older ones, detaching their job posts and dropping blobs
+    # nothing uses any more (as JobPageRepository deletes do)
+    stale = (
+        "SELECT page_id FROM job_page WHERE page_id NOT IN ("
+        "SELECT MAX(page_id) FROM job_page GROUP BY canonical_url, content_sha256)"
+    )
+    conn.execute(sa.text(f"UPDATE job_post SET job_page_id = NULL WHERE job_page_id IN ({stale})"))
+    conn.execute(sa.text(f"DELETE FROM job_page WHERE page_id IN ({stale})"))
+    conn.execute(
+        sa.text("DELETE FROM page_blob WHERE sha256 NOT IN (SELECT html_sha256 FROM job_page)")
+    )
+
+    # Existing pages count as seen now; ties resolve to the newest page_id
+    conn.execute(
+        sa.text("UPDATE job_page SET last_seen_at = :now"),
+        {"now": datetime.now(timezone.utc).replace(tzinfo=None)},
+    )
+
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.alter_column("canonical_url", existing_type=sa.Text(), nullable=False)
+        batch_op.alter_column("last_seen_at", existing_type=sa.DateTime(), nullable=False)
+        batch_op.alter_column("content_sha256", existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index(
+            "uq_job_page_canonical_url_content_sha256",
+            ["canonical_url", "content_sha256"],
+            unique=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.drop_index("uq_job_page_canonical_url_content_sha256")
+        batch_op.alter_column("content_sha256", existing_type=sa.String(length=64), nullable=True)
+        batch_op.drop_column("last_seen_at")
+        batch_op.drop_column("canonical_url")
@@ -0,0 +1,35 @@
+"""Add indexes for company name lookups, job posts by company and cache expiry
+
+Revision ID: d3a8f61c0e47
+Revises: c7d1e8a25b90
+Create Date: 2026-10-18 20:41:16.902733
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a8f61c0e47"
+down_revision: Union[str, Sequence[str], None] = "c7d1e8a25b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Plain CREATE INDEX, not batch mode: SQLite can't reflect expression
+    # indexes, so a batch table rebuild of company would drop this one
+    op.create_index("ix_company_name_lower", "company", [sa.text("lower(name)")])
+    op.create_index("ix_job_post_company_id", "job_post", ["company_id"])
+    op.create_index("ix_summary_cache_created_at", "summary_cache", ["created_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_summary_cache_created_at", table_name="summary_cache")
+    op.drop_index("ix_job_post_company_id", table_name="job_post")
+    op.drop_index("ix_company_name_lower", table_name="company")
@@ -0,0 +1,75 @@
+"""Add company.normalized_name with a unique index, merging duplicate companies
+
+Revision ID: e4b7c2d9a613
+Revises: d3a8f61c0e47
+Create Date: 2026-10-18 21:17:40.551893
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b7c2d9a613"
+down_revision: Union[str, Sequence[str], None] = "d3a8f61c0e47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize_company_name(name: str) -> str:
+    # Frozen copy of src.hoarder.utils.company_names.normalize_company_name as of
+    # this revision, so later changes to the app's rules don't change this migration
+    return " ".join(name.split()).casefold()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The unique index replaces ix_company_name_lower for name lookups. Drop it
+    # before the batch rebuild below, which can't reflect expression indexes.
+    # IF EXISTS: databases migrated while d3a8f61c0e47 skipped it don't have it
+    op.execute("DROP INDEX IF EXISTS ix_company_name_lower")
+
+    with op.batch_alter_table("company") as batch_op:
+        batch_op.add_column(sa.Column("normalized_name", sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, name FROM company ORDER BY id")).fetchall()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE company SET normalized_name = :normalized_name WHERE id = :id"),
+            [{"normalized_name": _normalize_company_name(name), "id": id_} for id_, name in rows],
+        )
+
+    # Companies created twice under different spellings ("Acme", "acme ")
+    # are merged into the oldest one
+    duplicates = sa.text(
+        "SELECT c.id, (SELECT MIN(k.id) FROM company k "
+        "WHERE k.normalized_name = c.normalized_name) AS keep_id "
+        "FROM company c"
+    )
+    merges = [
+        {"id": id_, "keep_id": keep_id}
+        for id_, keep_id in conn.execute(duplicates).fetchall()
+        if id_ != keep_id
+    ]
+    if merges:
+        conn.execute(
+            sa.text("UPDATE job_post SET company_id = :keep_id WHERE company_id = :id"), merges
+        )
+        conn.execute(sa.text("DELETE FROM company WHERE id = :id"), merges)
+
+    with op.batch_alter_table("company") as batch_op:
+        batch_op.alter_column("normalized_name", existing_type=sa.String(), nullable=False)
+        batch_op.create_index("uq_company_normalized_name", ["normalized_name"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("company") as batch_op:
+        batch_op.drop_index("uq_company_normalized_name")
+        batch_op.drop_column("normalized_name")
+
+    op.create_index("ix_company_name_lower", "company", [sa.text("lower(name)")])
@@ -0,0 +1,32 @@
+"""Add job_post.clean_description
+
+Revision ID: e6b3d0f4a127
+Revises: d9a15c7e3b48
+Create Date: 2026-10-18 16:02:47.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e6b3d0f4a127"
+down_revision: Union[str, Sequence[str], None] = "d9a15c7e3b48"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing posts are filled in by `python main.py --clean-descriptions`
+    with op.batch_alter_table("job_post") as batch_op:
+        batch_op.add_column(sa.Column("clean_description", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job_post") as batch_op:
+        batch_op.drop_column("clean_description")
@@ -0,0 +1,31 @@
+"""Add job_post.structured_data
+
+Revision ID: f2a7c5e91d36
+Revises: e6b3d0f4a127
+Create Date: 2026-10-18 17:11:05.602913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a7c5e91d36"
+down_revision: Union[str, Sequence[str], None] = "e6b3d0f4a127"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("job_post") as batch_op:
+        batch_op.add_column(sa.Column("structured_data", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job_post") as batch_op:
+        batch_op.drop_column("structured_data")
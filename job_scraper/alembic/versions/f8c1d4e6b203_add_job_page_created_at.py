@@ -0,0 +1,43 @@
+"""Add job_page.created_at
+
+Revision ID: f8c1d4e6b203
+Revises: e4b7c2d9a613
+Create Date: 2026-10-18 21:52:09.318274
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f8c1d4e6b203"
+down_revision: Union[str, Sequence[str], None] = "e4b7c2d9a613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite can't ALTER TABLE ADD COLUMN with a CURRENT_TIMESTAMP default, so
+    # rebuild the table; existing pages are stamped with the migration time,
+    # which keeps them out of any prune cutoff set before today
+    with op.batch_alter_table("job_page", recreate="always") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "created_at",
+                sa.DateTime(),
+                nullable=False,
+                server_default=sa.func.current_timestamp(),
+            )
+        )
+        batch_op.create_index("ix_job_page_created_at", ["created_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("job_page") as batch_op:
+        batch_op.drop_index("ix_job_page_created_at")
+        batch_op.drop_column("created_at")
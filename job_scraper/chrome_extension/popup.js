@@ -1,5 +1,6 @@
 // API endpoint - update this with your server URL
 const API_URL = 'http://localhost:8000/job-collection/page';
+const API_BATCH_URL = 'http://localhost:8000/job-collection/pages:batch';
 const API_HEALTH_URL = 'http://localhost:8000/'
 
 // DOM elements
@@ -37,18 +38,32 @@ function showStatus(message, isError = false) {
   }, 5000);
 }
 
+// Gzip a JSON payload; page HTML usually shrinks 5-10x
+async function gzipJson(payload) {
+  const stream = new Blob([JSON.stringify(payload)])
+    .stream()
+    .pipeThrough(new CompressionStream('gzip'));
+  return await new Response(stream).arrayBuffer();
+}
+
+// POST a gzip-compressed JSON body
+async function postCompressedJson(endpoint, payload) {
+  return await fetch(endpoint, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      'Content-Encoding': 'gzip',
+    },
+    body: await gzipJson(payload)
+  });
+}
+
 // Save job page to the database
 async function saveJobPage(url, pageHtml) {
   try {
-    const response = await fetch(API_URL, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-      },
-      body: JSON.stringify({
-        url: url,
-        page_html: pageHtml
-      })
+    const response = await postCompressedJson(API_URL, {
+      url: url,
+      page_html: pageHtml
     });
 
     if (!response.ok) {
@@ -59,8 +74,109 @@ async function saveJobPage(url, pageHtml) {
     const data = await response.json();
     return data;
   } catch (error) {
-    throw new Error(`Error: ${error.message}`);
+    throw new Error(`Error: ${error.message}`, { cause: error });
+  }
+}
+
+// Pages that could not reach the API are kept here until the next flush
+const QUEUE_KEY = 'pendingJobPages';
+const MAX_QUEUED_PAGES = 1000;
+// Keep in step with MAX_BATCH_SIZE in src/hoarder/api/job_collection.py
+const MAX_BATCH_SIZE = 100;
+// The server rejects request bodies over MAX_REQUEST_BODY_SIZE (20 MB by default)
+// once decompressed; stay well under it
+const MAX_BATCH_BYTES = 16 * 1024 * 1024;
+
+async function getQueuedPages() {
+  const { [QUEUE_KEY]: queued = [] } = await chrome.storage.local.get(QUEUE_KEY);
+  return queued;
+}
+
+async function queueJobPage(url, pageHtml) {
+  // Only queue what the API will accept, so the queue can always drain
+  if (!/^https?:\/\//.test(url) || !pageHtml.trim()) {
+    throw new Error('API unreachable - only http(s) pages can be queued');
+  }
+  const queued = await getQueuedPages();
+  if (queued.length >= MAX_QUEUED_PAGES) {
+    throw new Error(`API unreachable - offline queue is full (${MAX_QUEUED_PAGES} pages)`);
+  }
+  queued.push({ id: crypto.randomUUID(), url: url, page_html: pageHtml });
+  await chrome.storage.local.set({ [QUEUE_KEY]: queued });
+  return queued.length;
+}
+
+// Drop sent pages by ID, keeping any queued while they were in flight
+async function removeQueuedPages(ids) {
+  const sent = new Set(ids);
+  const queued = await getQueuedPages();
+  await chrome.storage.local.set({ [QUEUE_KEY]: queued.filter((page) => !sent.has(page.id)) });
+}
+
+// Decoded JSON size of a page in a batch request body
+const encoder = new TextEncoder();
+function encodedSize(page) {
+  return encoder.encode(JSON.stringify({ url: page.url, page_html: page.page_html })).length + 1;
+}
+
+// Split pages into batches under MAX_BATCH_SIZE pages and MAX_BATCH_BYTES;
+// a page too large for any batch goes on its own
+function splitBatches(pages) {
+  const batches = [];
+  let batch = [];
+  let batchBytes = 0;
+  for (const page of pages) {
+    const size = encodedSize(page);
+    if (batch.length > 0 && (batch.length >= MAX_BATCH_SIZE || batchBytes + size > MAX_BATCH_BYTES)) {
+      batches.push(batch);
+      batch = [];
+      batchBytes = 0;
+    }
+    batch.push(page);
+    batchBytes += size;
+  }
+  if (batch.length > 0) {
+    batches.push(batch);
   }
+  return batches;
+}
+
+// Send the queued pages in batches; pages the API could not store stay queued
+async function flushQueuedPages() {
+  let queued = await getQueuedPages();
+  if (queued.some((page) => !page.id)) {
+    queued = queued.map((page) => ({ ...page, id: page.id || crypto.randomUUID() }));
+    await chrome.storage.local.set({ [QUEUE_KEY]: queued });
+  }
+
+  let created = 0;
+  for (const batch of splitBatches(queued)) {
+    const response = await postCompressedJson(API_BATCH_URL, {
+      pages: batch.map((page) => ({ url: page.url, page_html: page.page_html }))
+    });
+
+    if (response.status === 413 && batch.length === 1) {
+      // A single page over the server's size limit can never be saved; drop it
+      // so it doesn't block the rest of the queue
+      console.error('Queued job page too large to save, dropping:', batch[0].url);
+      await removeQueuedPages([batch[0].id]);
+      continue;
+    }
+    if (!response.ok) {
+      throw new Error('Failed to flush queued job pages');
+    }
+
+    const data = await response.json();
+    await removeQueuedPages(
+      data.results.filter((result) => result.page_id !== null).map((result) => batch[result.index].id)
+    );
+    if (data.failed > 0) {
+      const errors = data.results.filter((result) => result.error).map((result) => result.error);
+      console.error('Queued job pages not saved, will retry:', errors);
+    }
+    created += data.created;
+  }
+  return created;
 }
 
 // Handle form submission
@@ -89,11 +205,21 @@ form.addEventListener('submit', async (e) => {
       pageHtml = await fetchResponse.text();
     }
 
-    // Save to database
-    const result = await saveJobPage(targetUrl, pageHtml);
-
-    // Show success message
-    showStatus(`✓ Saved! Page ID: ${result.page_id}`, false);
+    // Save to database, queueing the page if the API can't be reached
+    try {
+      const result = await saveJobPage(targetUrl, pageHtml);
+      if (result.duplicate) {
+        showStatus(`✓ Already saved (Page ID: ${result.page_id})`, false);
+      } else {
+        showStatus(`✓ Saved! Page ID: ${result.page_id}`, false);
+      }
+    } catch (error) {
+      if (!(error.cause instanceof TypeError)) {
+        throw error;
+      }
+      const pending = await queueJobPage(targetUrl, pageHtml);
+      showStatus(`API unreachable - queued offline (${pending} pending)`, false);
+    }
 
     // Clear the input
     urlInput.value = '';
@@ -132,8 +258,19 @@ form.addEventListener('submit', async (e) => {
     }
 
     api_connection_status.textContent = "Connected"
+
   } catch (error) {
     api_connection_status.textContent = "Failed to connect"
+    return;
+  }
+
+  try {
+    const flushed = await flushQueuedPages();
+    if (flushed > 0) {
+      showStatus(`✓ Saved ${flushed} queued page(s)`, false);
+    }
+  } catch (error) {
+    showStatus(error.message, true);
   }
 
 })();
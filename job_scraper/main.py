@@ -1,20 +1,93 @@
+import asyncio
+import os
 import subprocess
 import sys
 import typer
-from typing import Optional
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
 
-from src.hoarder.utils.database import get_session
-from src.hoarder.services.scrape_job_webpage import scrape_and_save_job_webpage
+from src.hoarder.utils.database import get_async_session_factory
+from src.hoarder.services.scrape_job_webpage import (
+    ScrapeResult,
+    scrape_and_save_job_webpage,
+    scrape_urls,
+)
+from src.hoarder.models import JobPage, JobPost
+from src.hoarder.services.job_page_service import JobPageService
 from src.hoarder.services.job_service import JobService
+from src.hoarder.services.import_job_pages import import_job_pages
+from src.hoarder.services.description_cleaning import CleaningReport, clean_job_post_descriptions
+from src.hoarder.services.job_page_promotion import JobPagePromotionService, PromotionResult
+from src.hoarder.services.compression_dictionary_service import (
+    CompressionDictionaryService,
+    DictionaryTrainingReport,
+    DEFAULT_SAMPLE_SIZE,
+)
 
 app = typer.Typer(help="Job Scraper - CLI and Web Application")
 
 
+async def _scrape_url(url: str) -> Optional[JobPage]:
+    async with get_async_session_factory()() as session:
+        return await scrape_and_save_job_webpage(url, session)
+
+
+async def _scrape_urls(urls: Iterable[str]) -> list[ScrapeResult]:
+    async with get_async_session_factory()() as session:
+        results = []
+        async for result in scrape_urls(urls, session):
+            if result.page_id is not None:
+                typer.echo(f"  ✓ {result.url} (Page ID: {result.page_id})")
+            else:
+                typer.echo(f"  ✗ {result.url}: {result.error}", err=True)
+            results.append(result)
+        return results
+
+
+async def _create_job_post(company_name: str, job_title: str, job_description: str) -> JobPost:
+    async with get_async_session_factory()() as session:
+        return await JobService(session).create_job_post(
+            company_name=company_name,
+            job_title=job_title,
+            job_description=job_description,
+        )
+
+
+async def _train_dictionary(sample_size: int) -> DictionaryTrainingReport:
+    async with get_async_session_factory()() as session:
+        return await CompressionDictionaryService(session).train(sample_size=sample_size)
+
+
+async def _clean_descriptions() -> list[CleaningReport]:
+    async with get_async_session_factory()() as session:
+        return [report async for report in clean_job_post_descriptions(session)]
+
+
+async def _promote_pages(limit: Optional[int], workers: int) -> list[PromotionResult]:
+    async with get_async_session_factory()() as session:
+        promotion_service = JobPagePromotionService(session)
+        return [
+            result
+            async for result in promotion_service.promote_job_pages(limit=limit, workers=workers)
+        ]
+
+
+async def _prune_pages(cutoff: datetime) -> int:
+    async with get_async_session_factory()() as session:
+        return await JobPageService(session).delete_job_pages_created_before(cutoff)
+
+
 @app.command()
 def main(
     url: Optional[str] = typer.Option(
         None, "--url", "-u", help="URL of the job posting to scrape"
     ),
+    urls_file: Optional[str] = typer.Option(
+        None,
+        "--urls-file",
+        help="Scrape every URL in a file (one per line) concurrently; use - for stdin",
+    ),
     manual: bool = typer.Option(
         False, "--manual", "-m", help="Manually enter job posting information"
     ),
@@ -24,13 +97,64 @@ def main(
         "-s",
         help="Start the Streamlit web application",
     ),
+    import_file: Optional[Path] = typer.Option(
+        None,
+        "--import-file",
+        "-i",
+        help='Bulk import job pages from a JSON lines file of {"url": ..., "page_html": ...}',
+        exists=True,
+        dir_okay=False,
+    ),
+    train_dictionary: bool = typer.Option(
+        False,
+        "--train-dictionary",
+        help="Train a zstd dictionary from stored job pages and use it for new pages",
+    ),
+    sample_size: int = typer.Option(
+        DEFAULT_SAMPLE_SIZE,
+        "--sample-size",
+        help="Number of stored pages to sample for --train-dictionary",
+    ),
+    clean_descriptions: bool = typer.Option(
+        False,
+        "--clean-descriptions",
+        help="Strip boilerplate from job post descriptions saved before cleaning existed",
+    ),
+    promote_pages: bool = typer.Option(
+        False,
+        "--promote-pages",
+        help="Create job posts from saved job pages, resuming after the last promoted page",
+    ),
+    promote_limit: Optional[int] = typer.Option(
+        None,
+        "--promote-limit",
+        help="Maximum number of job pages to look at with --promote-pages",
+    ),
+    workers: int = typer.Option(
+        os.cpu_count() or 1,
+        "--workers",
+        "-w",
+        help="Processes parsing HTML in parallel for --promote-pages",
+    ),
+    prune_pages_before: Optional[datetime] = typer.Option(
+        None,
+        "--prune-pages-before",
+        help="Delete saved job pages captured before this UTC date (job posts are kept)",
+        formats=["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"],
+    ),
 ) -> None:
     """
     Job Scraper Application
 
     Use --start/-s to launch the Streamlit web interface
     Use --url/-u to scrape a job posting from a URL (CLI mode)
+    Use --urls-file to scrape many job posting URLs concurrently (CLI mode)
     Use --manual/-m to manually enter job information (CLI mode)
+    Use --import-file/-i to bulk import saved job pages (CLI mode)
+    Use --train-dictionary to train a page HTML compression dictionary (CLI mode)
+    Use --clean-descriptions to backfill cleaned job descriptions (CLI mode)
+    Use --promote-pages to backfill job posts from saved job pages (CLI mode)
+    Use --prune-pages-before to delete old saved job pages (CLI mode)
 
     Note: Run 'alembic upgrade head' to initialize the database before first use.
     """
@@ -51,20 +175,31 @@ def main(
 
     elif url:
         typer.echo(f"Fetching job posting from: {url}")
-        session = get_session()
-        try:
-            job_page = scrape_and_save_job_webpage(url, session)
+        job_page = asyncio.run(_scrape_url(url))
 
-            if job_page:
-                typer.echo(
-                    f"✓ Saved job page: {job_page.url} (Page ID: {job_page.page_id})"
-                )
-                typer.echo(f"  HTML length: {len(job_page.page_html)} characters")
-            else:
-                typer.echo("Failed to scrape and save job page from URL", err=True)
-                raise typer.Exit(code=1)
-        finally:
-            session.close()
+        if job_page:
+            typer.echo(f"✓ Saved job page: {job_page.url} (Page ID: {job_page.page_id})")
+            typer.echo(f"  HTML size: {job_page.html_size} bytes")
+        else:
+            typer.echo("Failed to scrape and save job page from URL", err=True)
+            raise typer.Exit(code=1)
+
+    elif urls_file:
+        typer.echo(f"Scraping job postings from: {'stdin' if urls_file == '-' else urls_file}")
+        if urls_file == "-":
+            results = asyncio.run(_scrape_urls(sys.stdin))
+        else:
+            with open(urls_file, encoding="utf-8") as lines:
+                results = asyncio.run(_scrape_urls(lines))
+
+        failed = sum(1 for result in results if result.page_id is None)
+        unchanged = sum(1 for result in results if result.unchanged)
+        typer.echo(
+            f"✓ Saved {len(results) - failed - unchanged} job pages, "
+            f"{unchanged} unchanged, {failed} failed"
+        )
+        if failed:
+            raise typer.Exit(code=1)
 
     elif manual:
         typer.echo("Enter job posting information:")
@@ -72,24 +207,86 @@ def main(
         job_title = typer.prompt("Job title")
         job_description = typer.prompt("Job description")
 
-        session = get_session()
+        job_post = asyncio.run(_create_job_post(company_name, job_title, job_description))
+
+        typer.echo(
+            f"✓ Saved job posting: '{job_post.title}' at {company_name} (ID: {job_post.id})"
+        )
+        typer.echo("  Job queued for processing")
+
+    elif import_file:
+        typer.echo(f"Importing job pages from: {import_file}")
+        with import_file.open(encoding="utf-8") as lines:
+            created, errors = asyncio.run(import_job_pages(lines))
+
+        typer.echo(f"✓ Imported {created} job pages")
+        for error in errors:
+            typer.echo(f"  ✗ {error}", err=True)
+        if errors:
+            raise typer.Exit(code=1)
+
+    elif train_dictionary:
+        typer.echo(f"Training compression dictionary from up to {sample_size} pages...")
         try:
-            job_service = JobService(session)
-            job_post = job_service.create_job_post(
-                company_name=company_name,
-                job_title=job_title,
-                job_description=job_description,
-            )
+            report = asyncio.run(_train_dictionary(sample_size))
+        except ValueError as e:
+            typer.echo(str(e), err=True)
+            raise typer.Exit(code=1)
+
+        typer.echo(
+            f"  Trained on {report.train_samples} pages, evaluated on {report.eval_samples} "
+            f"({report.raw_bytes:,} bytes), dictionary size {report.dict_size:,} bytes"
+        )
+        typer.echo(
+            f"  plain zstd: ratio {report.plain_ratio:.2f}x, "
+            f"decompress {report.plain_mb_per_s:.1f} MB/s"
+        )
+        typer.echo(
+            f"  dictionary: ratio {report.dict_ratio:.2f}x, "
+            f"decompress {report.dict_mb_per_s:.1f} MB/s"
+        )
+        if report.dict_id is None:
+            typer.echo("Dictionary did not beat plain zstd - not saved", err=True)
+            raise typer.Exit(code=1)
+        typer.echo(f"✓ Saved dictionary version {report.dict_id}; new pages will use it")
 
+    elif clean_descriptions:
+        typer.echo("Cleaning job post descriptions...")
+        reports = asyncio.run(_clean_descriptions())
+
+        for report in reports:
             typer.echo(
-                f"✓ Saved job posting: '{job_post.title}' at {company_name} (ID: {job_post.id})"
+                f"  Job post {report.job_post_id}: {report.tokens_before} -> "
+                f"{report.tokens_after} tokens ({report.tokens_saved} saved)"
             )
-            typer.echo("  Job queued for processing")
-        finally:
-            session.close()
+        before = sum(report.tokens_before for report in reports)
+        saved = sum(report.tokens_saved for report in reports)
+        typer.echo(
+            f"✓ Cleaned {len(reports)} job posts, saving ~{saved:,} of {before:,} prompt tokens"
+        )
+
+    elif promote_pages:
+        typer.echo(f"Promoting saved job pages to job posts with {workers} worker(s)...")
+        results = asyncio.run(_promote_pages(promote_limit, workers))
+
+        for result in results:
+            if result.job_post_id is not None:
+                typer.echo(f"  Job page {result.page_id} -> job post {result.job_post_id}")
+            else:
+                typer.echo(f"  Job page {result.page_id} skipped: {result.error}")
+        promoted = sum(1 for result in results if result.job_post_id is not None)
+        typer.echo(f"✓ Promoted {promoted} of {len(results)} job pages; new posts are queued for processing")
+
+    elif prune_pages_before:
+        typer.echo(f"Deleting job pages captured before {prune_pages_before}...")
+        deleted = asyncio.run(_prune_pages(prune_pages_before))
+        typer.echo(f"✓ Deleted {deleted} job pages")
 
     else:
-        typer.echo("Please specify --start, --url, or --manual flag")
+        typer.echo(
+            "Please specify --start, --url, --urls-file, --manual, --import-file, --train-dictionary, "
+            "--clean-descriptions, --promote-pages, or --prune-pages-before flag"
+        )
         typer.echo("Use --help for more information")
         raise typer.Exit(code=1)
 
@@ -0,0 +1,181 @@
+import zlib
+from typing import Callable, Protocol
+
+import zstandard
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class _Decoder(Protocol):
+    def decompress(self, data: bytes, max_length: int) -> bytes: ...
+
+    def flush(self, max_length: int) -> bytes: ...
+
+
+class _IdentityDecoder:
+    """Pass-through decoder for uncompressed bodies of unknown length"""
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        return data
+
+    def flush(self, max_length: int) -> bytes:
+        return b""
+
+
+class _GzipDecoder:
+    """
+    Incremental gzip decoder.
+
+    zlib stops inflating once max_length bytes are produced, so a small
+    compressed chunk can never expand past the caller's remaining budget.
+    """
+
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        return self._decompressor.decompress(data, max_length)
+
+    def flush(self, max_length: int) -> bytes:
+        if not self._decompressor.eof:
+            raise zlib.error("truncated gzip stream")
+        return self._decompressor.flush()
+
+
+class _ZstdDecoder:
+    """
+    zstd decoder with a capped output.
+
+    The zstandard decompressobj has no output cap, and its stream reader takes
+    a momentarily empty source for the end of input, so the compressed chunks
+    are held (the middleware caps them at the body limit too) and decoded at
+    flush through a stream reader that reads at most max_length bytes.
+    """
+
+    def __init__(self) -> None:
+        self._compressed = bytearray()
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        self._compressed += data
+        return b""
+
+    def flush(self, max_length: int) -> bytes:
+        body = bytearray()
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            bytes(self._compressed), read_across_frames=True
+        )
+        with reader:
+            while len(body) < max_length:
+                chunk = reader.read(max_length - len(body))
+                if not chunk:
+                    break
+                body += chunk
+        return bytes(body)
+
+
+DECODERS: dict[str, Callable[[], _Decoder]] = {
+    "identity": _IdentityDecoder,
+    "gzip": _GzipDecoder,
+    "x-gzip": _GzipDecoder,
+    "zstd": _ZstdDecoder,
+}
+
+
+class RequestDecompressionMiddleware:
+    """
+    ASGI middleware that decodes gzip/zstd request bodies and caps body size.
+
+    Bodies are decompressed chunk by chunk as they arrive, and the request is
+    rejected with 413 as soon as the decoded size passes `max_body_size`, so
+    an oversized or malicious payload is never buffered whole. zstd bodies
+    are held compressed (within the same limit) and decoded once complete,
+    never past the limit. Plain bodies are held to the same limit (up front
+    via Content-Length when present).
+    Downstream handlers see an ordinary uncompressed request without a
+    Content-Encoding header.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = headers.get("content-encoding", "identity").strip().lower()
+        if encoding not in DECODERS:
+            await self._reject(scope, receive, send, 415, f"Unsupported Content-Encoding: {encoding}")
+            return
+
+        content_length = headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            await self._reject(scope, receive, send, 413, self._too_large_detail())
+            return
+
+        # A plain body with a trusted length can go straight through
+        if encoding == "identity" and content_length and content_length.isdigit():
+            await self.app(scope, receive, send)
+            return
+
+        decoder = DECODERS[encoding]()
+        body = bytearray()
+        received = 0
+        more_body = True
+        try:
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                more_body = message.get("more_body", False)
+                chunk = message.get("body", b"")
+                received += len(chunk)
+
+                remaining = self.max_body_size - len(body)
+                body += decoder.decompress(chunk, remaining + 1)
+                if len(body) > self.max_body_size or received > self.max_body_size:
+                    await self._reject(scope, receive, send, 413, self._too_large_detail())
+                    return
+
+            body += decoder.flush(self.max_body_size - len(body) + 1)
+        except (zlib.error, zstandard.ZstdError) as e:
+            await self._reject(scope, receive, send, 400, f"Invalid {encoding} request body: {e}")
+            return
+
+        if len(body) > self.max_body_size:
+            await self._reject(scope, receive, send, 413, self._too_large_detail())
+            return
+
+        scope = dict(scope)
+        scope["headers"] = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(body)).encode())]
+
+        await self.app(scope, self._replay_receive(bytes(body), receive), send)
+
+    def _too_large_detail(self) -> str:
+        return f"Request body exceeds the {self.max_body_size} byte limit"
+
+    @staticmethod
+    def _replay_receive(body: bytes, receive: Receive) -> Receive:
+        """Hand the decoded body to the app once, then defer to the real channel"""
+        sent = False
+
+        async def replay() -> Message:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, status_code: int, detail: str) -> None:
+        response = JSONResponse({"detail": detail}, status_code=status_code)
+        await response(scope, receive, send)
@@ -1,16 +1,27 @@
-from fastapi import APIRouter, HTTPException, Depends
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from src.hoarder.utils.database import get_async_session
 from src.hoarder.schema.job_collection import (
     JobPageRequest,
     JobPageResponse,
     JobPageListResponse,
-    JobPageItem
+    JobPageItem,
+    JobPageBatchRequest,
+    JobPageBatchResponse,
+    JobPageBatchResult,
 )
 from src.hoarder.services.job_page_service import JobPageService
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/job-collection")
 
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+MAX_BATCH_SIZE = 100  # pages; keep in step with MAX_BATCH_SIZE in chrome_extension/popup.js
+
 
 @router.post("/page", response_model=JobPageResponse)
 async def create_job_page(
@@ -20,15 +31,19 @@ async def create_job_page(
     """
     Create a new job page entry in the database.
 
+    If the same job content was already saved under this URL or a variant of
+    it (tracking parameters, fragment, trailing slash), the existing page is
+    returned with duplicate=true and nothing is stored.
+
     Args:
         request: JobPageRequest containing url and page_html
 
     Returns:
-        JobPageResponse with the created page_id and confirmation
+        JobPageResponse with the created (or existing) page_id and confirmation
     """
     try:
         job_page_service = JobPageService(session)
-        job_page = await job_page_service.create_job_page(
+        job_page, duplicate = await job_page_service.create_job_page(
             url=request.url,
             page_html=request.page_html
         )
@@ -36,12 +51,61 @@ async def create_job_page(
         return JobPageResponse(
             page_id=job_page.page_id,
             url=job_page.url,
-            message="Job page saved successfully"
+            message="Job page already saved" if duplicate else "Job page saved successfully",
+            duplicate=duplicate
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error saving job page: {str(e)}")
 
 
+@router.post("/pages:batch", response_model=JobPageBatchResponse)
+async def create_job_pages_batch(
+    request: JobPageBatchRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Create many job page entries in a single transaction.
+
+    Each item is validated on its own; invalid items are reported in the
+    results and the rest are inserted together. Items already saved are
+    reported with the existing page_id and duplicate=true.
+
+    Args:
+        request: JobPageBatchRequest containing a list of {url, page_html}
+
+    Returns:
+        JobPageBatchResponse with a page_id or error for every item, in request order
+    """
+    if len(request.pages) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.pages)} pages (max {MAX_BATCH_SIZE})"
+        )
+
+    job_page_service = JobPageService(session)
+    results = await job_page_service.create_job_pages(
+        [(page.url, page.page_html) for page in request.pages]
+    )
+
+    duplicates = sum(1 for result in results if result.duplicate)
+    failed = sum(1 for result in results if result.page_id is None)
+    return JobPageBatchResponse(
+        created=len(results) - duplicates - failed,
+        duplicates=duplicates,
+        failed=failed,
+        results=[
+            JobPageBatchResult(
+                index=index,
+                url=page.url,
+                page_id=result.page_id,
+                error=result.error,
+                duplicate=result.duplicate
+            )
+            for index, (page, result) in enumerate(zip(request.pages, results))
+        ]
+    )
+
+
 @router.get("/page/{page_id}", response_model=JobPageResponse)
 async def get_job_page(
     page_id: int,
@@ -76,24 +140,56 @@ async def get_job_page(
 
 @router.get("/pages", response_model=JobPageListResponse)
 async def get_all_job_pages(
+    after_id: Optional[int] = Query(None, description="Return pages with a page_id greater than this"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    stream: bool = Query(False, description="Stream every page as NDJSON instead of paginating"),
+    include_total: bool = Query(
+        False, description="Count all job pages even when after_id is given"
+    ),
     session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Get all job pages.
+    Get job pages using keyset pagination.
+
+    Pass the returned next_after_id as after_id to fetch the following page.
+    With stream=true the remaining pages are streamed as newline-delimited
+    JSON objects ({"page_id": ..., "url": ...}) and limit is ignored.
+
+    Counting every page is a full scan, so total is only returned with the
+    first page (no after_id) or when include_total=true, and is null otherwise.
+
+    Args:
+        after_id: Optional cursor, the last page_id already seen
+        limit: Maximum number of pages to return
+        stream: Stream all pages after after_id as NDJSON
+        include_total: Return the total count on later pages too
 
     Returns:
-        JobPageListResponse with list of all job pages and total count
+        JobPageListResponse with one page of job pages, the total count (if counted) and the
+        next cursor
     """
+    job_page_service = JobPageService(session)
+
+    if stream:
+        async def ndjson_lines() -> AsyncIterator[str]:
+            async for row in job_page_service.stream_job_pages(after_id=after_id):
+                yield json.dumps({"page_id": row.page_id, "url": row.url}) + "\n"
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
     try:
-        job_page_service = JobPageService(session)
-        job_pages = await job_page_service.get_all_job_pages()
+        job_pages = await job_page_service.get_all_job_pages(after_id=after_id, limit=limit)
+        total = None
+        if after_id is None or include_total:
+            total = await job_page_service.count_job_pages()
 
         return JobPageListResponse(
-            total=len(job_pages),
+            total=total,
             pages=[
                 JobPageItem(page_id=page.page_id, url=page.url)
                 for page in job_pages
-            ]
+            ],
+            next_after_id=job_pages[-1].page_id if len(job_pages) == limit else None
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving job pages: {str(e)}")
\ No newline at end of file
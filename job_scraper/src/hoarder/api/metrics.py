@@ -0,0 +1,23 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.hoarder.services.summary_cache import SummaryCache
+from src.hoarder.utils.database import get_async_session
+
+router = APIRouter(prefix="/metrics")
+
+
+@router.get("/summary-cache")
+async def get_summary_cache_metrics(
+    session: AsyncSession = Depends(get_async_session)
+) -> dict[str, Any]:
+    """
+    Get LLM summary cache metrics.
+
+    Returns:
+        Number of cached entries, hit/miss counters of this API process and,
+        when Redis is enabled, the shared counters of all workers
+    """
+    return await SummaryCache(session).stats()
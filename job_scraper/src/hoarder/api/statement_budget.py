@@ -0,0 +1,26 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.hoarder.utils.statement_budget import count_statements
+
+
+class StatementBudgetMiddleware:
+    """
+    ASGI middleware that counts the SQL statements of each request.
+
+    Requests that run more than `budget` statements are printed with their
+    SQL, which makes N+1 query patterns visible during development.
+    """
+
+    def __init__(self, app: ASGIApp, budget: int) -> None:
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_statements(f"{scope['method']} {scope['path']}", self.budget) as counter:
+            await self.app(scope, receive, send)
+        if counter.exceeded:
+            print(f"⚠ {counter.report()}")
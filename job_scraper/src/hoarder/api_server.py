@@ -1,13 +1,39 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
 
 from src.hoarder.utils.settings import settings
+from src.hoarder.utils.database import dispose_async_engine
 from src.hoarder.api.job_collection import router as jc_router
+from src.hoarder.api.metrics import router as metrics_router
+from src.hoarder.api.decompression import RequestDecompressionMiddleware
+from src.hoarder.api.statement_budget import StatementBudgetMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Release pooled database connections when the server shuts down"""
+    yield
+    await dispose_async_engine()
+
 
-app = FastAPI(title="Job Scraper API")
+app = FastAPI(title="Job Scraper API", lifespan=lifespan)
 app.include_router(jc_router)
+app.include_router(metrics_router)
+
+# Decode gzip/zstd request bodies (the Chrome extension compresses page HTML)
+app.add_middleware(
+    RequestDecompressionMiddleware,
+    max_body_size=settings.max_request_body_size,
+)
+
+# Development aid: report requests that run more SQL statements than allowed
+if settings.sql_statement_budget > 0:
+    app.add_middleware(StatementBudgetMiddleware, budget=settings.sql_statement_budget)
 
 # Add CORS middleware to allow Chrome extension requests
 app.add_middleware(
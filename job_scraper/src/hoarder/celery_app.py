@@ -1,11 +1,26 @@
 from celery import Celery  # type: ignore[import-untyped]
+from celery.signals import (  # type: ignore[import-untyped]
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+)
+
+from src.hoarder.utils.async_runner import run_async
+from src.hoarder.utils.database import (
+    dispose_async_engine,
+    dispose_engine,
+    reset_engines_after_fork,
+)
+from src.hoarder.utils.settings import settings
+from src.hoarder.utils.statement_budget import StatementCounter, start_counting, stop_counting
 
 # Configure Celery
 celery_app = Celery(
     "job_scraper",
     broker="redis://localhost:6379/0",
     backend="redis://localhost:6379/0",
-    include=["src.hoarder.tasks.job_processing"],
+    include=["src.hoarder.tasks.job_processing", "src.hoarder.tasks.job_page_promotion"],
 )
 
 # Configure Celery settings
@@ -22,5 +37,50 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
 )
 
+# Periodically summarize job posts left without a summary (their process_job_post
+# task failed, or they predate it). Run beat next to the workers:
+#   celery -A src.hoarder.celery_app beat
+if settings.summary_sweep_interval > 0:
+    celery_app.conf.beat_schedule = {
+        "summarize-pending-job-posts": {
+            "task": "summarize_pending_job_posts",
+            "schedule": settings.summary_sweep_interval,
+        },
+    }
+
+
+@worker_process_init.connect
+def init_worker_db(**kwargs) -> None:
+    """Give each forked worker process its own connection pool"""
+    reset_engines_after_fork()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_db(**kwargs) -> None:
+    """Close the worker's pooled connections on exit"""
+    dispose_engine()
+    run_async(dispose_async_engine())
+
+
+# Development aid: report tasks that run more SQL statements than allowed
+_statement_counters: dict[str, StatementCounter] = {}
+
+
+@task_prerun.connect
+def start_statement_count(task_id: str, task, **kwargs) -> None:
+    if settings.sql_statement_budget > 0:
+        _statement_counters[task_id] = start_counting(task.name, settings.sql_statement_budget)
+
+
+@task_postrun.connect
+def check_statement_count(task_id: str, **kwargs) -> None:
+    counter = _statement_counters.pop(task_id, None)
+    if counter is None:
+        return
+    stop_counting(counter)
+    if counter.exceeded:
+        print(f"⚠ {counter.report()}")
+
+
 if __name__ == "__main__":
     celery_app.start()
@@ -0,0 +1,28 @@
+from .boilerplate import clean_text
+from .description import clean_description, extract_description
+from .parsers import PARSER_BACKENDS, ParsedPage, parse_html
+from .sites import (
+    SITE_EXTRACTORS,
+    SiteExtractor,
+    extract_job,
+    get_site_extractor,
+    register_site_extractor,
+)
+from .structured import StructuredJobData, extract_structured_data, parse_salary
+
+__all__ = [
+    "PARSER_BACKENDS",
+    "ParsedPage",
+    "SITE_EXTRACTORS",
+    "SiteExtractor",
+    "StructuredJobData",
+    "clean_description",
+    "clean_text",
+    "extract_description",
+    "extract_job",
+    "extract_structured_data",
+    "get_site_extractor",
+    "parse_html",
+    "parse_salary",
+    "register_site_extractor",
+]
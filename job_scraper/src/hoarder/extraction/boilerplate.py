@@ -0,0 +1,102 @@
+import re
+from typing import Any, Mapping
+
+# Backend-independent rules for finding the job description in a page; the
+# parser backends in parsers.py apply them to their own trees.
+
+# Elements that never hold the job description
+BOILERPLATE_TAGS = [
+    "script", "style", "noscript", "template", "svg", "iframe",
+    "nav", "header", "footer", "aside", "form", "button", "dialog",
+]
+# Elements that end a line of text; inline ones (b, a, span...) do not
+BLOCK_TAGS = [
+    "p", "div", "br", "li", "ul", "ol", "dd", "dt", "tr", "table", "blockquote", "pre",
+    "section", "article", "main", "h1", "h2", "h3", "h4", "h5", "h6",
+]
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "dialog", "search"}
+
+# id/class words (split on -, _ and camelCase) marking cookie banners, menus, footers, etc.
+BOILERPLATE_WORDS = {
+    "cookie", "cookies", "consent", "gdpr", "banner", "nav", "navbar", "navigation",
+    "menu", "footer", "header", "breadcrumb", "breadcrumbs", "sidebar", "share",
+    "social", "newsletter", "subscribe", "related", "recommended", "modal", "popup",
+    "login", "signin",
+}
+# Never strip the document itself or anything that looks like the posting
+PROTECTED_TAGS = {"html", "body", "main", "article"}
+PROTECTED_WORDS = {"description", "job", "posting", "vacancy"}
+
+# id/class words naming the description block, e.g. "job-description", "jobDetails"
+DESCRIPTION_WORDS = {"description", "jobdescription", "vacancy", "jobad"}
+DESCRIPTION_PAIRED_WORDS = {"details", "body", "content"}  # only after "job"/"posting"
+
+BOILERPLATE_LINES = re.compile(
+    r"^(?:"
+    r"(?:accept|reject|allow|manage)(?: all)?(?: cookies?)?"
+    r"|.*\bwe use cookies\b.*"
+    r"|skip to (?:main )?content"
+    r"|(?:sign|log) ?(?:in|up|out)"
+    r"|register|menu|home|search|close"
+    r"|share(?: this job)?(?: on \w+)?"
+    r"|apply(?: now| for this job)?"
+    r"|save(?: job)?"
+    r"|back to (?:search|jobs|results)"
+    r"|privacy policy|cookie policy|terms(?: of (?:use|service))?|terms & conditions"
+    r"|(?:©|copyright\b).*"
+    r"|.*\ball rights reserved\b.*"
+    r")[.!]?$",
+    re.I,
+)
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def _words(attrs: Mapping[str, Any]) -> set[str]:
+    classes = attrs.get("class") or ""
+    if not isinstance(classes, str):  # BeautifulSoup splits class into a list
+        classes = " ".join(classes)
+    return {
+        word.lower()
+        for word in re.split(r"[-_\s]+|(?<=[a-z])(?=[A-Z])", f"{attrs.get('id') or ''} {classes}")
+        if word
+    }
+
+
+def is_boilerplate(tag: str, attrs: Mapping[str, Any]) -> bool:
+    """Whether an element (by tag name and attributes) is a banner, menu, footer or similar"""
+    if tag in PROTECTED_TAGS or attrs.get("itemprop") == "description":
+        return False
+    if attrs.get("role") in BOILERPLATE_ROLES:
+        return True
+    words = _words(attrs)
+    return bool(words & BOILERPLATE_WORDS) and not words & PROTECTED_WORDS
+
+
+def is_description(attrs: Mapping[str, Any]) -> bool:
+    """Whether an element's id or class names the job description block"""
+    words = _words(attrs)
+    if words & DESCRIPTION_WORDS:
+        return True
+    return bool(words & {"job", "posting"}) and bool(words & DESCRIPTION_PAIRED_WORDS)
+
+
+def clean_text(text: str) -> str:
+    """
+    Collapse whitespace and drop boilerplate and repeated lines from plain text.
+
+    Line breaks are kept (one per line) so bullet lists stay readable.
+    """
+    lines: list[str] = []
+    seen: set[str] = set()
+    for line in text.splitlines():
+        line = WHITESPACE.sub(" ", line).strip()
+        if not line or BOILERPLATE_LINES.match(line):
+            continue
+        key = line.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return "\n".join(lines)
+
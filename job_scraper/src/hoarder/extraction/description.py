@@ -0,0 +1,24 @@
+import re
+from typing import Optional
+
+from .boilerplate import clean_text
+from .parsers import parse_html
+
+HTML_MARKUP = re.compile(r"<(?:html|body|div|p|br|li|ul|span|section)\b", re.I)
+
+
+def extract_description(html: str, backend: Optional[str] = None) -> str:
+    """Isolate the job description block of an HTML page and return it as clean text"""
+    return parse_html(html, backend).description()
+
+
+def clean_description(description: str) -> str:
+    """
+    Clean a job description for the LLM prompt.
+
+    Descriptions containing HTML markup go through block extraction; plain
+    text (manual entry, scraped text) only gets line-level cleaning.
+    """
+    if HTML_MARKUP.search(description):
+        return extract_description(description)
+    return clean_text(description)
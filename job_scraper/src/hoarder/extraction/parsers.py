@@ -0,0 +1,306 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from bs4 import BeautifulSoup, Tag
+
+from src.hoarder.utils.settings import settings
+
+from .boilerplate import BLOCK_TAGS, BOILERPLATE_TAGS, clean_text, is_boilerplate, is_description
+
+try:
+    from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+    HAS_SELECTOLAX = True
+except ImportError:  # optional: pip install "job_scraper[fast-html]"
+    HAS_SELECTOLAX = False
+
+BLOCK_SELECTOR = ", ".join(BLOCK_TAGS)
+
+# Containers tried, in order, when no element names the description
+FALLBACK_BLOCKS = ("main", "article", "[role=main]", "body")
+
+
+class ParsedPage(ABC):
+    """
+    A parsed HTML page, independent of the parser backend.
+
+    Every lookup evaluates its selector once. description() strips
+    boilerplate (including scripts) from the tree in place, so read other
+    fields and structured data first.
+    """
+
+    backend: str
+
+    @abstractmethod
+    def first_text(self, selector: str) -> Optional[str]:
+        """Stripped text of the first element matching a CSS selector"""
+
+    @abstractmethod
+    def first_attribute(self, selector: str, name: str) -> Optional[str]:
+        """Stripped attribute of the first element matching a CSS selector"""
+
+    @abstractmethod
+    def first_block_text(self, selector: str) -> Optional[str]:
+        """Clean text of the first element matching a CSS selector, one line per block"""
+
+    @abstractmethod
+    def json_ld(self) -> list[str]:
+        """Raw contents of every <script type="application/ld+json">"""
+
+    @abstractmethod
+    def meta(self) -> dict[str, str]:
+        """<meta> content by property or name (first occurrence wins), e.g. og:title"""
+
+    @abstractmethod
+    def microdata(self, itemtype: str) -> dict[str, str]:
+        """
+        Properties of the first microdata item whose itemtype ends with `itemtype`.
+
+        Nested items are flattened into dotted paths, e.g.
+        "hiringOrganization.name"; the first value of each path wins.
+        """
+
+    @abstractmethod
+    def description(self) -> str:
+        """The job description block as clean text, with boilerplate removed"""
+
+
+class SoupPage(ParsedPage):
+    """BeautifulSoup with the pure-Python html.parser; always available"""
+
+    backend = "bs4"
+
+    def __init__(self, html: str):
+        self.soup = BeautifulSoup(html, "html.parser")
+
+    def first_text(self, selector: str) -> Optional[str]:
+        element = self.soup.select_one(selector)
+        text = element.get_text().strip() if element is not None else ""
+        return text or None
+
+    def first_attribute(self, selector: str, name: str) -> Optional[str]:
+        element = self.soup.select_one(selector)
+        value = element.get(name) if element is not None else None
+        if value is None:
+            return None
+        return str(value).strip() or None
+
+    def first_block_text(self, selector: str) -> Optional[str]:
+        element = self.soup.select_one(selector)
+        if element is None:
+            return None
+        return self._block_text(element) or None
+
+    def json_ld(self) -> list[str]:
+        scripts = self.soup.find_all("script", attrs={"type": "application/ld+json"})
+        return [script.string for script in scripts if script.string]
+
+    def meta(self) -> dict[str, str]:
+        values: dict[str, str] = {}
+        for element in self.soup.find_all("meta"):
+            key, content = element.get("property") or element.get("name"), element.get("content")
+            if key and content:
+                values.setdefault(str(key), str(content).strip())
+        return values
+
+    def microdata(self, itemtype: str) -> dict[str, str]:
+        scope = next(
+            (
+                element
+                for element in self.soup.find_all(attrs={"itemscope": True, "itemtype": True})
+                if str(element["itemtype"]).rstrip("/").endswith(itemtype)
+            ),
+            None,
+        )
+        if scope is None:
+            return {}
+
+        values: dict[str, str] = {}
+        for element in scope.find_all(attrs={"itemprop": True}):
+            if element.has_attr("itemscope"):
+                continue
+            path = [str(element["itemprop"])]
+            for parent in element.parents:
+                if parent is scope:
+                    break
+                if parent.has_attr("itemscope") and parent.has_attr("itemprop"):
+                    path.insert(0, str(parent["itemprop"]))
+            value = element.get("content") or element.get("datetime") or element.get_text("\n")
+            values.setdefault(".".join(path), str(value).strip())
+        return values
+
+    def description(self) -> str:
+        for element in self.soup.find_all(BOILERPLATE_TAGS):
+            element.decompose()
+        # Materialize first: decomposing a parent also removes its descendants
+        for element in list(self.soup.find_all(True)):
+            if not element.decomposed and is_boilerplate(element.name, element.attrs):
+                element.decompose()
+
+        candidates = self.soup.find_all(attrs={"itemprop": "description"})
+        if not candidates:
+            candidates = [
+                element for element in self.soup.find_all(True) if is_description(element.attrs)
+            ]
+        if candidates:
+            block = max(candidates, key=lambda element: len(element.get_text(strip=True)))
+        else:
+            block = next(
+                (
+                    element
+                    for element in map(self.soup.select_one, FALLBACK_BLOCKS)
+                    if element is not None
+                ),
+                None,
+            )
+        return self._block_text(block) if block is not None else ""
+
+    @staticmethod
+    def _block_text(element: Tag) -> str:
+        for child in element.find_all(BLOCK_TAGS):
+            child.insert_after("\n")
+        return clean_text(element.get_text())
+
+
+class LexborPage(ParsedPage):
+    """selectolax's lexbor engine (C); typically an order of magnitude faster than BeautifulSoup"""
+
+    backend = "selectolax"
+
+    def __init__(self, html: str):
+        self.tree = LexborHTMLParser(html)
+
+    def first_text(self, selector: str) -> Optional[str]:
+        node = self.tree.css_first(selector)
+        text = node.text().strip() if node is not None else ""
+        return text or None
+
+    def first_attribute(self, selector: str, name: str) -> Optional[str]:
+        node = self.tree.css_first(selector)
+        value = node.attributes.get(name) if node is not None else None
+        if value is None:
+            return None
+        return value.strip() or None
+
+    def first_block_text(self, selector: str) -> Optional[str]:
+        node = self.tree.css_first(selector)
+        if node is None:
+            return None
+        return self._block_text(node) or None
+
+    @staticmethod
+    def _text_length(node: "LexborNode") -> int:
+        return len(node.text(strip=True))
+
+    def json_ld(self) -> list[str]:
+        scripts = self.tree.css('script[type="application/ld+json"]')
+        return [text for text in (script.text() for script in scripts) if text]
+
+    def meta(self) -> dict[str, str]:
+        values: dict[str, str] = {}
+        for node in self.tree.css("meta"):
+            key = node.attributes.get("property") or node.attributes.get("name")
+            content = node.attributes.get("content")
+            if key and content:
+                values.setdefault(key, content.strip())
+        return values
+
+    def microdata(self, itemtype: str) -> dict[str, str]:
+        scope = next(
+            (
+                node
+                for node in self.tree.css("[itemscope][itemtype]")
+                if (node.attributes.get("itemtype") or "").rstrip("/").endswith(itemtype)
+            ),
+            None,
+        )
+        if scope is None:
+            return {}
+
+        values: dict[str, str] = {}
+        for node in scope.css("[itemprop]"):
+            if "itemscope" in node.attributes:
+                continue
+            path = [node.attributes["itemprop"] or ""]
+            parent = node.parent
+            while parent is not None and parent.mem_id != scope.mem_id:
+                if "itemscope" in parent.attributes and parent.attributes.get("itemprop"):
+                    path.insert(0, parent.attributes["itemprop"] or "")
+                parent = parent.parent
+            value = (
+                node.attributes.get("content")
+                or node.attributes.get("datetime")
+                or node.text(separator="\n")
+            )
+            values.setdefault(".".join(path), value.strip())
+        return values
+
+    def description(self) -> str:
+        self.tree.strip_tags(BOILERPLATE_TAGS)
+
+        # Skip nodes inside an already-selected subtree: decomposing the
+        # ancestor frees them
+        marked: set[int] = set()
+        targets = []
+        for node in self.tree.css("[id], [class], [role]"):
+            if not is_boilerplate(node.tag, node.attributes):
+                continue
+            parent, inside = node.parent, False
+            while parent is not None:
+                if parent.mem_id in marked:
+                    inside = True
+                    break
+                parent = parent.parent
+            if not inside:
+                marked.add(node.mem_id)
+                targets.append(node)
+        for node in targets:
+            node.decompose()
+
+        candidates = self.tree.css('[itemprop="description"]')
+        if not candidates:
+            candidates = [
+                node for node in self.tree.css("[id], [class]") if is_description(node.attributes)
+            ]
+        if candidates:
+            block = max(candidates, key=self._text_length)
+        else:
+            block = next(
+                (node for node in map(self.tree.css_first, FALLBACK_BLOCKS) if node is not None),
+                None,
+            )
+        return self._block_text(block) if block is not None else ""
+
+    @staticmethod
+    def _block_text(node: "LexborNode") -> str:
+        for child in node.css(BLOCK_SELECTOR):
+            child.insert_after("\n")
+        return clean_text(node.text())
+
+
+PARSER_BACKENDS: dict[str, type[ParsedPage]] = {"bs4": SoupPage}
+if HAS_SELECTOLAX:
+    PARSER_BACKENDS["selectolax"] = LexborPage
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> ParsedPage:
+    """
+    Parse a page with the configured backend.
+
+    Args:
+        html: Page HTML
+        backend: "selectolax", "bs4" or "auto" (default: HTML_PARSER setting);
+            "auto" uses selectolax when installed and BeautifulSoup otherwise
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    backend = backend or settings.html_parser
+    if backend == "auto":
+        backend = "selectolax" if HAS_SELECTOLAX else "bs4"
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(
+            f"HTML parser backend {backend!r} is not available "
+            f"(installed: {', '.join(PARSER_BACKENDS)})"
+        )
+    return PARSER_BACKENDS[backend](html)
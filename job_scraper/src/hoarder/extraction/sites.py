@@ -0,0 +1,152 @@
+import re
+from typing import NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from .parsers import ParsedPage
+from .structured import (
+    StructuredJobData,
+    merge_structured_data,
+    parse_json_ld,
+    parse_microdata,
+    parse_open_graph,
+)
+
+COMPANY_PREFIX = re.compile(r"^\s*at\s+", re.I)
+
+
+class SiteExtractor(NamedTuple):
+    """
+    Selectors for one job board.
+
+    Selectors are tried in order and the first match wins, so list the
+    board's current markup first and older layouts after it. When no
+    selector finds the company, `company_in_url` (matched against
+    host + path) captures it from the URL, e.g. the board slug.
+    """
+
+    name: str
+    hosts: tuple[str, ...]  # hostnames; subdomains match too
+    title: tuple[str, ...] = ("h1",)
+    company: tuple[str, ...] = ()
+    description: tuple[str, ...] = ()
+    company_in_url: Optional[re.Pattern[str]] = None
+
+    def _company_from_url(self, url: str) -> Optional[str]:
+        if self.company_in_url is None:
+            return None
+        parts = urlsplit(url)
+        match = self.company_in_url.search(f"{parts.hostname or ''}{parts.path}")
+        if not match:
+            return None
+        return match.group(1).replace("-", " ").replace("_", " ").title()
+
+    def extract(self, page: ParsedPage, url: str) -> StructuredJobData:
+        """Title, company and description found by this board's selectors"""
+        title = next(filter(None, map(page.first_text, self.title)), None)
+        company = next(filter(None, map(page.first_text, self.company)), None)
+        if company:
+            company = COMPANY_PREFIX.sub("", company)
+        description = next(filter(None, map(page.first_block_text, self.description)), None)
+        return StructuredJobData(
+            title=title,
+            company_name=company or self._company_from_url(url),
+            description=description,
+        )
+
+
+GENERIC_EXTRACTOR = SiteExtractor(name="generic", hosts=())
+
+SITE_EXTRACTORS = [
+    SiteExtractor(
+        name="greenhouse",
+        hosts=("boards.greenhouse.io", "job-boards.greenhouse.io"),
+        title=(".job__title h1", "h1.app-title"),
+        company=(".company-name",),
+        description=(".job__description", "#content"),
+        company_in_url=re.compile(r"greenhouse\.io/([^/]+)/jobs"),
+    ),
+    SiteExtractor(
+        name="lever",
+        hosts=("jobs.lever.co",),
+        title=(".posting-headline h2",),
+        description=('[data-qa="job-description"]', ".posting-page .content"),
+        company_in_url=re.compile(r"lever\.co/([^/]+)"),
+    ),
+    SiteExtractor(
+        name="ashby",
+        hosts=("jobs.ashbyhq.com",),
+        title=('[class*="_title_"]', "h1"),
+        description=('[class*="_descriptionText_"]',),
+        company_in_url=re.compile(r"ashbyhq\.com/([^/]+)"),
+    ),
+    SiteExtractor(
+        name="workday",
+        hosts=("myworkdayjobs.com",),
+        title=('[data-automation-id="jobPostingHeader"]',),
+        description=('[data-automation-id="jobPostingDescription"]',),
+        company_in_url=re.compile(r"^([^.]+)\.wd\d+\.myworkdayjobs\.com"),
+    ),
+    SiteExtractor(
+        name="linkedin",
+        hosts=("linkedin.com",),
+        title=("h1.top-card-layout__title", "h1.topcard__title"),
+        company=("a.topcard__org-name-link", ".topcard__flavor a"),
+        description=(".show-more-less-html__markup", ".description__text"),
+    ),
+    SiteExtractor(
+        name="smartrecruiters",
+        hosts=("jobs.smartrecruiters.com",),
+        title=("h1.job-title",),
+        company=('[itemprop="hiringOrganization"] [itemprop="name"]',),
+        description=(".job-sections", '[itemprop="description"]'),
+        company_in_url=re.compile(r"smartrecruiters\.com/([^/]+)"),
+    ),
+]
+
+_by_host: dict[str, SiteExtractor] = {}
+
+
+def register_site_extractor(extractor: SiteExtractor) -> None:
+    """Add a board to the registry (replacing any extractor for the same hosts)"""
+    for host in extractor.hosts:
+        _by_host[host.lower()] = extractor
+
+
+for _extractor in SITE_EXTRACTORS:
+    register_site_extractor(_extractor)
+
+
+def get_site_extractor(url: str) -> SiteExtractor:
+    """
+    The extractor registered for a URL's host, or the generic one.
+
+    Dict lookups on the hostname and then each parent domain
+    (acme.wd5.myworkdayjobs.com, wd5.myworkdayjobs.com, myworkdayjobs.com),
+    so dispatch cost does not grow with the number of boards.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    while host:
+        extractor = _by_host.get(host)
+        if extractor is not None:
+            return extractor
+        _, _, host = host.partition(".")
+    return GENERIC_EXTRACTOR
+
+
+def extract_job(page: ParsedPage, url: str) -> StructuredJobData:
+    """
+    Extract job fields from a parsed page.
+
+    Each field comes from the first source that has it: JSON-LD, microdata,
+    the board's own selectors (or the generic h1 lookup), OpenGraph, and
+    finally the boilerplate-stripped description block.
+    """
+    data = merge_structured_data(
+        parse_json_ld(page.json_ld()),
+        parse_microdata(page.microdata("JobPosting")),
+        get_site_extractor(url).extract(page, url),
+        parse_open_graph(page.meta()),
+    )
+    if data.description is None:
+        data = data._replace(description=page.description() or None)
+    return data
@@ -0,0 +1,210 @@
+import hashlib
+import html
+import json
+import re
+from typing import Any, Iterator, NamedTuple, Optional
+
+from .boilerplate import clean_text
+from .description import clean_description
+from .parsers import ParsedPage
+
+# Multipliers from a schema.org unitText to a yearly amount
+ANNUAL_MULTIPLIERS = {"HOUR": 2080, "DAY": 260, "WEEK": 52, "MONTH": 12, "YEAR": 1}
+
+
+class StructuredJobData(NamedTuple):
+    """Job fields read from JSON-LD, microdata or OpenGraph; None when not published"""
+
+    title: Optional[str] = None
+    company_name: Optional[str] = None
+    description: Optional[str] = None
+    industry: Optional[str] = None
+    salary_min: Optional[int] = None  # yearly USD
+    salary_max: Optional[int] = None  # yearly USD
+    technical_skills: Optional[list[str]] = None
+
+    def summary_fields(self) -> dict[str, Any]:
+        """
+        Fields the LLM summary would otherwise estimate, keyed like its response.
+
+        The salary range is all or nothing: a single published bound is used
+        for both ends rather than asking the LLM for the other one.
+        """
+        fields: dict[str, Any] = {}
+        if self.salary_min is not None or self.salary_max is not None:
+            low, high = self.salary_min, self.salary_max
+            fields["estimated_salary_min"] = low if low is not None else high
+            fields["estimated_salary_max"] = high if high is not None else low
+        if self.technical_skills:
+            fields["technical_skills"] = self.technical_skills
+        return fields
+
+    def content_hash(self) -> str:
+        """
+        SHA-256 of the extracted fields.
+
+        Two captures of a page hash the same when everything the pipeline
+        reads from them is the same, even if the raw HTML differs (rotating
+        tokens, ads, timestamps).
+        """
+        return hashlib.sha256(json.dumps(self._asdict(), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _text(value: Any) -> Optional[str]:
+    """A schema.org Text, or the name of a Thing"""
+    if isinstance(value, dict):
+        value = value.get("name")
+    if isinstance(value, list):
+        value = next((item for item in map(_text, value) if item), None)
+    if isinstance(value, str) and value.strip():
+        return html.unescape(value).strip()
+    return None
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        match = re.search(r"\d[\d,]*(?:\.\d+)?", value)
+        if match:
+            return float(match.group(0).replace(",", ""))
+    return None
+
+
+def parse_salary(
+    value: Any, currency: Optional[str] = None, unit: Optional[str] = None
+) -> tuple[Optional[int], Optional[int]]:
+    """
+    Yearly USD (min, max) from a schema.org baseSalary.
+
+    Accepts a MonetaryAmount, a QuantitativeValue or a bare number. Amounts
+    in other currencies are ignored (None, None), since summaries estimate
+    salaries in USD.
+    """
+    if isinstance(value, dict):
+        currency = value.get("currency") or currency
+        unit = value.get("unitText") or unit
+        inner = value.get("value")
+        if inner is not None and value.get("@type") != "QuantitativeValue":
+            return parse_salary(inner, currency, unit)
+        low = _number(value.get("minValue"))
+        high = _number(value.get("maxValue"))
+        if low is None and high is None:
+            low = high = _number(value.get("value"))
+    else:
+        low = high = _number(value)
+
+    if currency and str(currency).upper() != "USD":
+        return None, None
+    multiplier = ANNUAL_MULTIPLIERS.get(str(unit or "YEAR").upper(), 1)
+    return (
+        round(low * multiplier) if low is not None else None,
+        round(high * multiplier) if high is not None else None,
+    )
+
+
+def _skills(value: Any) -> Optional[list[str]]:
+    if isinstance(value, str):
+        value = re.split(r"[,;\n]", value)
+    if not isinstance(value, list):
+        return None
+    skills = [skill for skill in (_text(item) for item in value) if skill]
+    return skills or None
+
+
+def _job_postings(value: Any) -> Iterator[dict[str, Any]]:
+    """Every JobPosting object in a JSON-LD document, including inside @graph"""
+    if isinstance(value, list):
+        for item in value:
+            yield from _job_postings(item)
+    elif isinstance(value, dict):
+        types = value.get("@type")
+        if types == "JobPosting" or (isinstance(types, list) and "JobPosting" in types):
+            yield value
+        if "@graph" in value:
+            yield from _job_postings(value["@graph"])
+
+
+def parse_json_ld(scripts: list[str]) -> StructuredJobData:
+    """Read the first schema.org JobPosting from JSON-LD script contents"""
+    for script in scripts:
+        try:
+            document = json.loads(script)
+        except json.JSONDecodeError:
+            continue
+        for posting in _job_postings(document):
+            description = _text(posting.get("description"))
+            salary_min, salary_max = parse_salary(
+                posting.get("baseSalary") or posting.get("estimatedSalary")
+            )
+            return StructuredJobData(
+                title=_text(posting.get("title")),
+                company_name=_text(posting.get("hiringOrganization")),
+                description=clean_description(description) if description else None,
+                industry=_text(posting.get("industry")),
+                salary_min=salary_min,
+                salary_max=salary_max,
+                technical_skills=_skills(posting.get("skills")),
+            )
+    return StructuredJobData()
+
+
+def parse_microdata(props: dict[str, str]) -> StructuredJobData:
+    """Read a schema.org JobPosting from flattened microdata properties"""
+    if not props:
+        return StructuredJobData()
+
+    salary = {
+        key.split(".")[-1]: value for key, value in props.items() if key.startswith("baseSalary.")
+    }
+    salary_min, salary_max = parse_salary(
+        {"@type": "QuantitativeValue", **salary} if salary else props.get("baseSalary")
+    )
+    description = props.get("description")
+    return StructuredJobData(
+        title=props.get("title") or None,
+        company_name=props.get("hiringOrganization.name") or props.get("hiringOrganization") or None,
+        description=clean_text(description) if description else None,
+        industry=props.get("industry") or None,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        technical_skills=_skills(props.get("skills")),
+    )
+
+
+def parse_open_graph(meta: dict[str, str]) -> StructuredJobData:
+    """
+    Title and site name from OpenGraph meta tags.
+
+    og:description is left out: it is usually a teaser, and the page's own
+    description block is a better fallback.
+    """
+    return StructuredJobData(
+        title=meta.get("og:title") or None,
+        company_name=meta.get("og:site_name") or None,
+    )
+
+
+def merge_structured_data(*sources: StructuredJobData) -> StructuredJobData:
+    """Take each field from the first source that has it"""
+    return StructuredJobData(
+        *(
+            next((value for value in values if value is not None), None)
+            for values in zip(*sources)
+        )
+    )
+
+
+def extract_structured_data(page: ParsedPage) -> StructuredJobData:
+    """
+    Job fields published as structured data, before any DOM heuristics.
+
+    Each field comes from the most specific source that has it: JSON-LD,
+    then microdata, then OpenGraph. Call before page.description(), which
+    strips <script> tags.
+    """
+    return merge_structured_data(
+        parse_json_ld(page.json_ld()),
+        parse_microdata(page.microdata("JobPosting")),
+        parse_open_graph(page.meta()),
+    )
@@ -1,7 +1,23 @@
 from .base import Base
 from .company import Company
+from .compression_dictionary import CompressionDictionary
 from .job_page import JobPage
 from .job_post import JobPost
+from .page_blob import PageBlob
+from .pipeline_checkpoint import PipelineCheckpoint
 from .summarized_job import SummarizedJob
+from .summary_cache_entry import SummaryCacheEntry
+from .task_outbox import TaskOutbox
 
-__all__ = ["Base", "Company", "JobPage", "JobPost", "SummarizedJob"]
+__all__ = [
+    "Base",
+    "Company",
+    "CompressionDictionary",
+    "JobPage",
+    "JobPost",
+    "PageBlob",
+    "PipelineCheckpoint",
+    "SummarizedJob",
+    "SummaryCacheEntry",
+    "TaskOutbox",
+]
@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional, TYPE_CHECKING
 
@@ -10,14 +10,22 @@ if TYPE_CHECKING:
 
 class Company(Base):
     __tablename__ = "company"
+    __table_args__ = (
+        # One company per name regardless of case and spacing; also the
+        # conflict target of CompanyRepository.get_or_create_id's upsert
+        Index("uq_company_normalized_name", "normalized_name", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
+    # src.hoarder.utils.company_names.normalize_company_name(name), set by CompanyRepository
+    normalized_name: Mapped[str] = mapped_column(String, nullable=False)
     industry: Mapped[Optional[str]] = mapped_column(String, nullable=True)
 
-    # Relationship
+    # Relationship; loaded only on request (CompanyRepository with_job_posts),
+    # a lazy load that would hit the database raises instead
     job_posts: Mapped[list["JobPost"]] = relationship(
-        "JobPost", back_populates="company"
+        "JobPost", back_populates="company", lazy="raise_on_sql"
     )
 
     def __repr__(self) -> str:
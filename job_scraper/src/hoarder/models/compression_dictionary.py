@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class CompressionDictionary(Base):
+    """A trained zstd dictionary; the id doubles as its version"""
+
+    __tablename__ = "compression_dictionary"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.current_timestamp()
+    )
+
+    def __repr__(self) -> str:
+        return f"CompressionDictionary(id={self.id}, size={len(self.data)}, sample_count={self.sample_count})"
@@ -1,15 +1,59 @@
-from sqlalchemy import Text
-from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from typing import TYPE_CHECKING, Optional
 
 from .base import Base
 
+if TYPE_CHECKING:
+    from .page_blob import PageBlob
+
 
 class JobPage(Base):
     __tablename__ = "job_page"
+    __table_args__ = (
+        # One capture per posting and content version: the same job seen under
+        # another URL variant, or unchanged, resolves to the existing row
+        Index(
+            "uq_job_page_canonical_url_content_sha256",
+            "canonical_url",
+            "content_sha256",
+            unique=True,
+        ),
+    )
 
     page_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     url: Mapped[str] = mapped_column(Text, nullable=False)
-    page_html: Mapped[str] = mapped_column(Text, nullable=False)
+    # src.hoarder.utils.urls.canonicalize_url(url), set by JobPageRepository
+    canonical_url: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # The HTML itself lives in page_blob; the row only keeps its address and metadata
+    html_sha256: Mapped[str] = mapped_column(
+        String(64), ForeignKey("page_blob.sha256"), nullable=False, index=True
+    )
+    html_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    html_compression: Mapped[str] = mapped_column(String, nullable=False)
+
+    # Change detection for re-fetches: HTTP validators from the response and a
+    # hash of the extracted job fields (StructuredJobData.content_hash()), or
+    # of the HTML itself for pages stored without one
+    etag: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    content_sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Last time this content was captured under its URL, so that after a change
+    # and a reversion (A -> B -> A) the reverted capture is the latest again.
+    # Set in Python for sub-second order; CURRENT_TIMESTAMP has whole seconds
+    last_seen_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.current_timestamp(), index=True
+    )
+
+    # Relationship; never loaded implicitly, a lazy load raises instead.
+    # Read the HTML with JobPageRepository.get_html, which also loads its dictionary
+    blob: Mapped["PageBlob"] = relationship("PageBlob", lazy="raise_on_sql")
 
     def __repr__(self) -> str:
         return f"JobPage(page_id={self.page_id}, url={self.url!r})"
@@ -12,13 +12,24 @@ class JobPost(Base):
     __tablename__ = "job_post"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    company_id: Mapped[int] = mapped_column(ForeignKey("company.id"), nullable=False)
+    company_id: Mapped[int] = mapped_column(ForeignKey("company.id"), nullable=False, index=True)
     title: Mapped[str] = mapped_column(String, nullable=False)
-    description: Mapped[str] = mapped_column(Text, nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False, deferred=True)
+    # Description with boilerplate stripped, used for LLM prompts
+    clean_description: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
+    # JSON of summary fields published by the page (salary, skills), keyed like the LLM response
+    structured_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
     url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # The saved job_page this post was extracted from, if any
+    job_page_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("job_page.page_id", ondelete="SET NULL"), nullable=True, unique=True, index=True
+    )
 
-    # Relationship
-    company: Mapped["Company"] = relationship("Company", back_populates="job_posts")
+    # Relationship; loaded only on request (JobPostRepository with_company),
+    # a lazy load that would hit the database raises instead
+    company: Mapped["Company"] = relationship(
+        "Company", back_populates="job_posts", lazy="raise_on_sql"
+    )
 
     def __repr__(self) -> str:
         return (
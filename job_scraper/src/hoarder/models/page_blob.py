@@ -0,0 +1,25 @@
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PageBlob(Base):
+    """Compressed page HTML, stored once per distinct content (keyed by SHA-256)"""
+
+    __tablename__ = "page_blob"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    compression: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)  # uncompressed bytes
+    compressed_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Trained dictionary used to compress this blob; None means plain zstd
+    dict_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("compression_dictionary.id"), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return f"PageBlob(sha256={self.sha256!r}, size={self.size}, compressed_size={self.compressed_size})"
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PipelineCheckpoint(Base):
+    """
+    High-water mark of a resumable backfill.
+
+    `last_id` is the last source row the named stage has finished with, so
+    the next run continues after it instead of rescanning the table.
+    """
+
+    __tablename__ = "pipeline_checkpoint"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    last_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
+    )
+
+    def __repr__(self) -> str:
+        return f"PipelineCheckpoint(name={self.name!r}, last_id={self.last_id})"
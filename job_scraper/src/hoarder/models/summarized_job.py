@@ -1,5 +1,5 @@
 from sqlalchemy import ForeignKey, String, Text, Integer
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, backref, mapped_column, relationship
 from typing import TYPE_CHECKING, Optional
 
 from .base import Base
@@ -25,8 +25,11 @@ class SummarizedJob(Base):
     estimated_salary_min: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     estimated_salary_max: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
-    # Relationship
-    job_post: Mapped["JobPost"] = relationship("JobPost", backref="summary")
+    # Relationship; loaded only on request (SummarizedJobRepository with_job_post),
+    # a lazy load that would hit the database raises instead
+    job_post: Mapped["JobPost"] = relationship(
+        "JobPost", backref=backref("summary", lazy="raise_on_sql"), lazy="raise_on_sql"
+    )
 
     def __repr__(self) -> str:
         return f"SummarizedJob(id={self.id}, job_post_id={self.job_post_id}, seniority_level={self.seniority_level!r})"
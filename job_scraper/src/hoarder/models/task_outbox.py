@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class TaskOutbox(Base):
+    """
+    A Celery task waiting to be published.
+
+    Rows are written in the same transaction as the data they refer to and
+    deleted by the outbox relay once the task reached the broker.
+    """
+
+    __tablename__ = "task_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    task_name: Mapped[str] = mapped_column(String, nullable=False)
+    args: Mapped[str] = mapped_column(Text, nullable=False)  # JSON list of task args
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.current_timestamp()
+    )
+
+    def __repr__(self) -> str:
+        return f"TaskOutbox(id={self.id}, task_name={self.task_name!r}, attempts={self.attempts})"
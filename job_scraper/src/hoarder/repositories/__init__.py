@@ -1,11 +1,24 @@
 from .company import CompanyRepository
-from .job_page import JobPageRepository
+from .compression_dictionary import CompressionDictionaryRepository
+from .job_page import JobPageRepository, PageCapture
 from .job_post import JobPostRepository
+from .page_blob import PageBlobRepository
+from .pipeline_checkpoint import PipelineCheckpointRepository
 from .summarized_job import SummarizedJobRepository
+from .summary_cache import SummaryCacheRepository
+from .task_outbox import TaskOutboxRepository
+from .unit_of_work import UnitOfWork
 
 __all__ = [
     "CompanyRepository",
+    "CompressionDictionaryRepository",
     "JobPageRepository",
     "JobPostRepository",
+    "PageBlobRepository",
+    "PageCapture",
+    "PipelineCheckpointRepository",
     "SummarizedJobRepository",
+    "SummaryCacheRepository",
+    "TaskOutboxRepository",
+    "UnitOfWork",
 ]
@@ -0,0 +1,30 @@
+from typing import Any
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class BaseRepository:
+    """
+    Shared plumbing for repositories.
+
+    With autocommit (the default) every write commits and refreshes on its
+    own. Repositories created by a UnitOfWork pass autocommit=False and only
+    flush, leaving the single commit to the unit of work.
+
+    Updates and deletes are set-based (UPDATE ... RETURNING, DELETE ...
+    WHERE) rather than load-then-mutate, so they cost one statement per
+    table touched whether they hit one row or many.
+    """
+
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        self.session = session
+        self.autocommit = autocommit
+
+    async def _commit(self, *instances: Any) -> None:
+        """Commit and refresh instances, or just flush inside a unit of work"""
+        if not self.autocommit:
+            await self.session.flush()
+            return
+
+        await self.session.commit()
+        for instance in instances:
+            await self.session.refresh(instance)
@@ -1,48 +1,148 @@
-from typing import Optional
-from sqlalchemy import func
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from typing import Any, Collection, Optional
+from sqlalchemy import delete, event, exists, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, SessionTransaction, selectinload
 
-from src.hoarder.models import Company
+from src.hoarder.models import Company, JobPost
+from src.hoarder.utils.company_names import normalize_company_name
+from src.hoarder.utils.settings import settings
+from src.hoarder.utils.ttl_cache import TTLCache
 
+from .base import BaseRepository
 
-class CompanyRepository:
-    """Repository for Company model operations"""
+# Normalized company name -> id, shared by every session in this process.
+# Only committed rows go in: ids created inside a transaction wait in
+# session.info until it commits, and are dropped if it rolls back.
+company_id_cache: TTLCache[str, int] = TTLCache(
+    settings.company_cache_max_entries, settings.company_cache_ttl
+)
+_PENDING_KEY = "company_ids_pending"
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_company_ids(session: Session) -> None:
+    for key, company_id in session.info.pop(_PENDING_KEY, {}).items():
+        company_id_cache.put(key, company_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending_company_ids(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+class CompanyRepository(BaseRepository):
+    """
+    Repository for Company model operations.
+
+    Companies are unique by normalized name (case and spacing ignored).
+    get_or_create_id resolves names through an in-process TTL/LRU cache
+    (company_id_cache) before touching the database, and creates missing
+    companies with INSERT ... ON CONFLICT DO NOTHING, so concurrent workers
+    can't create the same company twice.
+
+    Company.job_posts is never lazy loaded; pass with_job_posts to load it
+    with one extra SELECT ... IN per batch of companies.
+    """
+
+    def _pending(self) -> dict[str, int]:
+        """Companies created in the session's current, uncommitted transaction"""
+        return self.session.info.setdefault(_PENDING_KEY, {})
 
     async def create(self, name: str, industry: Optional[str] = None) -> Company:
         """Create a new company"""
-        company = Company(name=name, industry=industry)
+        company = Company(
+            name=name, normalized_name=normalize_company_name(name), industry=industry
+        )
         self.session.add(company)
-        await self.session.commit()
-        await self.session.refresh(company)
+        await self.session.flush()
+        self._pending()[company.normalized_name] = company.id
+        await self._commit(company)
         return company
 
-    async def get_by_id(self, company_id: int) -> Optional[Company]:
+    async def get_by_id(self, company_id: int, with_job_posts: bool = False) -> Optional[Company]:
         """Get a company by ID"""
-        res = await self.session.execute(select(Company).filter(Company.id == company_id))
+        stmt = select(Company).filter(Company.id == company_id)
+        if with_job_posts:
+            stmt = stmt.options(selectinload(Company.job_posts))
+        res = await self.session.execute(stmt)
         return res.scalar_one_or_none()
 
+    async def get_by_ids(
+        self, company_ids: list[int], with_job_posts: bool = False
+    ) -> list[Company]:
+        """Get companies by IDs in one query (two with with_job_posts)"""
+        stmt = select(Company).filter(Company.id.in_(company_ids))
+        if with_job_posts:
+            stmt = stmt.options(selectinload(Company.job_posts))
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
     async def get_by_name(self, name: str) -> Optional[Company]:
-        """Get a company by name (case-insensitive)"""
+        """Get a company by name (case and spacing ignored)"""
         res = await self.session.execute(
-            select(Company).filter(func.lower(Company.name) == func.lower(name))
+            select(Company).filter(Company.normalized_name == normalize_company_name(name))
         )
         return res.scalar_one_or_none()
 
-    async def get_all(self) -> list[Company]:
-        """Get all companies"""
-        res = await self.session.execute(select(Company))
+    async def get_all(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        with_job_posts: bool = False,
+    ) -> list[Company]:
+        """Get companies ordered by ID, optionally as a keyset page after `after_id`"""
+        stmt = select(Company).order_by(Company.id)
+        if with_job_posts:
+            stmt = stmt.options(selectinload(Company.job_posts))
+        if after_id is not None:
+            stmt = stmt.filter(Company.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        res = await self.session.execute(stmt)
         return list(res.scalars().all())
 
+    async def get_or_create_id(self, name: str, industry: Optional[str] = None) -> int:
+        """
+        Get the ID of a company by name, creating the company if it doesn't exist.
+
+        Cache hits cost no query. Otherwise the company is looked up, and if
+        missing inserted with ON CONFLICT DO NOTHING; when another worker
+        inserted it first, the lookup is repeated.
+        """
+        key = normalize_company_name(name)
+        company_id = self._pending().get(key) or company_id_cache.get(key)
+        if company_id is not None:
+            return company_id
+
+        select_id = select(Company.id).filter(Company.normalized_name == key)
+        company_id = (await self.session.execute(select_id)).scalar_one_or_none()
+        if company_id is not None:
+            company_id_cache.put(key, company_id)
+            return company_id
+
+        res = await self.session.execute(
+            insert(Company)
+            .values(name=name, normalized_name=key, industry=industry)
+            .on_conflict_do_nothing(index_elements=[Company.normalized_name])
+            .returning(Company.id)
+        )
+        company_id = res.scalar_one_or_none()
+        if company_id is None:
+            # Created (and committed) by someone else since the lookup above
+            company_id = (await self.session.execute(select_id)).scalar_one()
+            company_id_cache.put(key, company_id)
+            return company_id
+
+        self._pending()[key] = company_id
+        await self._commit()
+        return company_id
+
     async def get_or_create(self, name: str, industry: Optional[str] = None) -> Company:
-        """Get a company by name (case-insensitive) or create if it doesn't exist"""
-        company = await self.get_by_name(name)
-        if not company:
-            company = await self.create(name, industry)
-        return company
+        """Get a company by name (case and spacing ignored) or create if it doesn't exist"""
+        company_id = await self.get_or_create_id(name, industry)
+        res = await self.session.execute(select(Company).filter(Company.id == company_id))
+        return res.scalar_one()
 
     async def update(
         self,
@@ -50,26 +150,46 @@ class CompanyRepository:
         name: Optional[str] = None,
         industry: Optional[str] = None,
     ) -> Optional[Company]:
-        """Update a company"""
-        company = await self.get_by_id(company_id)
-        if not company:
-            return None
-
+        """Update a company with one UPDATE ... RETURNING"""
+        values: dict[str, Any] = {}
         if name is not None:
-            company.name = name
+            values["name"] = name
+            values["normalized_name"] = normalize_company_name(name)
         if industry is not None:
-            company.industry = industry
+            values["industry"] = industry
+        if not values:
+            return await self.get_by_id(company_id)
 
-        await self.session.commit()
-        await self.session.refresh(company)
+        res = await self.session.execute(
+            update(Company).where(Company.id == company_id).values(**values).returning(Company)
+        )
+        company = res.scalar_one_or_none()
+        await self._commit()
+        if name is not None:
+            company_id_cache.discard_value(company_id)
         return company
 
     async def delete(self, company_id: int) -> bool:
-        """Delete a company by ID"""
-        company = await self.get_by_id(company_id)
-        if not company:
-            return False
-
-        await self.session.delete(company)
-        await self.session.commit()
-        return True
+        """Delete a company by ID, unless it still has job posts"""
+        return await self.delete_many([company_id]) > 0
+
+    async def delete_many(self, company_ids: Collection[int]) -> int:
+        """
+        Delete companies by ID, returning how many were deleted.
+
+        Companies that still have job posts are left in place.
+        """
+        if not company_ids:
+            return 0
+        res = await self.session.execute(
+            delete(Company)
+            .where(
+                Company.id.in_(set(company_ids)),
+                ~exists().where(JobPost.company_id == Company.id),
+            )
+            .returning(Company.id)
+        )
+        deleted = set(res.scalars().all())
+        await self._commit()
+        company_id_cache.discard_values(deleted)
+        return len(deleted)
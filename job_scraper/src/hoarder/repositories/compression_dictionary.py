@@ -0,0 +1,39 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+
+from src.hoarder.models import CompressionDictionary
+
+
+class CompressionDictionaryRepository:
+    """Repository for CompressionDictionary model operations"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, data: bytes, sample_count: int) -> CompressionDictionary:
+        """Store a newly trained dictionary"""
+        dictionary = CompressionDictionary(data=data, sample_count=sample_count)
+        self.session.add(dictionary)
+        await self.session.commit()
+        await self.session.refresh(dictionary)
+        return dictionary
+
+    async def get_by_id(self, dict_id: int) -> Optional[CompressionDictionary]:
+        """Get a dictionary by ID"""
+        res = await self.session.execute(
+            select(CompressionDictionary).filter(CompressionDictionary.id == dict_id)
+        )
+        return res.scalar_one_or_none()
+
+    async def get_latest_id(self) -> Optional[int]:
+        """Get the ID of the newest dictionary, if any has been trained"""
+        res = await self.session.execute(select(func.max(CompressionDictionary.id)))
+        return res.scalar_one_or_none()
+
+    async def get_all_data(self) -> dict[int, bytes]:
+        """Get every stored dictionary's bytes, keyed by ID"""
+        res = await self.session.execute(
+            select(CompressionDictionary.id, CompressionDictionary.data)
+        )
+        return {row.id: row.data for row in res.all()}
@@ -1,65 +1,330 @@
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Collection, NamedTuple, Optional, Sequence, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Row, delete, func, insert, select, update
+from sqlalchemy.orm import load_only
 
-from src.hoarder.models import JobPage
+from src.hoarder.models import JobPage, JobPost, PageBlob
+from src.hoarder.utils.html_compression import decompress_html
+from src.hoarder.utils.urls import canonicalize_url
 
+from .base import BaseRepository
+from .page_blob import PageBlobRepository
 
-class JobPageRepository:
-    """Repository for JobPage model operations"""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
+class PageCapture(NamedTuple):
+    """A page to store, with the change-detection data known for it"""
 
-    async def create(self, url: str, page_html: str) -> JobPage:
-        """Create a new job page"""
-        job_page = JobPage(url=url, page_html=page_html)
+    url: str
+    page_html: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_sha256: Optional[str] = None
+
+
+class JobPageRepository(BaseRepository):
+    """
+    Repository for JobPage model operations.
+
+    Page HTML is written to the content-addressed page_blob table through
+    PageBlobRepository; job_page rows only reference it by hash. The
+    canonical URL is derived here on every write, so lookups by URL match
+    any variant of it.
+    """
+
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        super().__init__(session, autocommit)
+        self.blob_repo = PageBlobRepository(session)
+
+    async def create(
+        self,
+        url: str,
+        page_html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_sha256: Optional[str] = None,
+    ) -> JobPage:
+        """Create a new job page (keyed by its HTML hash when content_sha256 is None)"""
+        blob = await self.blob_repo.store(page_html)
+        job_page = JobPage(
+            url=url,
+            canonical_url=canonicalize_url(url),
+            html_sha256=blob.sha256,
+            html_size=blob.size,
+            html_compression=blob.compression,
+            etag=etag,
+            last_modified=last_modified,
+            content_sha256=content_sha256 or blob.sha256,
+        )
         self.session.add(job_page)
-        await self.session.commit()
-        await self.session.refresh(job_page)
+        await self._commit(job_page)
         return job_page
 
+    async def create_many(
+        self, pages: Sequence[Union[tuple[str, str], PageCapture]]
+    ) -> list[int]:
+        """
+        Create many job pages in a single transaction.
+
+        `pages` holds (url, page_html) pairs or PageCaptures. Rows are sent
+        as multi-row INSERT ... RETURNING statements and the returned
+        page_ids are in the same order as `pages`. Captures without a
+        content_sha256 are keyed by their HTML hash.
+        """
+        if not pages:
+            return []
+
+        captures = [PageCapture(*page) for page in pages]
+        blobs = await self.blob_repo.store_many([capture.page_html for capture in captures])
+        res = await self.session.execute(
+            insert(JobPage).returning(JobPage.page_id, sort_by_parameter_order=True),
+            [
+                {
+                    "url": capture.url,
+                    "canonical_url": canonicalize_url(capture.url),
+                    "html_sha256": blob.sha256,
+                    "html_size": blob.size,
+                    "html_compression": blob.compression,
+                    "etag": capture.etag,
+                    "last_modified": capture.last_modified,
+                    "content_sha256": capture.content_sha256 or blob.sha256,
+                }
+                for capture, blob in zip(captures, blobs)
+            ],
+        )
+        page_ids = list(res.scalars().all())
+        await self._commit()
+        return page_ids
+
     async def get_by_id(self, page_id: int) -> Optional[JobPage]:
-        """Get a job page by ID"""
+        """Get a job page by ID (without its HTML, see get_html)"""
         res = await self.session.execute(select(JobPage).filter(JobPage.page_id == page_id))
         return res.scalar_one_or_none()
 
     async def get_by_url(self, url: str) -> Optional[JobPage]:
-        """Get a job page by URL"""
-        res = await self.session.execute(select(JobPage).filter(JobPage.url == url))
+        """Get the latest capture of a URL (or any variant of it), without its HTML
+
+        The latest capture is the one seen most recently (see touch), so a
+        page that changed and then changed back resolves to the older row.
+        """
+        res = await self.session.execute(
+            select(JobPage)
+            .filter(JobPage.canonical_url == canonicalize_url(url))
+            .order_by(JobPage.last_seen_at.desc(), JobPage.page_id.desc())
+            .limit(1)
+        )
         return res.scalar_one_or_none()
 
-    async def get_all(self) -> list[JobPage]:
-        """Get all job pages"""
-        res = await self.session.execute(select(JobPage))
+    async def touch(self, page_ids: Collection[int]) -> None:
+        """Mark stored captures as seen again now, making each the latest for its URL"""
+        if not page_ids:
+            return
+        await self.session.execute(
+            update(JobPage)
+            .where(JobPage.page_id.in_(set(page_ids)))
+            .values(last_seen_at=datetime.now(timezone.utc).replace(tzinfo=None))
+        )
+        await self._commit()
+
+    async def get_capture(self, url: str, content_sha256: str) -> Optional[JobPage]:
+        """Get the stored capture of a URL with this content, if there is one"""
+        res = await self.session.execute(
+            select(JobPage).filter(
+                JobPage.canonical_url == canonicalize_url(url),
+                JobPage.content_sha256 == content_sha256,
+            )
+        )
+        return res.scalar_one_or_none()
+
+    async def get_capture_ids(
+        self, captures: Sequence[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        """Map the (canonical_url, content_sha256) of already stored captures to page_ids
+
+        `captures` holds (url, content_sha256) pairs; all are looked up in one query.
+        """
+        keys = {(canonicalize_url(url), content_sha256) for url, content_sha256 in captures}
+        if not keys:
+            return {}
+        # IN on the index's leading column is an index search per URL; a
+        # (canonical_url, content_sha256) row-value IN would walk the whole index
+        res = await self.session.execute(
+            select(JobPage.canonical_url, JobPage.content_sha256, JobPage.page_id).filter(
+                JobPage.canonical_url.in_({canonical_url for canonical_url, _ in keys})
+            )
+        )
+        return {
+            (row.canonical_url, row.content_sha256): row.page_id
+            for row in res
+            if (row.canonical_url, row.content_sha256) in keys
+        }
+
+    async def update_validators(
+        self, validators: dict[int, tuple[Optional[str], Optional[str]]]
+    ) -> None:
+        """
+        Store the ETag and Last-Modified of re-fetches that found no changes,
+        keyed by page ID, in one executemany UPDATE
+        """
+        if not validators:
+            return
+        await self.session.execute(
+            update(JobPage),
+            [
+                {"page_id": page_id, "etag": etag, "last_modified": last_modified}
+                for page_id, (etag, last_modified) in validators.items()
+            ],
+        )
+        await self._commit()
+
+    async def get_html(self, page_id: int) -> Optional[str]:
+        """Get only the stored (decompressed) HTML of a job page"""
+        res = await self.session.execute(
+            select(PageBlob.data, PageBlob.compression, PageBlob.dict_id)
+            .join(JobPage, JobPage.html_sha256 == PageBlob.sha256)
+            .filter(JobPage.page_id == page_id)
+        )
+        row = res.one_or_none()
+        if not row:
+            return None
+        await self.blob_repo.load_dictionary(row.dict_id)
+        return decompress_html(row.data, row.compression, row.dict_id)
+
+    async def get_compressed(
+        self, after_id: Optional[int] = None, limit: int = 500
+    ) -> list[Row[tuple[int, str, bytes, str, Optional[int]]]]:
+        """Get a keyset page of (page_id, url, data, compression, dict_id) rows
+
+        The HTML is left compressed, for callers that decode it elsewhere
+        (e.g. in worker processes).
+        """
+        stmt = (
+            select(JobPage.page_id, JobPage.url, PageBlob.data, PageBlob.compression, PageBlob.dict_id)
+            .join(PageBlob, JobPage.html_sha256 == PageBlob.sha256)
+            .order_by(JobPage.page_id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.filter(JobPage.page_id > after_id)
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
+    async def get_all(
+        self, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> list[JobPage]:
+        """Get job pages ordered by ID, optionally as a keyset page after `after_id`
+
+        Only page_id and url are loaded.
+        """
+        stmt = (
+            select(JobPage)
+            .options(load_only(JobPage.page_id, JobPage.url))
+            .order_by(JobPage.page_id)
+        )
+        if after_id is not None:
+            stmt = stmt.filter(JobPage.page_id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        res = await self.session.execute(stmt)
         return list(res.scalars().all())
 
+    async def count(self) -> int:
+        """Count all job pages"""
+        res = await self.session.execute(select(func.count()).select_from(JobPage))
+        return res.scalar_one()
+
+    async def stream_all(
+        self, after_id: Optional[int] = None, batch_size: int = 500
+    ) -> AsyncIterator[Row[tuple[int, str]]]:
+        """Stream (page_id, url) rows ordered by ID without buffering the whole table"""
+        stmt = (
+            select(JobPage.page_id, JobPage.url)
+            .order_by(JobPage.page_id)
+            .execution_options(yield_per=batch_size)
+        )
+        if after_id is not None:
+            stmt = stmt.filter(JobPage.page_id > after_id)
+        res = await self.session.stream(stmt)
+        async for row in res:
+            yield row
+
     async def update(
         self,
         page_id: int,
         url: Optional[str] = None,
         page_html: Optional[str] = None,
+        content_sha256: Optional[str] = None,
     ) -> Optional[JobPage]:
-        """Update a job page"""
-        job_page = await self.get_by_id(page_id)
-        if not job_page:
-            return None
+        """Update a job page with one UPDATE ... RETURNING
 
+        content_sha256 should accompany new page_html; without it the page
+        is keyed by its HTML hash. New HTML costs one more query first, for
+        the hash of the blob it replaces.
+        """
+        values: dict[str, Any] = {}
         if url is not None:
-            job_page.url = url
+            values["url"] = url
+            values["canonical_url"] = canonicalize_url(url)
+        if content_sha256 is not None:
+            values["content_sha256"] = content_sha256
+
+        old_sha256 = None
         if page_html is not None:
-            job_page.page_html = page_html
+            res = await self.session.execute(
+                select(JobPage.html_sha256).filter(JobPage.page_id == page_id)
+            )
+            old_sha256 = res.scalar_one_or_none()
+            if old_sha256 is None:
+                return None
+            blob = await self.blob_repo.store(page_html)
+            values["html_sha256"] = blob.sha256
+            values["html_size"] = blob.size
+            values["html_compression"] = blob.compression
+            values.setdefault("content_sha256", blob.sha256)
+
+        if not values:
+            return await self.get_by_id(page_id)
 
-        await self.session.commit()
-        await self.session.refresh(job_page)
+        res = await self.session.execute(
+            update(JobPage).where(JobPage.page_id == page_id).values(**values).returning(JobPage)
+        )
+        job_page = res.scalar_one_or_none()
+        if old_sha256 is not None and old_sha256 != values["html_sha256"]:
+            await self.blob_repo.delete_unreferenced([old_sha256])
+        await self._commit()
         return job_page
 
     async def delete(self, page_id: int) -> bool:
         """Delete a job page by ID"""
-        job_page = await self.get_by_id(page_id)
-        if not job_page:
-            return False
+        return await self.delete_many([page_id]) > 0
+
+    async def delete_many(self, page_ids: Collection[int]) -> int:
+        """Delete job pages by ID, returning how many were deleted"""
+        if not page_ids:
+            return 0
+        return await self._delete_where(JobPage.page_id.in_(set(page_ids)))
+
+    async def delete_created_before(self, cutoff: datetime) -> int:
+        """Delete every job page captured before `cutoff`, returning how many were deleted"""
+        return await self._delete_where(JobPage.created_at < cutoff)
+
+    async def _delete_where(self, criterion: ColumnElement[bool]) -> int:
+        """
+        Delete the matching job pages with set-based statements.
 
-        await self.session.delete(job_page)
-        await self.session.commit()
-        return True
+        Job posts extracted from them are detached first (job_post.job_page_id
+        is ON DELETE SET NULL, which SQLite only enforces with foreign keys
+        on), then blobs no remaining page points at are deleted.
+        """
+        await self.session.execute(
+            update(JobPost)
+            .where(JobPost.job_page_id.in_(select(JobPage.page_id).where(criterion)))
+            .values(job_page_id=None)
+        )
+        res = await self.session.execute(
+            delete(JobPage).where(criterion).returning(JobPage.html_sha256)
+        )
+        sha256s = res.scalars().all()
+        await self.blob_repo.delete_unreferenced(sha256s)
+        await self._commit()
+        return len(sha256s)
@@ -1,15 +1,35 @@
-from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from typing import Any, Collection, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import joinedload, undefer
+from sqlalchemy.sql import Select
 
-from src.hoarder.models import JobPost
+from src.hoarder.models import JobPost, SummarizedJob
 
+from .base import BaseRepository
 
-class JobPostRepository:
-    """Repository for JobPost model operations"""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
+def _with_options(
+    stmt: Select[tuple[JobPost]], with_description: bool, with_company: bool
+) -> Select[tuple[JobPost]]:
+    if with_description:
+        stmt = stmt.options(
+            undefer(JobPost.description),
+            undefer(JobPost.clean_description),
+            undefer(JobPost.structured_data),
+        )
+    if with_company:
+        # Many-to-one on a NOT NULL key: inner join it into the same query
+        stmt = stmt.options(joinedload(JobPost.company, innerjoin=True))
+    return stmt
+
+
+class JobPostRepository(BaseRepository):
+    """
+    Repository for JobPost model operations.
+
+    JobPost.company is never lazy loaded; pass with_company to the getters
+    that need it.
+    """
 
     async def create(
         self,
@@ -17,28 +37,109 @@ class JobPostRepository:
         title: str,
         description: str,
         url: Optional[str] = None,
+        clean_description: Optional[str] = None,
+        structured_data: Optional[str] = None,
+        job_page_id: Optional[int] = None,
     ) -> JobPost:
         """Create a new job post"""
         job_post = JobPost(
-            company_id=company_id, title=title, description=description, url=url
+            company_id=company_id,
+            title=title,
+            description=description,
+            url=url,
+            clean_description=clean_description,
+            structured_data=structured_data,
+            job_page_id=job_page_id,
         )
         self.session.add(job_post)
-        await self.session.commit()
-        await self.session.refresh(job_post)
+        await self._commit(job_post)
         return job_post
 
-    async def get_by_id(self, job_post_id: int) -> Optional[JobPost]:
-        """Get a job post by ID"""
-        res = await self.session.execute(select(JobPost).filter(JobPost.id == job_post_id))
+    async def get_by_id(
+        self, job_post_id: int, with_description: bool = False, with_company: bool = False
+    ) -> Optional[JobPost]:
+        """Get a job post by ID, loading descriptions and structured data only with with_description"""
+        stmt = _with_options(
+            select(JobPost).filter(JobPost.id == job_post_id), with_description, with_company
+        )
+        res = await self.session.execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def get_by_ids(
+        self, job_post_ids: list[int], with_description: bool = False, with_company: bool = False
+    ) -> list[JobPost]:
+        """Get job posts by IDs in one query, ordered by ID"""
+        stmt = _with_options(
+            select(JobPost).filter(JobPost.id.in_(job_post_ids)).order_by(JobPost.id),
+            with_description,
+            with_company,
+        )
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
+    async def get_unsummarized_ids(self, limit: int) -> list[int]:
+        """Get IDs of the oldest job posts that have no summarized_job yet"""
+        res = await self.session.execute(
+            select(JobPost.id)
+            .outerjoin(SummarizedJob, SummarizedJob.job_post_id == JobPost.id)
+            .filter(SummarizedJob.id.is_(None))
+            .order_by(JobPost.id)
+            .limit(limit)
+        )
+        return list(res.scalars().all())
+
+    async def get_promoted_page_ids(self, job_page_ids: list[int]) -> set[int]:
+        """Which of the given job pages already have a job post"""
+        if not job_page_ids:
+            return set()
+        res = await self.session.execute(
+            select(JobPost.job_page_id).filter(JobPost.job_page_id.in_(job_page_ids))
+        )
+        return set(res.scalars().all())
+
+    async def get_description(self, job_post_id: int) -> Optional[str]:
+        """Get only the description of a job post"""
+        res = await self.session.execute(
+            select(JobPost.description).filter(JobPost.id == job_post_id)
+        )
         return res.scalar_one_or_none()
 
-    async def get_all(self) -> list[JobPost]:
-        """Get all job posts"""
-        res = await self.session.execute(select(JobPost))
+    async def get_all(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        with_company: bool = False,
+    ) -> list[JobPost]:
+        """Get job posts ordered by ID, optionally as a keyset page after `after_id`
+
+        The description column stays deferred.
+        """
+        stmt = _with_options(select(JobPost).order_by(JobPost.id), False, with_company)
+        if after_id is not None:
+            stmt = stmt.filter(JobPost.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        res = await self.session.execute(stmt)
+        return list(res.scalars().all())
+
+    async def get_without_clean_description(
+        self, after_id: Optional[int] = None, limit: int = 500
+    ) -> list[JobPost]:
+        """Get a keyset page of job posts whose clean_description is not set yet, with description"""
+        stmt = (
+            select(JobPost)
+            .options(undefer(JobPost.description))
+            .filter(JobPost.clean_description.is_(None))
+            .order_by(JobPost.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            stmt = stmt.filter(JobPost.id > after_id)
+        res = await self.session.execute(stmt)
         return list(res.scalars().all())
 
     async def get_by_company_id(self, company_id: int) -> list[JobPost]:
-        """Get all job posts for a specific company"""
+        """Get all job posts for a specific company (description is deferred)"""
         res = await self.session.execute(select(JobPost).filter(JobPost.company_id == company_id))
         return list(res.scalars().all())
 
@@ -48,29 +149,53 @@ class JobPostRepository:
         title: Optional[str] = None,
         description: Optional[str] = None,
         url: Optional[str] = None,
+        clean_description: Optional[str] = None,
     ) -> Optional[JobPost]:
-        """Update a job post"""
-        job_post = await self.get_by_id(job_post_id)
-        if not job_post:
-            return None
-
+        """Update a job post with one UPDATE ... RETURNING"""
+        values: dict[str, Any] = {}
         if title is not None:
-            job_post.title = title
+            values["title"] = title
         if description is not None:
-            job_post.description = description
+            values["description"] = description
         if url is not None:
-            job_post.url = url
+            values["url"] = url
+        if clean_description is not None:
+            values["clean_description"] = clean_description
+        if not values:
+            return await self.get_by_id(job_post_id)
 
-        await self.session.commit()
-        await self.session.refresh(job_post)
+        res = await self.session.execute(
+            update(JobPost).where(JobPost.id == job_post_id).values(**values).returning(JobPost)
+        )
+        job_post = res.scalar_one_or_none()
+        await self._commit()
         return job_post
 
+    async def update_clean_descriptions(self, clean_descriptions: dict[int, str]) -> None:
+        """Set the clean_description of many job posts, keyed by ID, in one executemany UPDATE"""
+        if not clean_descriptions:
+            return
+        await self.session.execute(
+            update(JobPost),
+            [
+                {"id": job_post_id, "clean_description": clean_description}
+                for job_post_id, clean_description in clean_descriptions.items()
+            ],
+        )
+        await self._commit()
+
     async def delete(self, job_post_id: int) -> bool:
-        """Delete a job post by ID"""
-        job_post = await self.get_by_id(job_post_id)
-        if not job_post:
-            return False
-
-        await self.session.delete(job_post)
-        await self.session.commit()
-        return True
+        """Delete a job post by ID, along with its summary"""
+        return await self.delete_many([job_post_id]) > 0
+
+    async def delete_many(self, job_post_ids: Collection[int]) -> int:
+        """Delete job posts by ID along with their summaries, returning how many posts went"""
+        if not job_post_ids:
+            return 0
+        ids = set(job_post_ids)
+        await self.session.execute(
+            delete(SummarizedJob).where(SummarizedJob.job_post_id.in_(ids))
+        )
+        res = await self.session.execute(delete(JobPost).where(JobPost.id.in_(ids)))
+        await self._commit()
+        return res.rowcount
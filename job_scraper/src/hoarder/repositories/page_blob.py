@@ -0,0 +1,122 @@
+from typing import Collection, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.hoarder.models import JobPage, PageBlob
+from src.hoarder.utils.html_compression import (
+    CompressedHtml,
+    compress_html,
+    decompress_html,
+    has_dictionary,
+    register_dictionary,
+)
+
+from .compression_dictionary import CompressionDictionaryRepository
+
+
+class PageBlobRepository:
+    """
+    Repository for content-addressed, compressed page HTML.
+
+    New blobs are compressed with the newest trained dictionary, if any;
+    each blob records the dictionary it used so older blobs stay readable.
+    The newest dictionary is looked up once per repository, so a batch of
+    stores costs one lookup; a dictionary trained later is picked up by
+    repositories created after it.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.dictionary_repo = CompressionDictionaryRepository(session)
+        self._dict_id: Optional[int] = None
+        self._dict_resolved = False
+
+    async def _active_dict_id(self) -> Optional[int]:
+        """The dictionary new blobs are compressed with, loaded in this process"""
+        if not self._dict_resolved:
+            self._dict_id = await self.dictionary_repo.get_latest_id()
+            await self.load_dictionary(self._dict_id)
+            self._dict_resolved = True
+        return self._dict_id
+
+    async def load_dictionary(self, dict_id: Optional[int]) -> None:
+        """Make sure a dictionary is loaded in this process before (de)compressing with it"""
+        if dict_id is None or has_dictionary(dict_id):
+            return
+        dictionary = await self.dictionary_repo.get_by_id(dict_id)
+        if not dictionary:
+            raise LookupError(f"Compression dictionary {dict_id} not found")
+        register_dictionary(dictionary.id, dictionary.data)
+
+    async def store(self, html: str) -> CompressedHtml:
+        """Compress and store HTML unless identical content is already stored (no commit)"""
+        return (await self.store_many([html]))[0]
+
+    async def store_many(self, htmls: list[str]) -> list[CompressedHtml]:
+        """
+        Compress and store many HTML documents in one statement (no commit).
+
+        Documents whose SHA-256 is already present are skipped, so identical
+        captures share a single blob.
+        """
+        if not htmls:
+            return []
+
+        dict_id = await self._active_dict_id()
+        blobs = [compress_html(html, dict_id) for html in htmls]
+
+        unique = {blob.sha256: blob for blob in blobs}
+        await self.session.execute(
+            insert(PageBlob)
+            .values(
+                [
+                    {
+                        "sha256": blob.sha256,
+                        "compression": blob.compression,
+                        "size": blob.size,
+                        "compressed_size": len(blob.data),
+                        "data": blob.data,
+                        "dict_id": blob.dict_id,
+                    }
+                    for blob in unique.values()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[PageBlob.sha256])
+        )
+        return blobs
+
+    async def get_html(self, sha256: str) -> Optional[str]:
+        """Get the decompressed HTML stored under a hash"""
+        res = await self.session.execute(
+            select(PageBlob.data, PageBlob.compression, PageBlob.dict_id).filter(
+                PageBlob.sha256 == sha256
+            )
+        )
+        row = res.one_or_none()
+        if not row:
+            return None
+        await self.load_dictionary(row.dict_id)
+        return decompress_html(row.data, row.compression, row.dict_id)
+
+    async def get_sample(self, limit: int) -> list[PageBlob]:
+        """Get a random sample of stored blobs"""
+        res = await self.session.execute(
+            select(PageBlob).order_by(func.random()).limit(limit)
+        )
+        return list(res.scalars().all())
+
+    async def delete_if_unreferenced(self, sha256: str) -> None:
+        """Delete a blob no job page points at any more (no commit)"""
+        await self.delete_unreferenced([sha256])
+
+    async def delete_unreferenced(self, sha256s: Collection[str]) -> None:
+        """Delete the given blobs no job page uses any more, in one statement (no commit)"""
+        if not sha256s:
+            return
+        await self.session.execute(
+            delete(PageBlob).where(
+                PageBlob.sha256.in_(set(sha256s)),
+                ~exists().where(JobPage.html_sha256 == PageBlob.sha256),
+            )
+        )
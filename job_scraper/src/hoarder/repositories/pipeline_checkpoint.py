@@ -0,0 +1,29 @@
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.hoarder.models import PipelineCheckpoint
+
+from .base import BaseRepository
+
+
+class PipelineCheckpointRepository(BaseRepository):
+    """Repository for PipelineCheckpoint model operations"""
+
+    async def get(self, name: str) -> Optional[int]:
+        """Get the high-water mark of a pipeline stage, None before its first run"""
+        res = await self.session.execute(
+            select(PipelineCheckpoint.last_id).filter(PipelineCheckpoint.name == name)
+        )
+        return res.scalar_one_or_none()
+
+    async def set(self, name: str, last_id: int) -> None:
+        """Insert or move the high-water mark of a pipeline stage"""
+        stmt = insert(PipelineCheckpoint).values(name=name, last_id=last_id)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PipelineCheckpoint.name],
+                set_={"last_id": stmt.excluded.last_id, "updated_at": func.current_timestamp()},
+            )
+        )
+        await self._commit()
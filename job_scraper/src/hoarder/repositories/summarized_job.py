@@ -1,15 +1,33 @@
-from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from typing import Any, Collection, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Select
 
-from src.hoarder.models import SummarizedJob
+from src.hoarder.models import JobPost, SummarizedJob
 
+from .base import BaseRepository
 
-class SummarizedJobRepository:
-    """Repository for SummarizedJob model operations"""
 
-    def __init__(self, session: AsyncSession):
-        self.session = session
+def _with_job_post(
+    stmt: Select[tuple[SummarizedJob]], with_job_post: bool
+) -> Select[tuple[SummarizedJob]]:
+    if with_job_post:
+        # Both many-to-one on NOT NULL keys: inner joined into the same query
+        stmt = stmt.options(
+            joinedload(SummarizedJob.job_post, innerjoin=True).joinedload(
+                JobPost.company, innerjoin=True
+            )
+        )
+    return stmt
+
+
+class SummarizedJobRepository(BaseRepository):
+    """
+    Repository for SummarizedJob model operations.
+
+    SummarizedJob.job_post is never lazy loaded; with_job_post loads the
+    post and its company in the same query.
+    """
 
     async def create(
         self,
@@ -30,14 +48,17 @@ class SummarizedJobRepository:
             estimated_salary_max=estimated_salary_max,
         )
         self.session.add(summarized_job)
-        await self.session.commit()
-        await self.session.refresh(summarized_job)
+        await self._commit(summarized_job)
         return summarized_job
 
-    async def get_by_id(self, summarized_job_id: int) -> Optional[SummarizedJob]:
+    async def get_by_id(
+        self, summarized_job_id: int, with_job_post: bool = False
+    ) -> Optional[SummarizedJob]:
         """Get a summarized job by ID"""
         res = await self.session.execute(
-            select(SummarizedJob).filter(SummarizedJob.id == summarized_job_id)
+            _with_job_post(
+                select(SummarizedJob).filter(SummarizedJob.id == summarized_job_id), with_job_post
+            )
         )
         return res.scalar_one_or_none()
 
@@ -48,9 +69,31 @@ class SummarizedJobRepository:
         )
         return res.scalar_one_or_none()
 
-    async def get_all(self) -> list[SummarizedJob]:
-        """Get all summarized jobs"""
-        res = await self.session.execute(select(SummarizedJob))
+    async def get_by_job_post_ids(
+        self, job_post_ids: list[int], with_job_post: bool = False
+    ) -> list[SummarizedJob]:
+        """Get the summarized jobs of several job posts in one query"""
+        res = await self.session.execute(
+            _with_job_post(
+                select(SummarizedJob).filter(SummarizedJob.job_post_id.in_(job_post_ids)),
+                with_job_post,
+            )
+        )
+        return list(res.scalars().all())
+
+    async def get_all(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        with_job_post: bool = False,
+    ) -> list[SummarizedJob]:
+        """Get summarized jobs ordered by ID, optionally as a keyset page after `after_id`"""
+        stmt = _with_job_post(select(SummarizedJob).order_by(SummarizedJob.id), with_job_post)
+        if after_id is not None:
+            stmt = stmt.filter(SummarizedJob.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        res = await self.session.execute(stmt)
         return list(res.scalars().all())
 
     async def update(
@@ -62,32 +105,41 @@ class SummarizedJobRepository:
         estimated_salary_min: Optional[int] = None,
         estimated_salary_max: Optional[int] = None,
     ) -> Optional[SummarizedJob]:
-        """Update a summarized job"""
-        summarized_job = await self.get_by_id(summarized_job_id)
-        if not summarized_job:
-            return None
-
+        """Update a summarized job with one UPDATE ... RETURNING"""
+        values: dict[str, Any] = {}
         if summary is not None:
-            summarized_job.summary = summary
+            values["summary"] = summary
         if technical_skills is not None:
-            summarized_job.technical_skills = technical_skills
+            values["technical_skills"] = technical_skills
         if seniority_level is not None:
-            summarized_job.seniority_level = seniority_level
+            values["seniority_level"] = seniority_level
         if estimated_salary_min is not None:
-            summarized_job.estimated_salary_min = estimated_salary_min
+            values["estimated_salary_min"] = estimated_salary_min
         if estimated_salary_max is not None:
-            summarized_job.estimated_salary_max = estimated_salary_max
+            values["estimated_salary_max"] = estimated_salary_max
+        if not values:
+            return await self.get_by_id(summarized_job_id)
 
-        await self.session.commit()
-        await self.session.refresh(summarized_job)
+        res = await self.session.execute(
+            update(SummarizedJob)
+            .where(SummarizedJob.id == summarized_job_id)
+            .values(**values)
+            .returning(SummarizedJob)
+        )
+        summarized_job = res.scalar_one_or_none()
+        await self._commit()
         return summarized_job
 
     async def delete(self, summarized_job_id: int) -> bool:
         """Delete a summarized job by ID"""
-        summarized_job = await self.get_by_id(summarized_job_id)
-        if not summarized_job:
-            return False
+        return await self.delete_many([summarized_job_id]) > 0
 
-        await self.session.delete(summarized_job)
-        await self.session.commit()
-        return True
+    async def delete_many(self, summarized_job_ids: Collection[int]) -> int:
+        """Delete summarized jobs by ID, returning how many were deleted"""
+        if not summarized_job_ids:
+            return 0
+        res = await self.session.execute(
+            delete(SummarizedJob).where(SummarizedJob.id.in_(set(summarized_job_ids)))
+        )
+        await self._commit()
+        return res.rowcount
@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from src.hoarder.models import SummaryCacheEntry
+
+from .base import BaseRepository
+
+
+class SummaryCacheRepository(BaseRepository):
+    """Repository for SummaryCacheEntry model operations"""
+
+    async def get(self, key: str, not_before: datetime) -> Optional[SummaryCacheEntry]:
+        """Get a live cache entry and record the hit"""
+        res = await self.session.execute(
+            select(SummaryCacheEntry).filter(
+                SummaryCacheEntry.key == key, SummaryCacheEntry.created_at >= not_before
+            )
+        )
+        entry = res.scalar_one_or_none()
+        if entry:
+            await self.session.execute(
+                update(SummaryCacheEntry)
+                .where(SummaryCacheEntry.key == key)
+                .values(hits=SummaryCacheEntry.hits + 1, last_used_at=func.current_timestamp())
+            )
+            await self._commit()
+        return entry
+
+    async def put(self, key: str, model: str, prompt_version: str, result: str) -> None:
+        """Insert or replace a cache entry"""
+        stmt = insert(SummaryCacheEntry).values(
+            key=key, model=model, prompt_version=prompt_version, result=result, hits=0
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[SummaryCacheEntry.key],
+                set_={
+                    "result": stmt.excluded.result,
+                    "created_at": func.current_timestamp(),
+                    "last_used_at": func.current_timestamp(),
+                },
+            )
+        )
+        await self._commit()
+
+    async def evict(self, not_before: datetime, max_entries: int) -> int:
+        """Delete expired entries, then the least recently used ones above max_entries"""
+        res = await self.session.execute(
+            delete(SummaryCacheEntry).where(SummaryCacheEntry.created_at < not_before)
+        )
+        removed = res.rowcount or 0
+
+        count = (
+            await self.session.execute(select(func.count()).select_from(SummaryCacheEntry))
+        ).scalar_one()
+        if count > max_entries:
+            oldest = (
+                select(SummaryCacheEntry.key)
+                .order_by(SummaryCacheEntry.last_used_at)
+                .limit(count - max_entries)
+            )
+            res = await self.session.execute(
+                delete(SummaryCacheEntry).where(SummaryCacheEntry.key.in_(oldest))
+            )
+            removed += res.rowcount or 0
+
+        await self._commit()
+        return removed
+
+    async def count(self) -> int:
+        """Count cache entries"""
+        res = await self.session.execute(select(func.count()).select_from(SummaryCacheEntry))
+        return res.scalar_one()
@@ -0,0 +1,49 @@
+import json
+from typing import Any, Optional
+from sqlalchemy import delete, insert, select, update
+
+from src.hoarder.models import TaskOutbox
+
+from .base import BaseRepository
+
+
+class TaskOutboxRepository(BaseRepository):
+    """Repository for TaskOutbox model operations"""
+
+    async def add(self, task_name: str, args: list[Any]) -> TaskOutbox:
+        """Record a task to publish once the surrounding transaction commits"""
+        entry = TaskOutbox(task_name=task_name, args=json.dumps(args), attempts=0)
+        self.session.add(entry)
+        await self._commit(entry)
+        return entry
+
+    async def add_many(self, task_name: str, args_list: list[list[Any]]) -> None:
+        """Record one task per args list, in a single multi-row INSERT"""
+        if not args_list:
+            return
+        await self.session.execute(
+            insert(TaskOutbox),
+            [{"task_name": task_name, "args": json.dumps(args), "attempts": 0} for args in args_list],
+        )
+        await self._commit()
+
+    async def get_pending(self, limit: int) -> list[TaskOutbox]:
+        """Get the oldest unpublished tasks"""
+        res = await self.session.execute(
+            select(TaskOutbox).order_by(TaskOutbox.id).limit(limit)
+        )
+        return list(res.scalars().all())
+
+    async def delete_many(self, ids: list[int]) -> None:
+        """Remove published tasks"""
+        await self.session.execute(delete(TaskOutbox).where(TaskOutbox.id.in_(ids)))
+        await self._commit()
+
+    async def record_failure(self, ids: list[int], error: Optional[str]) -> None:
+        """Count a failed publish attempt for the given tasks"""
+        await self.session.execute(
+            update(TaskOutbox)
+            .where(TaskOutbox.id.in_(ids))
+            .values(attempts=TaskOutbox.attempts + 1, last_error=error)
+        )
+        await self._commit()
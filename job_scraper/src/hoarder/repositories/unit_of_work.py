@@ -0,0 +1,57 @@
+from types import TracebackType
+from typing import Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .company import CompanyRepository
+from .job_page import JobPageRepository
+from .job_post import JobPostRepository
+from .summarized_job import SummarizedJobRepository
+from .task_outbox import TaskOutboxRepository
+
+
+class UnitOfWork:
+    """
+    One transaction per business operation.
+
+    Repositories handed out by the unit of work flush instead of
+    committing. Leaving the `async with` block commits once, or rolls back if
+    the block raised. Callbacks registered with after_commit() run only after
+    the commit succeeded. Celery tasks should go through `uow.outbox`
+    instead, so they are persisted atomically with the data.
+
+    Usage:
+        async with UnitOfWork(session) as uow:
+            company = await uow.companies.get_or_create(name)
+            job_post = await uow.job_posts.create(company.id, title, description)
+            await uow.outbox.add("process_job_post", [job_post.id])
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.companies = CompanyRepository(session, autocommit=False)
+        self.job_pages = JobPageRepository(session, autocommit=False)
+        self.job_posts = JobPostRepository(session, autocommit=False)
+        self.summarized_jobs = SummarizedJobRepository(session, autocommit=False)
+        self.outbox = TaskOutboxRepository(session, autocommit=False)
+        self._after_commit: list[Callable[[], None]] = []
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is not None:
+            await self.session.rollback()
+            return
+
+        await self.session.commit()
+        for callback in self._after_commit:
+            callback()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the transaction has committed"""
+        self._after_commit.append(callback)
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -10,6 +11,26 @@ class JobPageResponse(BaseModel):
     page_id: int
     url: str
     message: str
+    duplicate: bool = False
+
+
+class JobPageBatchRequest(BaseModel):
+    pages: list[JobPageRequest]
+
+
+class JobPageBatchResult(BaseModel):
+    index: int
+    url: str
+    page_id: Optional[int] = None
+    error: Optional[str] = None
+    duplicate: bool = False
+
+
+class JobPageBatchResponse(BaseModel):
+    created: int
+    duplicates: int
+    failed: int
+    results: list[JobPageBatchResult]
 
 
 class JobPageItem(BaseModel):
@@ -18,5 +39,6 @@ class JobPageItem(BaseModel):
 
 
 class JobPageListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     pages: list[JobPageItem]
+    next_after_id: Optional[int] = None
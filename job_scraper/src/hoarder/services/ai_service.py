@@ -1,18 +1,102 @@
+import asyncio
 import json
 import os
-from typing import Optional, Union
-from sqlalchemy.orm import Session
+from typing import Any, Collection, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
 from langchain_openai import ChatOpenAI  # type: ignore[import-untyped]
 from langchain_anthropic import ChatAnthropic  # type: ignore[import-untyped]
 from langchain_core.messages import HumanMessage, SystemMessage  # type: ignore[import-untyped]
 from dotenv import load_dotenv
 
+from src.hoarder.extraction import clean_description
 from src.hoarder.models import SummarizedJob
-from src.hoarder.repositories import JobPostRepository, SummarizedJobRepository
+from src.hoarder.repositories import JobPostRepository, SummarizedJobRepository, UnitOfWork
+from src.hoarder.services.description_cleaning import cleaning_report, prompt_description
+from src.hoarder.services.summary_cache import SummaryCache, summary_cache_key
+from src.hoarder.utils.rate_limiter import (
+    estimate_tokens,
+    get_rate_limiter,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+from src.hoarder.utils.settings import settings
 
 # Load environment variables
 load_dotenv()
 
+# Bump whenever SYSTEM_PROMPT or the response parsing changes, so cached
+# summaries produced by the old prompt are not reused
+PROMPT_VERSION = "2"
+
+# Completion tokens reserved from the rate limit budget per request
+COMPLETION_TOKENS = 500
+
+# Items the LLM is asked for, with the keys each fills in its JSON response
+SUMMARY_ITEMS: list[tuple[str, dict[str, str]]] = [
+    ("A concise summary (2-3 sentences)", {"summary": '"string"'}),
+    (
+        "A list of technical skills required (as a JSON array)",
+        {"technical_skills": '["skill1", "skill2", ...]'},
+    ),
+    (
+        'The seniority level (one of: "Entry", "Junior", "Mid", "Senior", "Staff", "Principal", "Lead")',
+        {"seniority_level": '"string"'},
+    ),
+    (
+        "An estimated salary range in USD (min and max as integers)",
+        {"estimated_salary_min": "integer or null", "estimated_salary_max": "integer or null"},
+    ),
+]
+
+
+def build_system_prompt(known_fields: Collection[str] = ()) -> str:
+    """System prompt asking only for the items not already known from structured data"""
+    items = [(text, keys) for text, keys in SUMMARY_ITEMS if not set(keys) <= set(known_fields)]
+    numbered = "\n".join(f"{i}. {text}" for i, (text, _) in enumerate(items, start=1))
+    keys = ",\n".join(
+        f'    "{key}": {example}' for _, item_keys in items for key, example in item_keys.items()
+    )
+    return f"""You are an expert job analyst. Analyze the following job posting and provide:
+
+{numbered}
+
+Return your response as a JSON object with these exact keys:
+{{
+{keys}
+}}"""
+
+
+SYSTEM_PROMPT = build_system_prompt()
+
+# Keys a summary must have, with the types the summarized_job columns take
+REQUIRED_SUMMARY_FIELDS: dict[str, type] = {
+    "summary": str,
+    "technical_skills": list,
+    "seniority_level": str,
+}
+
+
+def summary_fields(llm_result: Any, known: dict[str, Any]) -> dict[str, Any]:
+    """
+    Merge an LLM result with the fields known from structured data, and check it.
+
+    Structured data takes precedence over LLM estimates.
+
+    Raises:
+        ValueError: If the result is missing a field or has one of the wrong type
+    """
+    if not isinstance(llm_result, dict):
+        raise ValueError("response is not a JSON object")
+    result = {**llm_result, **known}
+    for key, expected in REQUIRED_SUMMARY_FIELDS.items():
+        if not isinstance(result.get(key), expected):
+            raise ValueError(f"{key} is missing or not a {expected.__name__}")
+    for key in ("estimated_salary_min", "estimated_salary_max"):
+        value = result.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"{key} is not a number")
+    return result
+
 
 class AIService:
     """
@@ -21,38 +105,47 @@ class AIService:
     Supports OpenAI and Anthropic models for job summarization.
     """
 
-    def __init__(self, job_post_repo: JobPostRepository, summarized_job_repo: SummarizedJobRepository, provider: str = "openai"):
+    def __init__(self, session: AsyncSession, provider: str = "openai"):
         """
         Initialize AIService with a database session.
 
         Args:
-            session: SQLAlchemy session
+            session: SQLAlchemy async session
             provider: LLM provider - "openai" or "anthropic" (default: openai)
         """
-        self.job_post_repo = job_post_repo
-        self.summarized_job_repo = summarized_job_repo
+        self.session = session
+        self.job_post_repo = JobPostRepository(session)
+        self.summarized_job_repo = SummarizedJobRepository(session)
+        self.summary_cache = SummaryCache(session)
 
         # Initialize LLM based on provider
         if provider == "anthropic":
             api_key = os.getenv("ANTHROPIC_API_KEY")
             if not api_key:
                 raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
+            self.model = "claude-3-5-sonnet-20241022"
             self.llm: Union[ChatAnthropic, ChatOpenAI] = ChatAnthropic(
-                model="claude-3-5-sonnet-20241022",
+                model=self.model,
                 api_key=api_key,  # type: ignore[call-arg,arg-type]
             )
         else:  # default to openai
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY not found in environment variables")
-            self.llm = ChatOpenAI(model="gpt-4o-mini", api_key=api_key)  # type: ignore[call-arg,arg-type]
+            self.model = "gpt-4o-mini"
+            self.llm = ChatOpenAI(model=self.model, api_key=api_key)  # type: ignore[call-arg,arg-type]
+
+        self.provider = provider if provider == "anthropic" else "openai"
+        self.rate_limiter = get_rate_limiter(self.provider, self.model)
 
-    def summarize_job(self, job_post_id: int) -> Optional[SummarizedJob]:
+    async def summarize_job(self, job_post_id: int) -> Optional[SummarizedJob]:
         """
         Summarize a job posting using an LLM.
 
         Retrieves the job post, sends it to an LLM for analysis, and stores
-        the summary in the summarized_job table.
+        the summary in the summarized_job table. The LLM is skipped when the
+        summary cache already holds a result for the same normalized title,
+        description and company under the current prompt and model.
 
         Args:
             job_post_id: ID of the job post to summarize
@@ -60,87 +153,216 @@ class AIService:
         Returns:
             SummarizedJob object if successful, None if job not found
         """
-        # 1. Get the job post
-        job_post = self.job_post_repo.get_by_id(job_post_id)
-        if not job_post:
-            print(f"Job post {job_post_id} not found")
-            return None
-
-        # Check if already summarized
-        existing_summary = self.summarized_job_repo.get_by_job_post_id(job_post_id)
-        if existing_summary:
-            print(f"Job post {job_post_id} already has a summary")
-            return existing_summary
-
-        # 2. Build prompt for LLM
-        system_prompt = """You are an expert job analyst. Analyze the following job posting and provide:
-
-1. A concise summary (2-3 sentences)
-2. A list of technical skills required (as a JSON array)
-3. The seniority level (one of: "Entry", "Junior", "Mid", "Senior", "Staff", "Principal", "Lead")
-4. An estimated salary range in USD (min and max as integers)
+        results = await self.summarize_jobs([job_post_id])
+        return results[job_post_id]
 
-Return your response as a JSON object with these exact keys:
-{
-    "summary": "string",
-    "technical_skills": ["skill1", "skill2", ...],
-    "seniority_level": "string",
-    "estimated_salary_min": integer or null,
-    "estimated_salary_max": integer or null
-}"""
+    async def summarize_jobs(
+        self, job_post_ids: list[int], max_concurrency: Optional[int] = None
+    ) -> dict[int, Optional[SummarizedJob]]:
+        """
+        Summarize several job postings with concurrent LLM requests.
+
+        Job posts, companies, existing summaries and cache entries are read
+        up front, then all cache misses are sent to the LLM at once with at
+        most `max_concurrency` requests in flight. Results are then checked
+        and saved in one transaction with a savepoint per write, so a bad
+        response or a failed write only fails its own job post. An LLM result
+        is cached only once its summary is saved, so a malformed response is
+        never served from the cache.
 
-        user_prompt = f"""Job Title: {job_post.title}
+        Args:
+            job_post_ids: IDs of the job posts to summarize
+            max_concurrency: Maximum in-flight LLM requests (default: LLM_MAX_CONCURRENCY)
+
+        Returns:
+            Mapping of every requested ID to its SummarizedJob, or None if the
+            job post was not found or could not be summarized
+        """
+        results: dict[int, Optional[SummarizedJob]] = dict.fromkeys(job_post_ids)
+
+        # 1. Get the job posts with their companies, and any existing summaries
+        job_posts = await self.job_post_repo.get_by_ids(
+            job_post_ids, with_description=True, with_company=True
+        )
+        found = {job_post.id for job_post in job_posts}
+        for job_post_id in job_post_ids:
+            if job_post_id not in found:
+                print(f"Job post {job_post_id} not found")
+
+        for existing_summary in await self.summarized_job_repo.get_by_job_post_ids(list(found)):
+            print(f"Job post {existing_summary.job_post_id} already has a summary")
+            results[existing_summary.job_post_id] = existing_summary
+        job_posts = [job_post for job_post in job_posts if results[job_post.id] is None]
+
+        # 2. Reuse cached summaries of the same content; everything else needs the LLM
+        cache_keys: dict[int, str] = {}
+        prompt_versions: dict[int, str] = {}
+        known: dict[int, dict[str, Any]] = {}
+        parsed: dict[int, dict[str, Any]] = {}
+        prompts: dict[int, tuple[str, str]] = {}
+        for job_post in job_posts:
+            # Fields published as structured data (salary, skills) are not asked of the LLM
+            structured = json.loads(job_post.structured_data) if job_post.structured_data else {}
+            known[job_post.id] = structured
+            prompt_version = PROMPT_VERSION
+            if structured:
+                print(f"Job post {job_post.id}: structured data covers {', '.join(structured)}")
+                prompt_version += "+" + ",".join(sorted(structured))
+            prompt_versions[job_post.id] = prompt_version
+
+            company_name = job_post.company.name
+            # Posts saved before the cleaning stage are cleaned here, once and off the event loop
+            cleaned = job_post.clean_description
+            if cleaned is None:
+                cleaned = await asyncio.to_thread(clean_description, job_post.description)
+            description = prompt_description(job_post.description, cleaned)
+            report = cleaning_report(job_post.id, job_post.description, cleaned)
+            print(
+                f"Job post {job_post.id}: description {report.tokens_before} -> "
+                f"{report.tokens_after} tokens ({report.tokens_saved} saved)"
+            )
+            cache_key = summary_cache_key(
+                job_post.title, description, company_name, self.model, prompt_version
+            )
+            cache_keys[job_post.id] = cache_key
+            try:
+                cached = await self.summary_cache.get(cache_key)
+            except Exception as e:
+                print(f"Error reading summary cache for job post {job_post.id}: {e}")
+                cached = None
+
+            if cached is not None:
+                print(f"Summary cache hit for job post {job_post.id}")
+                parsed[job_post.id] = cached
+            else:
+                prompts[job_post.id] = (
+                    build_system_prompt(known[job_post.id]),
+                    self._build_prompt(job_post.title, description, company_name),
+                )
+
+        # End the read transaction so no connection is held across LLM round trips
+        await self.session.commit()
+
+        # 3. Send all misses to the LLM concurrently
+        semaphore = asyncio.Semaphore(max_concurrency or settings.llm_max_concurrency)
+        responses = await asyncio.gather(
+            *(
+                self._complete(system_prompt, user_prompt, semaphore)
+                for system_prompt, user_prompt in prompts.values()
+            ),
+            return_exceptions=True,
+        )
+
+        # 4. Parse LLM responses
+        for job_post_id, response_text in zip(prompts, responses):
+            if isinstance(response_text, BaseException):
+                print(f"Error summarizing job post {job_post_id}: {response_text}")
+                continue
+            try:
+                parsed[job_post_id] = self._parse_response(response_text)
+            except json.JSONDecodeError as e:
+                print(f"Error parsing LLM response: {e}")
+                print(f"Response was: {response_text}")
+
+        # 5. Save summaries in one transaction, each write in its own savepoint:
+        # a failure rolls back (and expires) only that item. New LLM results are
+        # cached once their summary is saved
+        cache = SummaryCache(self.session, autocommit=False)
+        async with UnitOfWork(self.session) as uow:
+            for job_post_id, llm_result in parsed.items():
+                try:
+                    result = summary_fields(llm_result, known[job_post_id])
+                except ValueError as e:
+                    print(f"Invalid summary of job post {job_post_id}: {e}")
+                    continue
+                try:
+                    async with self.session.begin_nested():
+                        results[job_post_id] = await uow.summarized_jobs.create(
+                            job_post_id=job_post_id,
+                            summary=result["summary"],
+                            technical_skills=json.dumps(result["technical_skills"]),
+                            seniority_level=result["seniority_level"],
+                            estimated_salary_min=result.get("estimated_salary_min"),
+                            estimated_salary_max=result.get("estimated_salary_max"),
+                        )
+                    print(f"✓ Successfully summarized job post {job_post_id}")
+                except Exception as e:
+                    print(f"Error summarizing job post {job_post_id}: {e}")
+                    continue
+
+                if job_post_id not in prompts:
+                    continue  # came from the cache
+                try:
+                    async with self.session.begin_nested():
+                        await cache.put(
+                            cache_keys[job_post_id],
+                            self.model,
+                            prompt_versions[job_post_id],
+                            llm_result,
+                        )
+                except Exception as e:
+                    print(f"Error caching summary of job post {job_post_id}: {e}")
+
+        return results
+
+    @staticmethod
+    def _build_prompt(title: str, description: str, company_name: str) -> str:
+        """Build the user prompt for a job post"""
+        return f"""Job Title: {title}
 
 Job Description:
-{job_post.description}
+{description}
 
-Company: {job_post.company.name if job_post.company else "Unknown"}
+Company: {company_name}
 """
 
-        try:
-            # 3. Call LLM
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt),
-            ]
-
-            response = self.llm.invoke(messages)  # type: ignore[attr-defined]
-            response_text = response.content
-
-            # 4. Parse LLM response
-            # Try to extract JSON from the response
-            # Ensure response_text is a string
-            if isinstance(response_text, list):
-                response_text = str(response_text)
-
-            if "```json" in response_text:
-                # Extract JSON from markdown code block
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                json_str = response_text[start:end].strip()
-            else:
-                json_str = response_text.strip()
-
-            result = json.loads(json_str)
-
-            # 5. Save to database
-            summarized_job = self.summarized_job_repo.create(
-                job_post_id=job_post_id,
-                summary=result["summary"],
-                technical_skills=json.dumps(result["technical_skills"]),
-                seniority_level=result["seniority_level"],
-                estimated_salary_min=result.get("estimated_salary_min"),
-                estimated_salary_max=result.get("estimated_salary_max"),
-            )
+    async def _complete(
+        self, system_prompt: str, user_prompt: str, semaphore: asyncio.Semaphore
+    ) -> Any:
+        """
+        Send one prompt to the LLM, waiting for a free slot in `semaphore`.
+
+        Each attempt first takes its share of the provider/model rate limit.
+        A 429 backs off every worker (honouring retry-after) and retries up to
+        LLM_MAX_RETRIES times, so a busy provider queues work instead of
+        failing it.
+        """
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt),
+        ]
+        tokens = estimate_tokens(system_prompt, user_prompt) + COMPLETION_TOKENS
+
+        async with semaphore:
+            attempt = 0
+            while True:
+                await self.rate_limiter.acquire(tokens)
+                try:
+                    response = await self.llm.ainvoke(messages)  # type: ignore[attr-defined]
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt >= settings.llm_max_retries:
+                        raise
+                    attempt += 1
+                    delay = await self.rate_limiter.backoff(retry_after_seconds(e))
+                    print(f"Rate limited by {self.provider}, retrying in {delay:.1f}s")
+                    continue
+
+                self.rate_limiter.succeeded()
+                return response.content
 
-            print(f"✓ Successfully summarized job post {job_post_id}")
-            return summarized_job
+    @staticmethod
+    def _parse_response(response_text: Any) -> dict[str, Any]:
+        """Extract the JSON object from an LLM response"""
+        # Ensure response_text is a string
+        if isinstance(response_text, list):
+            response_text = str(response_text)
 
-        except json.JSONDecodeError as e:
-            print(f"Error parsing LLM response: {e}")
-            print(f"Response was: {response_text}")
-            return None
+        if "```json" in response_text:
+            # Extract JSON from markdown code block
+            start = response_text.find("```json") + 7
+            end = response_text.find("```", start)
+            json_str = response_text[start:end].strip()
+        else:
+            json_str = response_text.strip()
 
-        except Exception as e:
-            print(f"Error summarizing job post {job_post_id}: {e}")
-            return None
+        return json.loads(json_str)
@@ -0,0 +1,137 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.hoarder.repositories import CompressionDictionaryRepository, JobPageRepository
+from src.hoarder.services.scraper import JobData, parse_job_page
+from src.hoarder.utils.html_compression import decompress_html, register_dictionary
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+class CompressedPage(NamedTuple):
+    """A stored job page as sent to an extraction worker: HTML still compressed"""
+
+    page_id: int
+    url: str
+    data: bytes
+    compression: str
+    dict_id: Optional[int]
+
+
+class ExtractedPage(NamedTuple):
+    """Extraction result for one job page: the job data, or why there is none"""
+
+    page_id: int
+    url: str
+    job_data: Optional[JobData]
+    error: Optional[str]
+
+
+def extract_page(page_id: int, url: str, page_html: str) -> ExtractedPage:
+    """Run the scraper's extraction over one stored page"""
+    job_data = parse_job_page(url, page_html)
+    if job_data.structured.title is None and job_data.structured.description is None:
+        return ExtractedPage(page_id, url, None, "no job posting found on page")
+    return ExtractedPage(page_id, url, job_data, None)
+
+
+def extract_pages(pages: list[CompressedPage]) -> list[ExtractedPage]:
+    """
+    Decompress and extract a chunk of pages.
+
+    Runs in a worker process: it takes compressed bytes and returns small
+    NamedTuples, so neither full HTML nor ORM objects cross the process
+    boundary. A page that fails is reported on its own.
+    """
+    results = []
+    for page in pages:
+        try:
+            page_html = decompress_html(page.data, page.compression, page.dict_id)
+            results.append(extract_page(page.page_id, page.url, page_html))
+        except Exception as e:
+            results.append(ExtractedPage(page.page_id, page.url, None, f"extraction failed: {e}"))
+    return results
+
+
+def _init_worker(dictionaries: dict[int, bytes]) -> None:
+    """Register the stored compression dictionaries in a new worker process"""
+    for dict_id, data in dictionaries.items():
+        register_dictionary(dict_id, data)
+
+
+async def _read_chunks(
+    job_page_repo: JobPageRepository,
+    after_id: Optional[int],
+    limit: Optional[int],
+    chunk_size: int,
+) -> AsyncIterator[list[CompressedPage]]:
+    remaining = limit
+    while remaining is None or remaining > 0:
+        rows = await job_page_repo.get_compressed(
+            after_id, chunk_size if remaining is None else min(chunk_size, remaining)
+        )
+        if not rows:
+            return
+        chunk = [CompressedPage(*row) for row in rows]
+        yield chunk
+        after_id = chunk[-1].page_id
+        if remaining is not None:
+            remaining -= len(chunk)
+
+
+async def extract_job_pages(
+    session: AsyncSession,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[list[ExtractedPage]]:
+    """
+    Extract job data from stored pages, in parallel across processes.
+
+    Pages after `after_id` are read in keyset chunks of `chunk_size`
+    (compressed, straight from page_blob) and each chunk is handed to a
+    ProcessPoolExecutor, so HTML parsing is not limited by the GIL. Up to
+    two chunks per worker are in flight while the caller handles the
+    results of earlier ones. With workers=1, chunks are extracted in this
+    process instead.
+
+    Args:
+        session: Session used to read pages (results are not written here)
+        after_id: Only extract pages with a page_id greater than this
+        limit: Stop after this many pages (None for all)
+        workers: Number of worker processes
+        chunk_size: Pages per chunk sent to a worker
+
+    Yields:
+        Extracted chunks in page_id order
+    """
+    job_page_repo = JobPageRepository(session)
+    dictionaries = await CompressionDictionaryRepository(session).get_all_data()
+    chunks = _read_chunks(job_page_repo, after_id, limit, chunk_size)
+
+    if workers <= 1:
+        _init_worker(dictionaries)
+        async for chunk in chunks:
+            yield extract_pages(chunk)
+        return
+
+    loop = asyncio.get_running_loop()
+    in_flight: deque[asyncio.Future[list[ExtractedPage]]] = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(dictionaries,)
+    ) as executor:
+        try:
+            async for chunk in chunks:
+                in_flight.append(loop.run_in_executor(executor, extract_pages, chunk))
+                if len(in_flight) >= 2 * workers:
+                    yield await in_flight.popleft()
+            while in_flight:
+                yield await in_flight.popleft()
+        finally:
+            for future in in_flight:
+                future.cancel()
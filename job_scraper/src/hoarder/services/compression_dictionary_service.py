@@ -0,0 +1,135 @@
+import time
+from typing import NamedTuple, Optional
+
+import zstandard
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.hoarder.repositories import CompressionDictionaryRepository, PageBlobRepository
+from src.hoarder.utils.html_compression import decompress_html, train_dictionary
+from src.hoarder.utils.settings import settings
+
+DEFAULT_SAMPLE_SIZE = 1000
+DEFAULT_DICT_SIZE = 112 * 1024
+MIN_SAMPLES = 20
+HOLDOUT_EVERY = 5  # every 5th sample is kept out of training for evaluation
+DECOMPRESS_ROUNDS = 5
+
+
+class DictionaryTrainingReport(NamedTuple):
+    """Compression ratio and decompress throughput of a trained dictionary vs plain zstd"""
+
+    dict_id: Optional[int]  # None when the dictionary was not saved
+    dict_size: int
+    train_samples: int
+    eval_samples: int
+    raw_bytes: int
+    plain_bytes: int
+    dict_bytes: int
+    plain_mb_per_s: float
+    dict_mb_per_s: float
+
+    @property
+    def plain_ratio(self) -> float:
+        return self.raw_bytes / self.plain_bytes
+
+    @property
+    def dict_ratio(self) -> float:
+        return self.raw_bytes / self.dict_bytes
+
+
+def _measure(
+    samples: list[bytes],
+    compressor: zstandard.ZstdCompressor,
+    decompressor: zstandard.ZstdDecompressor,
+) -> tuple[int, float]:
+    """Return (total compressed bytes, decompress throughput in MB/s) over samples"""
+    frames = [compressor.compress(sample) for sample in samples]
+    raw_bytes = sum(len(sample) for sample in samples)
+
+    start = time.perf_counter()
+    for _ in range(DECOMPRESS_ROUNDS):
+        for frame in frames:
+            decompressor.decompress(frame)
+    elapsed = time.perf_counter() - start
+
+    return sum(len(frame) for frame in frames), raw_bytes * DECOMPRESS_ROUNDS / elapsed / 1e6
+
+
+class CompressionDictionaryService:
+    """
+    Service for training zstd dictionaries from stored job page HTML.
+
+    Job boards share most of their markup, so a dictionary trained on our own
+    pages compresses new captures far better than plain zstd.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.dictionary_repo = CompressionDictionaryRepository(session)
+        self.blob_repo = PageBlobRepository(session)
+
+    async def train(
+        self,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        dict_size: int = DEFAULT_DICT_SIZE,
+    ) -> DictionaryTrainingReport:
+        """
+        Train a dictionary from a random sample of stored pages.
+
+        Every HOLDOUT_EVERY-th sample is held back and used to compare the
+        new dictionary against plain zstd. The dictionary is only saved (and
+        so used for new pages) if it compresses the held-out pages better.
+
+        Args:
+            sample_size: Number of stored pages to sample
+            dict_size: Target dictionary size in bytes
+
+        Returns:
+            DictionaryTrainingReport with ratios and throughput for both modes
+        """
+        blobs = await self.blob_repo.get_sample(sample_size)
+        if len(blobs) < MIN_SAMPLES:
+            raise ValueError(
+                f"Need at least {MIN_SAMPLES} stored pages to train a dictionary, found {len(blobs)}"
+            )
+
+        samples: list[bytes] = []
+        for blob in blobs:
+            await self.blob_repo.load_dictionary(blob.dict_id)
+            samples.append(
+                decompress_html(blob.data, blob.compression, blob.dict_id).encode("utf-8")
+            )
+
+        holdout = samples[::HOLDOUT_EVERY]
+        training = [s for i, s in enumerate(samples) if i % HOLDOUT_EVERY]
+        dict_data = train_dictionary(training, dict_size)
+
+        level = settings.html_compression_level
+        plain_bytes, plain_mb_per_s = _measure(
+            holdout, zstandard.ZstdCompressor(level=level), zstandard.ZstdDecompressor()
+        )
+        trained = zstandard.ZstdCompressionDict(dict_data)
+        dict_bytes, dict_mb_per_s = _measure(
+            holdout,
+            zstandard.ZstdCompressor(level=level, dict_data=trained),
+            zstandard.ZstdDecompressor(dict_data=trained),
+        )
+
+        dict_id = None
+        if dict_bytes < plain_bytes:
+            dictionary = await self.dictionary_repo.create(
+                data=dict_data, sample_count=len(training)
+            )
+            dict_id = dictionary.id
+
+        return DictionaryTrainingReport(
+            dict_id=dict_id,
+            dict_size=len(dict_data),
+            train_samples=len(training),
+            eval_samples=len(holdout),
+            raw_bytes=sum(len(sample) for sample in holdout),
+            plain_bytes=plain_bytes,
+            dict_bytes=dict_bytes,
+            plain_mb_per_s=plain_mb_per_s,
+            dict_mb_per_s=dict_mb_per_s,
+        )
@@ -0,0 +1,61 @@
+from typing import AsyncIterator, NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.hoarder.extraction import clean_description
+from src.hoarder.repositories import JobPostRepository
+from src.hoarder.utils.rate_limiter import estimate_tokens
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class CleaningReport(NamedTuple):
+    """Prompt tokens of a job post description before and after cleaning"""
+
+    job_post_id: int
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def prompt_description(description: str, cleaned: Optional[str]) -> str:
+    """The description to send to the LLM: the cleaned text unless cleaning emptied it"""
+    if cleaned is None:
+        cleaned = clean_description(description)
+    return cleaned or description
+
+
+def cleaning_report(job_post_id: int, description: str, cleaned: Optional[str]) -> CleaningReport:
+    """Estimate the prompt tokens cleaning saves for one job post"""
+    return CleaningReport(
+        job_post_id=job_post_id,
+        tokens_before=estimate_tokens(description),
+        tokens_after=estimate_tokens(prompt_description(description, cleaned)),
+    )
+
+
+async def clean_job_post_descriptions(
+    session: AsyncSession, batch_size: int = DEFAULT_BATCH_SIZE
+) -> AsyncIterator[CleaningReport]:
+    """
+    Fill in clean_description for job posts created before the cleaning stage.
+
+    Walks posts without a clean_description in keyset pages of `batch_size`,
+    committing each page, and yields a report per post.
+    """
+    job_post_repo = JobPostRepository(session)
+    after_id = None
+    while True:
+        job_posts = await job_post_repo.get_without_clean_description(after_id, batch_size)
+        if not job_posts:
+            return
+
+        cleaned = {job_post.id: clean_description(job_post.description) for job_post in job_posts}
+        await job_post_repo.update_clean_descriptions(cleaned)
+
+        for job_post in job_posts:
+            yield cleaning_report(job_post.id, job_post.description, cleaned[job_post.id])
+        after_id = job_posts[-1].id
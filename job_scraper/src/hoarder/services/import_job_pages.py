@@ -0,0 +1,68 @@
+import json
+from typing import Iterable
+
+from src.hoarder.services.job_page_service import JobPageService
+from src.hoarder.utils.database import get_async_session_factory
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+async def import_job_pages(
+    lines: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> tuple[int, list[str]]:
+    """
+    Bulk import job pages from JSON lines of {"url": ..., "page_html": ...}.
+
+    Records are inserted in chunks of `chunk_size`, one transaction and one
+    multi-row INSERT per chunk, so a weekly backfill of hundreds of pages
+    costs a handful of round trips instead of one commit per page. Pages
+    already stored are skipped and not counted.
+
+    Args:
+        lines: Iterable of JSON lines (e.g. an open file)
+        chunk_size: Number of pages inserted per transaction
+
+    Returns:
+        Tuple of (number of pages created, list of error messages)
+    """
+    created = 0
+    errors: list[str] = []
+    session_factory = get_async_session_factory()
+
+    async with session_factory() as session:
+        job_page_service = JobPageService(session)
+        chunk: list[tuple[int, str, str]] = []
+
+        async def flush() -> None:
+            nonlocal created
+            results = await job_page_service.create_job_pages(
+                [(url, page_html) for _, url, page_html in chunk]
+            )
+            for (line_number, url, _), result in zip(chunk, results):
+                if result.error:
+                    errors.append(f"line {line_number} ({url}): {result.error}")
+                elif not result.duplicate:
+                    created += 1
+            chunk.clear()
+
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                errors.append(f"line {line_number}: invalid JSON ({e})")
+                continue
+            if not isinstance(record, dict):
+                errors.append(f"line {line_number}: expected a JSON object ({line.strip()[:40]})")
+                continue
+
+            chunk.append(
+                (line_number, str(record.get("url", "")), str(record.get("page_html", "")))
+            )
+            if len(chunk) >= chunk_size:
+                await flush()
+        if chunk:
+            await flush()
+
+    return created, errors
@@ -0,0 +1,157 @@
+from typing import Any, AsyncIterator, NamedTuple, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.hoarder.repositories import (
+    JobPageRepository,
+    JobPostRepository,
+    PipelineCheckpointRepository,
+)
+from src.hoarder.services.bulk_extraction import ExtractedPage, extract_job_pages, extract_page
+from src.hoarder.services.job_service import JobService
+from src.hoarder.services.scraper import JobData
+
+PROMOTION_CHECKPOINT = "job_page_promotion"
+DEFAULT_BATCH_SIZE = 200
+
+
+class PromotionResult(NamedTuple):
+    """Outcome of promoting one job page: the new job_post_id, or why there is none"""
+
+    page_id: int
+    job_post_id: Optional[int]
+    error: Optional[str]
+
+
+class JobPagePromotionService:
+    """
+    Turns saved job pages into job posts.
+
+    Each page's HTML is run through the scraper's extraction and stored as a
+    JobPost linked back to the page (job_post.job_page_id), which queues it
+    for LLM processing. A page is promoted at most once: pages that already
+    have a job post are skipped, and the unique index on job_page_id rejects
+    a concurrent duplicate. Any other constraint failure is raised, so the
+    page is not passed over as promoted.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.job_page_repo = JobPageRepository(session)
+        self.job_post_repo = JobPostRepository(session)
+        self.checkpoint_repo = PipelineCheckpointRepository(session)
+        self.job_service = JobService(session)
+
+    async def promote_job_page(self, page_id: int) -> PromotionResult:
+        """
+        Create the job post for one saved page.
+
+        Args:
+            page_id: The ID of the job page
+
+        Returns:
+            PromotionResult with the job post ID, or an error when the page is
+            missing, already promoted, or has no recognizable job posting
+        """
+        if await self.job_post_repo.get_promoted_page_ids([page_id]):
+            return PromotionResult(page_id, None, "already promoted")
+
+        job_page = await self.job_page_repo.get_by_id(page_id)
+        if not job_page:
+            return PromotionResult(page_id, None, "job page not found")
+        page_html = await self.job_page_repo.get_html(page_id)
+        if not page_html:
+            return PromotionResult(page_id, None, "job page has no HTML")
+        return await self._save(extract_page(page_id, job_page.url, page_html))
+
+    async def _save(self, page: ExtractedPage) -> PromotionResult:
+        if page.job_data is None:
+            return PromotionResult(page.page_id, None, page.error)
+        try:
+            job_post = await self.job_service.create_job_post(
+                **_job_post_fields(page.page_id, page.url, page.job_data)
+            )
+        except IntegrityError:
+            # Another worker may have promoted the page between the check and
+            # the insert; anything else (e.g. a company race) is a real failure
+            if not await self.job_post_repo.get_promoted_page_ids([page.page_id]):
+                raise
+            return PromotionResult(page.page_id, None, "already promoted")
+        return PromotionResult(page.page_id, job_post.id, None)
+
+    async def _save_chunk(self, pages: list[ExtractedPage]) -> list[PromotionResult]:
+        """Create the job posts of an extracted chunk in one transaction"""
+        promoted = await self.job_post_repo.get_promoted_page_ids([page.page_id for page in pages])
+        results = {
+            page.page_id: PromotionResult(
+                page.page_id, None, "already promoted" if page.page_id in promoted else page.error
+            )
+            for page in pages
+            if page.job_data is None or page.page_id in promoted
+        }
+        new = [page for page in pages if page.page_id not in results]
+        try:
+            job_posts = await self.job_service.create_job_posts(
+                [
+                    _job_post_fields(page.page_id, page.url, page.job_data)
+                    for page in new
+                    if page.job_data is not None
+                ]
+            )
+            for page, job_post in zip(new, job_posts):
+                results[page.page_id] = PromotionResult(page.page_id, job_post.id, None)
+        except IntegrityError:
+            # A concurrent promotion took some of these pages (or a company was
+            # created concurrently); save them one by one, which raises on any
+            # failure that is not an existing job post
+            for page in new:
+                results[page.page_id] = await self._save(page)
+        return [results[page.page_id] for page in pages]
+
+    async def promote_job_pages(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        limit: Optional[int] = None,
+        workers: int = 1,
+    ) -> AsyncIterator[PromotionResult]:
+        """
+        Promote saved pages in page_id order, resuming from the last run.
+
+        Pages are read in keyset chunks of `batch_size` after the stored
+        high-water mark and parsed by `workers` processes (see
+        bulk_extraction.extract_job_pages). Each chunk's job posts are
+        written in one transaction, then the mark is moved past the chunk,
+        so an interrupted backfill picks up where it stopped and a finished
+        one only looks at pages saved since. Pages that fail to extract are
+        reported and not retried.
+
+        Args:
+            batch_size: Pages per chunk (read, parsed and written together)
+            limit: Stop after this many pages (None for all)
+            workers: Number of extraction worker processes
+
+        Yields:
+            One PromotionResult per page looked at
+        """
+        after_id = await self.checkpoint_repo.get(PROMOTION_CHECKPOINT)
+        chunks = extract_job_pages(
+            self.session, after_id=after_id, limit=limit, workers=workers, chunk_size=batch_size
+        )
+        async for pages in chunks:
+            for result in await self._save_chunk(pages):
+                yield result
+            await self.checkpoint_repo.set(PROMOTION_CHECKPOINT, pages[-1].page_id)
+
+
+def _job_post_fields(page_id: int, url: str, job_data: JobData) -> dict[str, Any]:
+    """JobService.create_job_post arguments for an extracted page"""
+    return {
+        "company_name": job_data.company_name,
+        "job_title": job_data.job_title,
+        "job_description": job_data.job_description,
+        "job_url": url,
+        "industry": job_data.industry,
+        "structured_data": job_data.structured_data,
+        "job_page_id": page_id,
+    }
@@ -1,8 +1,54 @@
-from typing import Optional
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, NamedTuple, Optional, Sequence, Union
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.hoarder.models import JobPage
-from src.hoarder.repositories import JobPageRepository
+from src.hoarder.repositories import JobPageRepository, PageCapture, UnitOfWork
+from src.hoarder.services.scraper import page_content_hash
+from src.hoarder.tasks.job_page_promotion import promote_job_page_task
+from src.hoarder.utils.urls import canonicalize_url
+
+
+class BatchItemResult(NamedTuple):
+    """Outcome of one item in a batch insert: a page_id or an error message
+
+    `duplicate` items were already stored and page_id is the existing capture.
+    """
+
+    page_id: Optional[int]
+    error: Optional[str]
+    duplicate: bool = False
+
+
+class SavedJobPage(NamedTuple):
+    """A saved job page, or the existing capture a duplicate resolved to"""
+
+    job_page: JobPage
+    duplicate: bool
+
+
+def validate_job_page(url: str, page_html: str) -> Optional[str]:
+    """Return an error message if the page can't be stored, None otherwise"""
+    if not url.strip():
+        return "url is empty"
+    if not url.startswith(("http://", "https://")):
+        return "url must start with http:// or https://"
+    if not page_html.strip():
+        return "page_html is empty"
+    return None
+
+
+def _with_content_hashes(captures: list[PageCapture]) -> list[PageCapture]:
+    """Fill in the content hash of captures that have none (parses each page)"""
+    return [
+        capture
+        if capture.content_sha256 is not None
+        else capture._replace(content_sha256=page_content_hash(capture.url, capture.page_html))
+        for capture in captures
+    ]
 
 
 class JobPageService:
@@ -11,30 +57,146 @@ class JobPageService:
 
     This service centralizes all job page operations, ensuring consistency
     across different application interfaces (CLI, API, Chrome extension).
+
+    Page HTML is stored compressed and deduplicated by content hash; it is
+    only read and decompressed when a caller asks for it. Every saved page is
+    queued for promotion to a job post (see JobPagePromotionService).
+
+    A capture is a duplicate when its canonical URL (utm params, fragments
+    and the like stripped) and the hash of its extracted job fields match a
+    stored one; duplicates resolve to the existing row instead of storing
+    another copy, and mark it as seen again so it is the URL's latest
+    capture (content that changed back is found as the latest version).
+    Changed content under the same URL is a new version.
+    Hashing parses the page, so it runs in a worker thread rather than
+    blocking the event loop.
     """
 
     def __init__(self, session: AsyncSession):
         self.session = session
         self.job_page_repo = JobPageRepository(session)
 
-    async def create_job_page(self, url: str, page_html: str) -> JobPage:
+    async def create_job_page(
+        self,
+        url: str,
+        page_html: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> SavedJobPage:
         """
-        Create a new job page entry.
+        Create a new job page entry and queue its promotion to a job post.
+
+        If the same content is already stored under this URL (or a variant of
+        it), nothing is written and the existing page is returned.
 
         Args:
             url: The URL of the job page
             page_html: The HTML content of the page
+            etag: ETag response header, when the page was fetched by us
+            last_modified: Last-Modified response header, likewise
 
         Returns:
-            The created JobPage object
+            SavedJobPage with the created (or existing) JobPage
         """
-        job_page = await self.job_page_repo.create(url=url, page_html=page_html)
-        return job_page
+        content_sha256 = await asyncio.to_thread(page_content_hash, url, page_html)
+        existing = await self.job_page_repo.get_capture(url, content_sha256)
+        if existing:
+            await self.job_page_repo.touch([existing.page_id])
+            return SavedJobPage(existing, duplicate=True)
+
+        try:
+            async with UnitOfWork(self.session) as uow:
+                job_page = await uow.job_pages.create(
+                    url=url,
+                    page_html=page_html,
+                    etag=etag,
+                    last_modified=last_modified,
+                    content_sha256=content_sha256,
+                )
+                await uow.outbox.add(promote_job_page_task.name, [job_page.page_id])
+        except IntegrityError:
+            # Saved by a concurrent request since the lookup above
+            existing = await self.job_page_repo.get_capture(url, content_sha256)
+            if existing is None:
+                raise
+            return SavedJobPage(existing, duplicate=True)
+        return SavedJobPage(job_page, duplicate=False)
+
+    async def create_job_pages(
+        self, pages: Sequence[Union[tuple[str, str], PageCapture]]
+    ) -> list[BatchItemResult]:
+        """
+        Create many job pages in one transaction and queue their promotion.
+
+        Invalid items are reported individually and skipped; the valid ones
+        are inserted together. Duplicates, of stored pages or of an earlier
+        item in the batch, are found with one indexed lookup and reported
+        with the existing page_id. If the insert itself fails, every new
+        item reports that error and nothing is stored.
+
+        Args:
+            pages: (url, page_html) pairs, or PageCaptures with HTTP validators
+
+        Returns:
+            One BatchItemResult per input item, in input order
+        """
+        results: list[BatchItemResult] = []
+        valid: list[PageCapture] = []
+        valid_positions: list[int] = []
+
+        for position, page in enumerate(pages):
+            capture = PageCapture(*page)
+            error = validate_job_page(capture.url, capture.page_html)
+            results.append(BatchItemResult(page_id=None, error=error))
+            if error is None:
+                valid.append(capture)
+                valid_positions.append(position)
+        valid = await asyncio.to_thread(_with_content_hashes, valid)
+
+        existing = await self.job_page_repo.get_capture_ids(
+            [(capture.url, capture.content_sha256) for capture in valid]
+        )
+        new: list[PageCapture] = []
+        new_positions: list[int] = []
+        first_positions: dict[tuple[str, Optional[str]], int] = {}
+        repeats: list[tuple[int, int]] = []
+        for capture, position in zip(valid, valid_positions):
+            key = (canonicalize_url(capture.url), capture.content_sha256)
+            if key in existing:
+                results[position] = BatchItemResult(existing[key], None, duplicate=True)
+            elif key in first_positions:
+                repeats.append((position, first_positions[key]))
+            else:
+                first_positions[key] = position
+                new.append(capture)
+                new_positions.append(position)
+
+        try:
+            async with UnitOfWork(self.session) as uow:
+                await uow.job_pages.touch(
+                    [result.page_id for result in results if result.duplicate and result.page_id]
+                )
+                page_ids = await uow.job_pages.create_many(new)
+                await uow.outbox.add_many(
+                    promote_job_page_task.name, [[page_id] for page_id in page_ids]
+                )
+        except Exception as e:
+            for position in new_positions:
+                results[position] = BatchItemResult(page_id=None, error=f"Error saving job page: {e}")
+        else:
+            for position, page_id in zip(new_positions, page_ids):
+                results[position] = BatchItemResult(page_id=page_id, error=None)
+
+        for position, first in repeats:
+            results[position] = results[first]._replace(duplicate=results[first].error is None)
+        return results
 
     async def get_job_page_by_id(self, page_id: int) -> Optional[JobPage]:
         """
         Get a job page by ID.
 
+        The HTML is not loaded; use get_job_page_html for it.
+
         Args:
             page_id: The ID of the job page
 
@@ -43,26 +205,70 @@ class JobPageService:
         """
         return await self.job_page_repo.get_by_id(page_id)
 
+    async def get_job_page_html(self, page_id: int) -> Optional[str]:
+        """
+        Get the decompressed HTML of a job page without loading the rest of the row.
+
+        Args:
+            page_id: The ID of the job page
+
+        Returns:
+            The page HTML if found, None otherwise
+        """
+        return await self.job_page_repo.get_html(page_id)
+
     async def get_job_page_by_url(self, url: str) -> Optional[JobPage]:
         """
-        Get a job page by URL.
+        Get the latest capture of a job page by URL.
+
+        Tracking parameters, fragments and other URL variations are ignored
+        (see canonicalize_url).
 
         Args:
             url: The URL to search for
 
         Returns:
-            JobPage object if found, None otherwise
+            The newest JobPage for the URL if found, None otherwise
         """
         return await self.job_page_repo.get_by_url(url)
 
-    async def get_all_job_pages(self) -> list[JobPage]:
+    async def get_all_job_pages(
+        self, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> list[JobPage]:
         """
-        Get all job pages.
+        Get job pages ordered by ID using keyset pagination.
+
+        Args:
+            after_id: Only return pages with a page_id greater than this
+            limit: Maximum number of pages to return
+
+        Returns:
+            List of JobPage objects with only page_id and url loaded
+        """
+        return await self.job_page_repo.get_all(after_id=after_id, limit=limit)
+
+    async def count_job_pages(self) -> int:
+        """
+        Count all job pages.
 
         Returns:
-            List of all JobPage objects
+            Total number of stored job pages
         """
-        return await self.job_page_repo.get_all()
+        return await self.job_page_repo.count()
+
+    def stream_job_pages(
+        self, after_id: Optional[int] = None
+    ) -> AsyncIterator[Row[tuple[int, str]]]:
+        """
+        Stream (page_id, url) rows ordered by ID.
+
+        Args:
+            after_id: Only stream pages with a page_id greater than this
+
+        Returns:
+            Async iterator of rows, fetched from the database in batches
+        """
+        return self.job_page_repo.stream_all(after_id=after_id)
 
     async def update_job_page(
         self,
@@ -73,6 +279,8 @@ class JobPageService:
         """
         Update a job page.
 
+        New HTML also refreshes the page's content hash.
+
         Args:
             page_id: The ID of the job page to update
             url: Optional new URL
@@ -81,7 +289,13 @@ class JobPageService:
         Returns:
             Updated JobPage object if found, None otherwise
         """
-        return await self.job_page_repo.update(page_id, url, page_html)
+        if page_html is None:
+            return await self.job_page_repo.update(page_id, url)
+        job_page = await self.job_page_repo.get_by_id(page_id)
+        if not job_page:
+            return None
+        content_sha256 = await asyncio.to_thread(page_content_hash, url or job_page.url, page_html)
+        return await self.job_page_repo.update(page_id, url, page_html, content_sha256)
 
     async def delete_job_page(self, page_id: int) -> bool:
         """
@@ -94,3 +308,17 @@ class JobPageService:
             True if deleted, False if not found
         """
         return await self.job_page_repo.delete(page_id)
+
+    async def delete_job_pages_created_before(self, cutoff: datetime) -> int:
+        """
+        Delete every job page captured before a date.
+
+        Job posts extracted from the deleted pages are kept and detached.
+
+        Args:
+            cutoff: Pages created before this time are deleted
+
+        Returns:
+            Number of job pages deleted
+        """
+        return await self.job_page_repo.delete_created_before(cutoff)
@@ -1,8 +1,10 @@
-from typing import Optional
-from sqlalchemy.orm import Session
+import json
+from typing import Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.hoarder.extraction import clean_description
 from src.hoarder.models import JobPost
-from src.hoarder.repositories import CompanyRepository, JobPostRepository
+from src.hoarder.repositories import CompanyRepository, JobPostRepository, UnitOfWork
 from src.hoarder.tasks.job_processing import process_job_post_task
 
 
@@ -14,25 +16,30 @@ class JobService:
     across different application interfaces (CLI, Streamlit, API).
     """
 
-    def __init__(self, company_repo: CompanyRepository, job_post_repo: JobPostRepository):
-        self.company_repo = company_repo
-        self.job_post_repo = job_post_repo
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.company_repo = CompanyRepository(session)
+        self.job_post_repo = JobPostRepository(session)
 
-    def create_job_post(
+    async def create_job_post(
         self,
         company_name: str,
         job_title: str,
         job_description: str,
         job_url: Optional[str] = None,
         industry: Optional[str] = None,
+        structured_data: Optional[dict[str, Any]] = None,
+        job_page_id: Optional[int] = None,
     ) -> JobPost:
         """
         Create a new job posting with all related operations.
 
-        This method:
+        This method runs as one transaction with a single commit:
         1. Gets or creates the company
-        2. Creates the job post in the database
-        3. Queues the job post for LLM processing via Celery
+        2. Creates the job post in the database, with a boilerplate-free
+           copy of the description for LLM prompts
+        3. Records the LLM processing task in the outbox; the outbox relay
+           publishes it to Celery, so a slow or down broker never blocks this
 
         Args:
             company_name: Name of the company
@@ -40,41 +47,86 @@ class JobService:
             job_description: Full job description
             job_url: Optional URL to the job posting
             industry: Optional industry classification
+            structured_data: Optional summary fields published by the page
+                (StructuredJobData.summary_fields()); the LLM is not asked for these
+            job_page_id: Optional saved job_page the post was extracted from
 
         Returns:
             The created JobPost object
         """
+        async with UnitOfWork(self.session) as uow:
+            job_post = await self._add_job_post(
+                uow,
+                company_name=company_name,
+                job_title=job_title,
+                job_description=job_description,
+                job_url=job_url,
+                industry=industry,
+                structured_data=structured_data,
+                job_page_id=job_page_id,
+            )
+
+            # 3. Queue job post for processing (summarization, extraction, etc.)
+            await uow.outbox.add(process_job_post_task.name, [job_post.id])
+
+        return job_post
+
+    async def create_job_posts(self, job_posts: list[dict[str, Any]]) -> list[JobPost]:
+        """
+        Create many job postings in one transaction.
+
+        Same steps as create_job_post, with one commit for the whole batch
+        and the processing tasks recorded in a single outbox insert. If any
+        post fails, none are stored.
+
+        Args:
+            job_posts: Keyword arguments of create_job_post, one dict per post
+
+        Returns:
+            The created JobPost objects, in input order
+        """
+        async with UnitOfWork(self.session) as uow:
+            created = [await self._add_job_post(uow, **job_post) for job_post in job_posts]
+            await uow.outbox.add_many(
+                process_job_post_task.name, [[job_post.id] for job_post in created]
+            )
+        return created
+
+    async def _add_job_post(
+        self,
+        uow: UnitOfWork,
+        company_name: str,
+        job_title: str,
+        job_description: str,
+        job_url: Optional[str] = None,
+        industry: Optional[str] = None,
+        structured_data: Optional[dict[str, Any]] = None,
+        job_page_id: Optional[int] = None,
+    ) -> JobPost:
         # 1. Get or create company
-        company = self.company_repo.get_or_create(name=company_name, industry=industry)
+        company_id = await uow.companies.get_or_create_id(name=company_name, industry=industry)
 
         # 2. Create job post in database
-        job_post = self.job_post_repo.create(
-            company_id=company.id,
+        return await uow.job_posts.create(
+            company_id=company_id,
             title=job_title,
             description=job_description,
             url=job_url,
+            clean_description=clean_description(job_description),
+            structured_data=json.dumps(structured_data) if structured_data else None,
+            job_page_id=job_page_id,
         )
 
-        # 3. Queue job post for processing (summarization, extraction, etc.)
-        try:
-            process_job_post_task.delay(job_post.id)
-        except Exception as e:
-            # Log the error but don't fail the job creation
-            # The job is already saved, queue failure shouldn't break the flow
-            print(
-                f"Warning: Failed to queue job post {job_post.id} for processing: {e}"
-            )
-
-        return job_post
-
-    def get_job_post_by_id(self, job_post_id: int) -> Optional[JobPost]:
+    async def get_job_post_by_id(self, job_post_id: int) -> Optional[JobPost]:
         """Get a job post by ID"""
-        return self.job_post_repo.get_by_id(job_post_id)
+        return await self.job_post_repo.get_by_id(job_post_id)
 
-    def get_all_job_posts(self) -> list[JobPost]:
-        """Get all job posts"""
-        return self.job_post_repo.get_all()
+    async def get_all_job_posts(
+        self, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> list[JobPost]:
+        """Get job posts ordered by ID, optionally as a keyset page after `after_id`"""
+        return await self.job_post_repo.get_all(after_id=after_id, limit=limit)
 
-    def get_job_posts_by_company(self, company_id: int) -> list[JobPost]:
+    async def get_job_posts_by_company(self, company_id: int) -> list[JobPost]:
         """Get all job posts for a specific company"""
-        return self.job_post_repo.get_by_company_id(company_id)
+        return await self.job_post_repo.get_by_company_id(company_id)
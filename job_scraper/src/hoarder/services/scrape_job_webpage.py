@@ -1,15 +1,365 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from types import TracebackType
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+from urllib.parse import urlsplit
+
 import requests
-from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.hoarder.models import JobPage
-from src.hoarder.repositories import JobPageRepository
+from src.hoarder.repositories import PageCapture, UnitOfWork
+from src.hoarder.services.job_page_service import JobPageService
+from src.hoarder.services.scraper import page_content_hash
+from src.hoarder.utils.http_client import decode_html, get_http_session
+from src.hoarder.utils.settings import settings
+from src.hoarder.utils.urls import canonicalize_url
+
+# Responses worth retrying; other errors (404, 403, ...) fail immediately
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5  # seconds before the first retry
+
+
+class FetchResult(NamedTuple):
+    """A fetched page, or the error that stopped it after `attempts` tries
+
+    `not_modified` is set when a conditional request got a 304; page_html
+    is then None. etag and last_modified are the response's validators.
+    """
+
+    url: str
+    page_html: Optional[str]
+    error: Optional[str]
+    attempts: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+class ScrapeResult(NamedTuple):
+    """Outcome of scraping one URL: the saved page_id or an error message
+
+    For an `unchanged` URL nothing new was saved and page_id is the existing
+    capture with the same content.
+    """
+
+    url: str
+    page_id: Optional[int]
+    error: Optional[str]
+    unchanged: bool = False
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds from a Retry-After header (delay-seconds or HTTP-date), if the server sent one"""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:  # "-0000" dates are UTC without a zone
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class HostThrottle:
+    """
+    Politeness limits for one host.
+
+    At most `concurrency` requests are in flight and request starts are at
+    least `delay` seconds apart. A Retry-After from the host pushes the next
+    start back for every request to it, not just the one that got it.
+    """
+
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self.semaphore:
+            async with self._lock:
+                loop = asyncio.get_running_loop()
+                wait = self._next_start - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start = loop.time() + self.delay
+            yield
+
+    def defer(self, seconds: float) -> None:
+        """Hold off the next request to this host for at least `seconds`"""
+        self._next_start = max(self._next_start, asyncio.get_running_loop().time() + seconds)
 
 
-def scrape_and_save_job_webpage(url: str, job_page_repo: JobPageRepository) -> Optional[JobPage]:
+class PageFetcher:
+    """
+    Fetches pages concurrently over one pooled HTTP session.
+
+    Blocking requests calls run on the fetcher's own thread pool; a global
+    semaphore caps requests in flight and a HostThrottle per hostname keeps
+    each board to its own limit. Timeouts, connection errors, 429 and 5xx
+    responses are retried with jittered exponential backoff (or the
+    server's Retry-After). Use as a context manager, or call close().
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        per_host_concurrency: Optional[int] = None,
+        per_host_delay: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        max_backoff: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.max_concurrency = max_concurrency or settings.scrape_max_concurrency
+        self.per_host_concurrency = per_host_concurrency or settings.scrape_per_host_concurrency
+        # 0 is a valid delay and retry count, so only None falls back to the settings
+        if per_host_delay is None:
+            per_host_delay = settings.scrape_per_host_delay
+        self.per_host_delay = per_host_delay
+        if max_retries is None:
+            max_retries = settings.scrape_max_retries
+        self.max_retries = max_retries
+        self.max_backoff = max_backoff or settings.scrape_max_backoff
+        self.timeout = timeout or settings.scrape_timeout
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="fetch"
+        )
+        self.http_session = get_http_session()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._throttles: dict[str, HostThrottle] = {}
+
+    def __enter__(self) -> "PageFetcher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the fetch threads (requests already running finish in the background)"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _throttle(self, url: str) -> HostThrottle:
+        host = (urlsplit(url).hostname or "").lower()
+        if host not in self._throttles:
+            self._throttles[host] = HostThrottle(self.per_host_concurrency, self.per_host_delay)
+        return self._throttles[host]
+
+    def _get(self, url: str, headers: dict[str, str]) -> requests.Response:
+        return self.http_session.get(url, headers=headers, timeout=self.timeout)
+
+    async def fetch(
+        self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> FetchResult:
+        """Fetch one URL, retrying transient failures
+
+        With the validators of an earlier capture the request is made
+        conditional (If-None-Match / If-Modified-Since), so an unchanged page
+        costs the server a 304 instead of the full body.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        throttle = self._throttle(url)
+        loop = asyncio.get_running_loop()
+        error = None
+        for attempt in range(1, self.max_retries + 2):
+            retry_after = None
+            # Wait for the host first, so a busy host doesn't hold global slots
+            async with throttle.slot(), self._semaphore:
+                try:
+                    response = await loop.run_in_executor(self.executor, self._get, url, headers)
+                except requests.RequestException as e:
+                    error = f"Error fetching URL: {e}"
+                else:
+                    validators = (
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                    )
+                    if response.status_code == 304:
+                        if headers:
+                            return FetchResult(
+                                url, None, None, attempt, *validators, not_modified=True
+                            )
+                        # Nothing to compare against: a 304 to a plain GET has no page
+                        error = "HTTP 304 Not Modified without a conditional request"
+                        return FetchResult(url, None, error, attempt)
+                    if response.ok:
+                        page_html = await loop.run_in_executor(self.executor, decode_html, response)
+                        return FetchResult(url, page_html, None, attempt, *validators)
+                    error = f"HTTP {response.status_code} {response.reason}"
+                    if response.status_code not in RETRY_STATUSES:
+                        return FetchResult(url, None, error, attempt)
+                    retry_after = _retry_after(response)
+
+            if attempt > self.max_retries:
+                break
+            if retry_after is not None:
+                delay = min(retry_after, self.max_backoff)
+                throttle.defer(delay)
+            else:
+                delay = min(BACKOFF_BASE * 2 ** (attempt - 1), self.max_backoff)
+                delay *= 0.5 + random.random() / 2
+            await asyncio.sleep(delay)
+        return FetchResult(url, None, error, self.max_retries + 1)
+
+
+async def scrape_urls(
+    urls: Iterable[str],
+    session: AsyncSession,
+    batch_size: Optional[int] = None,
+    fetcher: Optional[PageFetcher] = None,
+) -> AsyncIterator[ScrapeResult]:
+    """
+    Fetch job pages concurrently and save them in batches.
+
+    URLs are read lazily, on a worker thread so a slow stdin or file doesn't
+    stall fetches in flight, and at most twice the fetcher's concurrency are
+    scheduled at a time, so a long (or streamed) URL list stays bounded in
+    memory. Fetched pages are stored `batch_size` at a time through
+    JobPageService.create_job_pages (one transaction each), which also
+    queues their promotion to job posts. Duplicate URLs, including variants
+    that differ only in tracking parameters or fragments, are fetched once.
+
+    URLs that were captured before are re-fetched conditionally with that
+    capture's ETag/Last-Modified. A 304, or a page whose extracted job fields
+    hash the same as before (markup churn such as CSRF tokens or tracking
+    scripts doesn't count), is reported as unchanged: no new capture is
+    stored and nothing is re-promoted, and the capture's validators are
+    refreshed along with the next batch of pages, in one UPDATE.
+
+    Args:
+        urls: URLs to scrape (e.g. lines of a file)
+        session: Database session for saving pages
+        batch_size: Fetched pages saved per transaction (default: SCRAPE_BATCH_SIZE)
+        fetcher: PageFetcher to use (default: one built from settings)
+
+    Yields:
+        One ScrapeResult per distinct URL, in completion order
+    """
+    batch_size = batch_size or settings.scrape_batch_size
+    job_page_service = JobPageService(session)
+    seen: set[str] = set()
+    url_iter = iter(urls)
+    pending: set[asyncio.Task[FetchResult]] = set()
+    previous: dict[str, JobPage] = {}
+    fetched: list[PageCapture] = []
+    validators: dict[int, tuple[Optional[str], Optional[str]]] = {}
+
+    async def save() -> list[ScrapeResult]:
+        if validators:
+            async with UnitOfWork(session) as uow:
+                await uow.job_pages.update_validators(validators)
+            validators.clear()
+        if not fetched:
+            return []
+        results = await job_page_service.create_job_pages(fetched)
+        saved = [
+            ScrapeResult(capture.url, result.page_id, result.error, unchanged=result.duplicate)
+            for capture, result in zip(fetched, results)
+        ]
+        fetched.clear()
+        return saved
+
+    async def handle(fetch_result: FetchResult) -> Optional[ScrapeResult]:
+        """Report an error or unchanged page, or queue the page for saving"""
+        url = fetch_result.url
+        last = previous.pop(url, None)
+        if fetch_result.not_modified and last is not None:
+            return ScrapeResult(url, last.page_id, None, unchanged=True)
+        if fetch_result.page_html is None:
+            return ScrapeResult(url, None, fetch_result.error)
+
+        content_sha256 = await asyncio.to_thread(page_content_hash, url, fetch_result.page_html)
+        if last is not None and last.content_sha256 == content_sha256:
+            validators[last.page_id] = (fetch_result.etag, fetch_result.last_modified)
+            return ScrapeResult(url, last.page_id, None, unchanged=True)
+
+        fetched.append(
+            PageCapture(
+                url,
+                fetch_result.page_html,
+                fetch_result.etag,
+                fetch_result.last_modified,
+                content_sha256,
+            )
+        )
+        return None
+
+    own_fetcher = fetcher is None
+    if fetcher is None:
+        fetcher = PageFetcher()
+    try:
+        while True:
+            while len(pending) < 2 * fetcher.max_concurrency:
+                url = await asyncio.to_thread(next, url_iter, None)
+                if url is None:
+                    break
+                url = url.strip()
+                if not url.startswith(("http://", "https://")):
+                    if url and url not in seen:
+                        seen.add(url)
+                        yield ScrapeResult(url, None, "url must start with http:// or https://")
+                    continue
+                canonical_url = canonicalize_url(url)
+                if canonical_url in seen:
+                    continue
+                seen.add(canonical_url)
+                last = await job_page_service.get_job_page_by_url(url)
+                if last is None:
+                    pending.add(asyncio.create_task(fetcher.fetch(url)))
+                    continue
+                previous[url] = last
+                pending.add(
+                    asyncio.create_task(fetcher.fetch(url, last.etag, last.last_modified))
+                )
+
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = await handle(task.result())
+                if result is not None:
+                    yield result
+            if len(fetched) + len(validators) >= batch_size:
+                for result in await save():
+                    yield result
+
+        if fetched or validators:
+            for result in await save():
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if own_fetcher:
+            fetcher.close()
+
+
+async def scrape_and_save_job_webpage(url: str, session: AsyncSession) -> Optional[JobPage]:
     """
     Fetch a job webpage and save it to the database.
 
+    A URL captured before is re-fetched conditionally (see scrape_urls); if
+    it hasn't changed, the existing capture is returned and nothing is saved.
+
     Args:
         url: The URL of the job posting to fetch
         session: Database session
@@ -18,21 +368,18 @@ def scrape_and_save_job_webpage(url: str, job_page_repo: JobPageRepository) -> O
         JobPage object if successful, None otherwise
     """
     try:
-        # Fetch the webpage
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-
-        # Get the HTML content
-        page_html = response.text
-
-        # Save to database using repository
-        job_page = job_page_repo.create(url=url, page_html=page_html)
-
-        return job_page
-
-    except requests.RequestException as e:
-        print(f"Error fetching URL: {e}")
-        return None
+        results = [result async for result in scrape_urls([url], session, batch_size=1)]
     except Exception as e:
         print(f"Error saving page to database: {e}")
         return None
+
+    if not results:
+        print("No URL to scrape")
+        return None
+    result = results[0]
+    if result.page_id is None:
+        print(result.error)
+        return None
+    if result.unchanged:
+        print(f"No changes since the last capture of {url}")
+    return await JobPageService(session).get_job_page_by_id(result.page_id)
@@ -1,6 +1,9 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import Optional
+from typing import Any, Optional
+
+from src.hoarder.extraction import StructuredJobData, extract_job, parse_html
+from src.hoarder.utils.http_client import decode_html, get_http_session
+from src.hoarder.utils.settings import settings
 
 
 class JobData:
@@ -12,65 +15,62 @@ class JobData:
         job_title: str,
         job_description: str,
         industry: Optional[str] = None,
+        structured: Optional[StructuredJobData] = None,
     ):
         self.company_name = company_name
         self.job_title = job_title
         self.job_description = job_description
         self.industry = industry
+        self.structured = structured or StructuredJobData()
 
+    @property
+    def salary_min(self) -> Optional[int]:
+        return self.structured.salary_min
 
-def scrape_job_page(url: str) -> Optional[JobData]:
+    @property
+    def salary_max(self) -> Optional[int]:
+        return self.structured.salary_max
+
+    @property
+    def structured_data(self) -> dict[str, Any]:
+        """Summary fields the page published, for JobService.create_job_post"""
+        return self.structured.summary_fields()
+
+
+def parse_job_page(url: str, page_html: str) -> JobData:
     """
-    Scrape a job posting URL and extract job information.
+    Extract job information from the HTML of a job posting.
 
-    This is a basic implementation that attempts to parse common job posting patterns.
-    You may need to customize this based on the specific websites you're scraping.
+    Structured data is used first, then the selectors registered for the
+    site's domain (see extraction/sites.py; add boards there), then generic
+    page patterns.
     """
+    # Fast parser backend when installed, BeautifulSoup otherwise
+    page = parse_html(page_html)
+
+    # JSON-LD/microdata, then site-specific selectors, then generic patterns
+    structured = extract_job(page, url)
+
+    return JobData(
+        company_name=structured.company_name or "Unknown Company",
+        job_title=structured.title or "Unknown Title",
+        job_description=structured.description or "No description found",
+        industry=structured.industry,
+        structured=structured,
+    )
+
+
+def page_content_hash(url: str, page_html: str) -> str:
+    """Hash of the job fields a page yields, for detecting changes between captures"""
+    return extract_job(parse_html(page_html), url).content_hash()
+
+
+def scrape_job_page(url: str) -> Optional[JobData]:
+    """Fetch a job posting URL and extract job information (see parse_job_page)"""
     try:
-        response = requests.get(url, timeout=10)
+        response = get_http_session().get(url, timeout=settings.scrape_timeout)
         response.raise_for_status()
-
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        # Basic extraction logic - customize based on target websites
-        # This is a placeholder implementation
-        company_name = "Unknown Company"
-        job_title = "Unknown Title"
-        job_description = "No description found"
-        industry = None
-
-        # Try to extract title from common patterns
-        if soup.find("h1"):
-            title_tag = soup.find("h1")
-            if title_tag and title_tag.text:
-                job_title = title_tag.text.strip()
-
-        # Try to extract company name from meta tags or common patterns
-        meta_tag = soup.find("meta", {"property": "og:site_name"})
-        if meta_tag and hasattr(meta_tag, "get"):
-            content = meta_tag.get("content")
-            if content:
-                company_name = str(content).strip()
-
-        # Try to extract description
-        if soup.find("div", class_=lambda x: x and "description" in x.lower()):
-            desc_tag = soup.find(
-                "div", class_=lambda x: x and "description" in x.lower()
-            )
-            if desc_tag and desc_tag.text:
-                job_description = desc_tag.text.strip()
-        elif soup.find("body"):
-            # Fallback to body text
-            body = soup.find("body")
-            if body:
-                job_description = body.get_text(separator="\n", strip=True)[:1000]
-
-        return JobData(
-            company_name=company_name,
-            job_title=job_title,
-            job_description=job_description,
-            industry=industry,
-        )
+        return parse_job_page(url, decode_html(response))
 
     except requests.RequestException as e:
         print(f"Error fetching URL: {e}")
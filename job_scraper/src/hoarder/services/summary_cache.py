@@ -0,0 +1,131 @@
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import redis.asyncio as redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.hoarder.repositories import SummaryCacheRepository
+from src.hoarder.utils.settings import settings
+
+REDIS_KEY_PREFIX = "summary_cache:"
+REDIS_STATS_KEY = "summary_cache:stats"
+STAT_NAMES = ("redis_hits", "db_hits", "misses")
+
+# Per-process counters; shared totals live in Redis when it is enabled
+_stats: dict[str, int] = {name: 0 for name in STAT_NAMES}
+_redis: Optional[redis.Redis] = None
+
+
+def _get_redis() -> Optional[redis.Redis]:
+    global _redis
+    if not settings.summary_cache_use_redis:
+        return None
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.redis_url)
+    return _redis
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different reposts share a key"""
+    return " ".join(text.lower().split())
+
+
+def summary_cache_key(
+    title: str, description: str, company: str, model: str, prompt_version: str
+) -> str:
+    """Cache key for a summary: hash of normalized job content plus prompt/model version"""
+    parts = [
+        normalize_text(title),
+        normalize_text(description),
+        normalize_text(company),
+        model,
+        prompt_version,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """
+    Two-tier cache of parsed LLM summaries.
+
+    SQLite (summary_cache table) is the persistent tier with TTL and
+    LRU-by-size eviction. Redis, when SUMMARY_CACHE_USE_REDIS is set, sits in
+    front of it with the same TTL; Redis errors are logged and the cache
+    falls back to SQLite. With autocommit=False, writes only flush and the
+    caller commits (see BaseRepository).
+    """
+
+    def __init__(self, session: AsyncSession, autocommit: bool = True):
+        self.session = session
+        self.cache_repo = SummaryCacheRepository(session, autocommit=autocommit)
+        self.redis = _get_redis()
+
+    @staticmethod
+    def _not_before() -> datetime:
+        # CURRENT_TIMESTAMP in SQLite is naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return now - timedelta(seconds=settings.summary_cache_ttl)
+
+    async def _count(self, name: str) -> None:
+        _stats[name] += 1
+        if self.redis is not None:
+            try:
+                await self.redis.hincrby(REDIS_STATS_KEY, name, 1)
+            except redis.RedisError as e:
+                print(f"Warning: Failed to record summary cache stat in Redis: {e}")
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Get a cached summary result, or None on a miss"""
+        if self.redis is not None:
+            try:
+                cached = await self.redis.get(REDIS_KEY_PREFIX + key)
+                if cached is not None:
+                    await self._count("redis_hits")
+                    return json.loads(cached)
+            except redis.RedisError as e:
+                print(f"Warning: Summary cache Redis lookup failed: {e}")
+
+        entry = await self.cache_repo.get(key, not_before=self._not_before())
+        if entry is None:
+            await self._count("misses")
+            return None
+
+        await self._count("db_hits")
+        if self.redis is not None:
+            try:
+                await self.redis.set(REDIS_KEY_PREFIX + key, entry.result, ex=settings.summary_cache_ttl)
+            except redis.RedisError as e:
+                print(f"Warning: Failed to backfill summary cache in Redis: {e}")
+        return json.loads(entry.result)
+
+    async def put(self, key: str, model: str, prompt_version: str, result: dict[str, Any]) -> None:
+        """Store a summary result in both tiers and evict stale entries"""
+        payload = json.dumps(result)
+        await self.cache_repo.put(key, model=model, prompt_version=prompt_version, result=payload)
+        await self.cache_repo.evict(
+            not_before=self._not_before(), max_entries=settings.summary_cache_max_entries
+        )
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(REDIS_KEY_PREFIX + key, payload, ex=settings.summary_cache_ttl)
+            except redis.RedisError as e:
+                print(f"Warning: Failed to store summary cache entry in Redis: {e}")
+
+    async def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this process and, with Redis, across all processes"""
+        shared: Optional[dict[str, int]] = None
+        if self.redis is not None:
+            try:
+                raw = await self.redis.hgetall(REDIS_STATS_KEY)
+                shared = {name: int(raw.get(name.encode(), 0)) for name in STAT_NAMES}
+            except redis.RedisError as e:
+                print(f"Warning: Failed to read summary cache stats from Redis: {e}")
+
+        return {
+            "entries": await self.cache_repo.count(),
+            "process": dict(_stats),
+            "shared": shared,
+        }
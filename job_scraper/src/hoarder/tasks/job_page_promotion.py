@@ -0,0 +1,99 @@
+from typing import Optional
+
+from src.hoarder.celery_app import celery_app
+from src.hoarder.utils.async_runner import run_async
+from src.hoarder.utils.database import get_async_session_factory
+
+DEFAULT_PROMOTION_LIMIT = 1000
+
+
+async def promote_job_page(page_id: int) -> dict[str, str]:
+    """Create the job post for one saved job page"""
+    # Imported here: services import this module to queue tasks
+    from src.hoarder.services.job_page_promotion import JobPagePromotionService
+
+    async with get_async_session_factory()() as session:
+        result = await JobPagePromotionService(session).promote_job_page(page_id)
+
+    if result.error:
+        return {
+            "status": "skipped",
+            "message": f"Job page {page_id} not promoted: {result.error}",
+        }
+    return {
+        "status": "success",
+        "message": f"Promoted job page {page_id} to job post {result.job_post_id}",
+    }
+
+
+async def promote_job_pages(limit: int) -> dict[str, str]:
+    """Promote up to `limit` job pages saved after the promotion high-water mark"""
+    from src.hoarder.services.job_page_promotion import JobPagePromotionService
+
+    async with get_async_session_factory()() as session:
+        results = [
+            result
+            async for result in JobPagePromotionService(session).promote_job_pages(limit=limit)
+        ]
+
+    promoted = sum(1 for result in results if result.job_post_id is not None)
+    return {
+        "status": "success",
+        "message": f"Promoted {promoted} of {len(results)} job page(s)",
+    }
+
+
+@celery_app.task(name="promote_job_page", bind=True)
+def promote_job_page_task(self, page_id: int) -> dict[str, str]:
+    """
+    Celery task to turn a saved job page into a job post.
+
+    Queued through the outbox when a page is saved. Extracts the company,
+    title and description from the stored HTML and creates a JobPost linked
+    to the page, which in turn queues process_job_post. Safe to run twice:
+    an already promoted page is skipped.
+
+    Args:
+        page_id: The ID of the JobPage to promote
+
+    Returns:
+        dict with status and message
+    """
+    try:
+        return run_async(promote_job_page(page_id))
+
+    except Exception as e:
+        print(f"Error promoting job page {page_id}: {e}")
+        return {
+            "status": "error",
+            "message": f"Error promoting job page: {str(e)}",
+        }
+
+
+@celery_app.task(name="promote_job_pages", bind=True)
+def promote_job_pages_task(self, limit: Optional[int] = None) -> dict[str, str]:
+    """
+    Celery task to promote the next chunk of saved job pages.
+
+    Resumes from the promotion high-water mark, so it can be scheduled
+    periodically to catch pages that were saved without a queued
+    promotion (e.g. before this stage existed). HTML is parsed in the task's
+    own process: prefork pool children are daemonic and cannot start a
+    process pool, so use `main.py --promote-pages --workers N` for large
+    backfills.
+
+    Args:
+        limit: Maximum job pages to look at (default: DEFAULT_PROMOTION_LIMIT)
+
+    Returns:
+        dict with status and message
+    """
+    try:
+        return run_async(promote_job_pages(limit or DEFAULT_PROMOTION_LIMIT))
+
+    except Exception as e:
+        print(f"Error promoting job pages: {e}")
+        return {
+            "status": "error",
+            "message": f"Error promoting job pages: {str(e)}",
+        }
@@ -1,30 +1,33 @@
 import os
+from typing import Optional
+
 from src.hoarder.celery_app import celery_app
-from src.hoarder.utils.database import get_session
+from src.hoarder.utils.async_runner import run_async
+from src.hoarder.utils.database import get_async_session_factory
 from src.hoarder.repositories import JobPostRepository
-from src.hoarder.services.ai_service import AIService
+from src.hoarder.utils.settings import settings
 
 
-@celery_app.task(name="process_job_post", bind=True)
-def process_job_post_task(self, job_post_id: int) -> dict[str, str]:
-    """
-    Celery task to process a job post for LLM summarization.
+def _configured_provider() -> Optional[str]:
+    """Return the LLM provider to use, or None when its API key is missing"""
+    provider = os.getenv("LLM_PROVIDER", "openai")  # openai or anthropic
+    api_key = (
+        os.getenv("OPENAI_API_KEY")
+        if provider == "openai"
+        else os.getenv("ANTHROPIC_API_KEY")
+    )
 
-    This task:
-    1. Retrieves the job post from the database
-    2. Uses AIService to generate a summary via LLM
-    3. Stores the summary in the summarized_job table
+    if not api_key:
+        print(f"⚠ No {provider.upper()} API key found - skipping AI summarization")
+        return None
+    return provider
 
-    Args:
-        job_post_id: The ID of the JobPost to process
 
-    Returns:
-        dict with status and message
-    """
-    session = get_session()
-    try:
+async def process_job_post(job_post_id: int) -> dict[str, str]:
+    """Look up a job post and summarize it with AIService"""
+    async with get_async_session_factory()() as session:
         job_post_repo = JobPostRepository(session)
-        job_post = job_post_repo.get_by_id(job_post_id)
+        job_post = await job_post_repo.get_by_id(job_post_id, with_description=True)
 
         if not job_post:
             return {
@@ -38,23 +41,19 @@ def process_job_post_task(self, job_post_id: int) -> dict[str, str]:
         print(f"Description length: {len(job_post.description)} characters")
 
         # Check if AI processing is enabled
-        provider = os.getenv("LLM_PROVIDER", "openai")  # openai or anthropic
-        api_key = (
-            os.getenv("OPENAI_API_KEY")
-            if provider == "openai"
-            else os.getenv("ANTHROPIC_API_KEY")
-        )
-
-        if not api_key:
-            print(f"⚠ No {provider.upper()} API key found - skipping AI summarization")
+        provider = _configured_provider()
+        if provider is None:
             return {
                 "status": "skipped",
                 "message": "AI summarization skipped - no API key configured",
             }
 
+        # Imported here: services import this module to queue tasks
+        from src.hoarder.services.ai_service import AIService
+
         # Use AIService to summarize the job
         ai_service = AIService(session, provider=provider)
-        summarized_job = ai_service.summarize_job(job_post_id)
+        summarized_job = await ai_service.summarize_job(job_post_id)
 
         if summarized_job:
             return {
@@ -67,6 +66,26 @@ def process_job_post_task(self, job_post_id: int) -> dict[str, str]:
                 "message": f"Failed to summarize job post {job_post_id}",
             }
 
+
+@celery_app.task(name="process_job_post", bind=True)
+def process_job_post_task(self, job_post_id: int) -> dict[str, str]:
+    """
+    Celery task to process a job post for LLM summarization.
+
+    This task:
+    1. Retrieves the job post from the database
+    2. Uses AIService to generate a summary via LLM
+    3. Stores the summary in the summarized_job table
+
+    Args:
+        job_post_id: The ID of the JobPost to process
+
+    Returns:
+        dict with status and message
+    """
+    try:
+        return run_async(process_job_post(job_post_id))
+
     except Exception as e:
         print(f"Error processing job post {job_post_id}: {e}")
         return {
@@ -74,5 +93,58 @@ def process_job_post_task(self, job_post_id: int) -> dict[str, str]:
             "message": f"Error processing job post: {str(e)}",
         }
 
-    finally:
-        session.close()
+
+async def summarize_pending_job_posts(limit: int) -> dict[str, str]:
+    """Summarize up to `limit` job posts that have no summary yet, concurrently"""
+    provider = _configured_provider()
+    if provider is None:
+        return {
+            "status": "skipped",
+            "message": "AI summarization skipped - no API key configured",
+        }
+
+    from src.hoarder.services.ai_service import AIService
+
+    async with get_async_session_factory()() as session:
+        job_post_ids = await JobPostRepository(session).get_unsummarized_ids(limit)
+        if not job_post_ids:
+            return {"status": "success", "message": "No pending job posts"}
+
+        print(f"Summarizing {len(job_post_ids)} pending job post(s)")
+        results = await AIService(session, provider=provider).summarize_jobs(job_post_ids)
+
+    summarized = sum(1 for summarized_job in results.values() if summarized_job)
+    failed = len(results) - summarized
+    return {
+        "status": "success" if not failed else "partial",
+        "message": f"Summarized {summarized} job post(s), {failed} failed",
+    }
+
+
+@celery_app.task(name="summarize_pending_job_posts", bind=True)
+def summarize_pending_job_posts_task(self, limit: Optional[int] = None) -> dict[str, str]:
+    """
+    Celery task to summarize a batch of pending job posts.
+
+    Pulls up to `limit` job posts without a summary and summarizes them
+    with concurrent async LLM requests (at most LLM_MAX_CONCURRENCY in
+    flight), so one worker process keeps many requests busy instead of
+    blocking on each round trip. Celery beat runs it every
+    SUMMARY_SWEEP_INTERVAL seconds (see celery_app) to catch posts whose
+    process_job_post task failed.
+
+    Args:
+        limit: Maximum job posts to summarize (default: SUMMARY_BATCH_SIZE)
+
+    Returns:
+        dict with status and message
+    """
+    try:
+        return run_async(summarize_pending_job_posts(limit or settings.summary_batch_size))
+
+    except Exception as e:
+        print(f"Error summarizing pending job posts: {e}")
+        return {
+            "status": "error",
+            "message": f"Error summarizing pending job posts: {str(e)}",
+        }
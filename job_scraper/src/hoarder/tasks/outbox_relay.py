@@ -0,0 +1,92 @@
+"""
+Outbox relay: drains task_outbox into Celery.
+
+Run one relay per deployment:
+    python -m src.hoarder.tasks.outbox_relay
+"""
+
+import asyncio
+import json
+
+from celery import group  # type: ignore[import-untyped]
+
+from src.hoarder.celery_app import celery_app
+from src.hoarder.models import TaskOutbox
+from src.hoarder.repositories import TaskOutboxRepository
+from src.hoarder.utils.database import get_async_session_factory
+from src.hoarder.utils.settings import settings
+
+
+def publish(entries: list[TaskOutbox]) -> None:
+    """Publish a batch of outbox entries as one group over a single broker connection"""
+    signatures = [
+        celery_app.signature(entry.task_name, args=json.loads(entry.args))
+        for entry in entries
+    ]
+    with celery_app.producer_or_acquire() as producer:
+        group(signatures).apply_async(producer=producer)
+
+
+async def relay_once(batch_size: int) -> int:
+    """
+    Publish one batch of pending tasks.
+
+    Entries are deleted only after the broker accepted the batch, so a
+    failed publish leaves them in place for the next attempt (delivery is
+    at-least-once; tasks must tolerate duplicates).
+
+    Returns:
+        Number of tasks published
+
+    Raises:
+        Exception: Whatever the broker raised; the failure is recorded on the entries first
+    """
+    async with get_async_session_factory()() as session:
+        outbox_repo = TaskOutboxRepository(session)
+        entries = await outbox_repo.get_pending(batch_size)
+        if not entries:
+            return 0
+
+        ids = [entry.id for entry in entries]
+        try:
+            await asyncio.to_thread(publish, entries)
+        except Exception as e:
+            await outbox_repo.record_failure(ids, str(e))
+            raise
+
+        await outbox_repo.delete_many(ids)
+        return len(entries)
+
+
+async def run_relay(
+    batch_size: int = settings.outbox_batch_size,
+    poll_interval: float = settings.outbox_poll_interval,
+    max_backoff: float = settings.outbox_max_backoff,
+) -> None:
+    """
+    Drain the outbox forever.
+
+    Full batches are followed immediately by the next one, so bursts are
+    published as fast as the broker accepts them; an empty outbox is polled
+    every `poll_interval` seconds. Broker failures back off exponentially up
+    to `max_backoff` seconds.
+    """
+    backoff = poll_interval
+    while True:
+        try:
+            published = await relay_once(batch_size)
+        except Exception as e:
+            print(f"Warning: Failed to publish outbox batch, retrying in {backoff:.0f}s: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, max_backoff)
+            continue
+
+        backoff = poll_interval
+        if published:
+            print(f"✓ Published {published} queued task(s)")
+        if published < batch_size:
+            await asyncio.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_relay())
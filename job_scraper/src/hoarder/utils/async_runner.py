@@ -0,0 +1,20 @@
+import asyncio
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine from synchronous code (e.g. a Celery task).
+
+    Reuses one event loop per process so the pooled async engine's
+    connections, which are bound to the loop that opened them, survive
+    between calls.
+    """
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
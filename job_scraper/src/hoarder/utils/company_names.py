@@ -0,0 +1,8 @@
+def normalize_company_name(name: str) -> str:
+    """
+    Key that identifies a company regardless of letter case and spacing.
+
+    "Acme  Robotics", " acme robotics" and "ACME Robotics" all normalize to
+    "acme robotics". Stored in company.normalized_name, which is unique.
+    """
+    return " ".join(name.split()).casefold()
@@ -1,21 +1,167 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import os
+from typing import Any, AsyncGenerator, Optional
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+
 from src.hoarder.utils.settings import settings
-from typing import AsyncGenerator
+
+
+class _EngineRegistry:
+    """
+    Process-wide holder for the sync and async engines and their session factories.
+
+    Engines are created lazily on first use and shared by every session opened
+    in the same process, so connection pools are reused across API requests,
+    Celery tasks and Streamlit submits. The registry remembers the pid that
+    created the engines; a forked child (e.g. a Celery prefork worker) detects
+    the mismatch and drops the inherited pools without closing the parent's
+    connections.
+    """
+
+    def __init__(self) -> None:
+        self._pid: Optional[int] = None
+        self._engine: Optional[Engine] = None
+        self._async_engine: Optional[AsyncEngine] = None
+        self._session_factory: Optional[sessionmaker[Session]] = None
+        self._async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+    def _check_pid(self) -> None:
+        pid = os.getpid()
+        if self._pid is not None and self._pid != pid:
+            self.reset_after_fork()
+        self._pid = pid
+
+    def reset_after_fork(self) -> None:
+        """Forget engines inherited from a parent process without closing its connections"""
+        if self._engine is not None:
+            self._engine.dispose(close=False)
+        if self._async_engine is not None:
+            self._async_engine.sync_engine.dispose(close=False)
+        self._engine = None
+        self._async_engine = None
+        self._session_factory = None
+        self._async_session_factory = None
+        self._pid = os.getpid()
+
+    @property
+    def engine(self) -> Engine:
+        self._check_pid()
+        if self._engine is None:
+            self._engine = create_engine(settings.db_url, **_engine_options(settings.db_url))
+        return self._engine
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        self._check_pid()
+        if self._async_engine is None:
+            self._async_engine = create_async_engine(
+                settings.db_url, **_engine_options(settings.db_url)
+            )
+        return self._async_engine
+
+    @property
+    def session_factory(self) -> sessionmaker[Session]:
+        self._check_pid()
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(
+                autocommit=False, autoflush=False, bind=self.engine
+            )
+        return self._session_factory
+
+    @property
+    def async_session_factory(self) -> async_sessionmaker[AsyncSession]:
+        self._check_pid()
+        if self._async_session_factory is None:
+            # Objects stay usable after commit; expiring them would force a lazy
+            # refresh, which async sessions can't do implicitly
+            self._async_session_factory = async_sessionmaker(
+                self.async_engine, class_=AsyncSession, expire_on_commit=False
+            )
+        return self._async_session_factory
+
+    def dispose(self) -> None:
+        """Close all pooled connections of the sync engine"""
+        if self._engine is not None:
+            self._engine.dispose()
+        self._engine = None
+        self._session_factory = None
+
+    async def dispose_async(self) -> None:
+        """Close all pooled connections of the async engine"""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+        self._async_engine = None
+        self._async_session_factory = None
+
+
+def _engine_options(db_url: str) -> dict[str, Any]:
+    """Build create_engine keyword arguments from the pool settings"""
+    options: dict[str, Any] = {
+        "echo": settings.db_echo,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+    # In-memory SQLite uses a single-connection pool that rejects sizing options
+    url = make_url(db_url)
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        options["pool_size"] = settings.db_pool_size
+        options["max_overflow"] = settings.db_max_overflow
+
+    return options
+
+
+_registry = _EngineRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_registry.reset_after_fork)
+
+
+def get_engine() -> Engine:
+    """Get the process-wide sync engine"""
+    return _registry.engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the process-wide async engine"""
+    return _registry.async_engine
+
+
+def dispose_engine() -> None:
+    """Dispose the sync engine, e.g. on worker shutdown"""
+    _registry.dispose()
+
+
+async def dispose_async_engine() -> None:
+    """Dispose the async engine, e.g. on application shutdown"""
+    await _registry.dispose_async()
+
+
+def reset_engines_after_fork() -> None:
+    """Drop engines inherited from a parent process"""
+    _registry.reset_after_fork()
+
+
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the process-wide async session factory, for use outside FastAPI dependencies"""
+    return _registry.async_session_factory
 
 
 def get_session() -> Session:
     """Get a database session"""
-    engine = create_engine(settings.db_url, echo=False)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    return _registry.session_factory()
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async_engine = create_async_engine(settings.db_url, echo=True)
-    async_session = async_sessionmaker(async_engine, class_=AsyncSession)
 
-    async with async_session() as session:
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with _registry.async_session_factory() as session:
         try:
             yield session
         finally:
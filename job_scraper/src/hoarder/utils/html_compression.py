@@ -0,0 +1,76 @@
+import hashlib
+from typing import NamedTuple, Optional
+
+import zstandard
+
+from src.hoarder.utils.settings import settings
+
+COMPRESSION_ZSTD = "zstd"
+
+# Trained dictionaries loaded in this process, keyed by compression_dictionary.id
+_dictionaries: dict[int, zstandard.ZstdCompressionDict] = {}
+
+
+class CompressedHtml(NamedTuple):
+    """Compressed page HTML plus the metadata needed to address and decode it"""
+
+    sha256: str
+    size: int
+    compression: str
+    data: bytes
+    dict_id: Optional[int] = None
+
+
+def register_dictionary(dict_id: int, data: bytes) -> None:
+    """Make a stored dictionary available for compression and decompression"""
+    _dictionaries[dict_id] = zstandard.ZstdCompressionDict(data)
+
+
+def has_dictionary(dict_id: int) -> bool:
+    """Whether a dictionary is already loaded in this process"""
+    return dict_id in _dictionaries
+
+
+def train_dictionary(samples: list[bytes], dict_size: int) -> bytes:
+    """Train a zstd dictionary from sample documents"""
+    return zstandard.train_dictionary(dict_size, samples).as_bytes()
+
+
+def hash_html(html: str) -> str:
+    """SHA-256 of the UTF-8 encoded HTML, used as the blob's content address"""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def _compressor(dict_id: Optional[int]) -> zstandard.ZstdCompressor:
+    if dict_id is None:
+        return zstandard.ZstdCompressor(level=settings.html_compression_level)
+    return zstandard.ZstdCompressor(
+        level=settings.html_compression_level, dict_data=_dictionaries[dict_id]
+    )
+
+
+def _decompressor(dict_id: Optional[int]) -> zstandard.ZstdDecompressor:
+    if dict_id is None:
+        return zstandard.ZstdDecompressor()
+    if dict_id not in _dictionaries:
+        raise LookupError(f"Compression dictionary {dict_id} is not loaded")
+    return zstandard.ZstdDecompressor(dict_data=_dictionaries[dict_id])
+
+
+def compress_html(html: str, dict_id: Optional[int] = None) -> CompressedHtml:
+    """Compress page HTML with zstd, using a registered dictionary when dict_id is given"""
+    raw = html.encode("utf-8")
+    return CompressedHtml(
+        sha256=hashlib.sha256(raw).hexdigest(),
+        size=len(raw),
+        compression=COMPRESSION_ZSTD,
+        data=_compressor(dict_id).compress(raw),
+        dict_id=dict_id,
+    )
+
+
+def decompress_html(data: bytes, compression: str, dict_id: Optional[int] = None) -> str:
+    """Decode a stored HTML blob back to text"""
+    if compression != COMPRESSION_ZSTD:
+        raise ValueError(f"Unsupported page HTML compression: {compression}")
+    return _decompressor(dict_id).decompress(data).decode("utf-8")
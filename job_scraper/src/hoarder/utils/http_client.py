@@ -0,0 +1,61 @@
+import codecs
+import os
+import re
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.hoarder.utils.settings import settings
+
+USER_AGENT = "Mozilla/5.0 (compatible; job_scraper/0.1)"
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="...; charset=...">
+META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+
+
+def get_http_session() -> requests.Session:
+    """
+    Process-wide requests.Session for fetching job pages.
+
+    Connections are kept alive and pooled per host (up to
+    SCRAPE_MAX_CONCURRENCY each), so repeated fetches from the same board
+    skip the TCP and TLS handshakes. Like the database engines, a forked
+    child builds its own session instead of sharing the parent's sockets.
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=settings.scrape_max_concurrency)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = USER_AGENT
+        _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def decode_html(response: requests.Response) -> str:
+    """
+    Decode the body of an HTML response.
+
+    requests falls back to ISO-8859-1 for text/html without a charset,
+    which garbles UTF-8 pages. Without a charset header the page's own
+    <meta charset> is used, then UTF-8, then requests' guess from the bytes.
+    """
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        return response.text
+
+    content = response.content
+    match = META_CHARSET.search(content[:4096])
+    if match:
+        try:
+            return content.decode(codecs.lookup(match.group(1).decode("ascii")).name, "replace")
+        except LookupError:
+            pass
+    try:
+        return content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return content.decode(response.apparent_encoding or "utf-8", "replace")
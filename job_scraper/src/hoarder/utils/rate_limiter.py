@@ -0,0 +1,234 @@
+import asyncio
+import random
+import time
+from typing import NamedTuple, Optional
+
+import redis.asyncio as redis
+
+from src.hoarder.utils.settings import settings
+
+REDIS_KEY_PREFIX = "llm_rate:"
+REDIS_RETRY_INTERVAL = 30.0  # seconds before retrying Redis after a failure
+BASE_BACKOFF = 1.0  # seconds, doubled for every consecutive 429 without retry-after
+
+
+class RateLimit(NamedTuple):
+    """Request and token budgets of one provider/model"""
+
+    requests_per_minute: int
+    tokens_per_minute: int
+
+
+# Conservative defaults, roughly the lower usage tiers of each provider
+DEFAULT_RATE_LIMITS: dict[str, RateLimit] = {
+    "openai": RateLimit(requests_per_minute=500, tokens_per_minute=200_000),
+    "anthropic": RateLimit(requests_per_minute=50, tokens_per_minute=40_000),
+}
+
+# Atomically refill both buckets and take one request plus `cost` tokens.
+# Returns the seconds to wait before retrying, or 0 when the budget was taken.
+# Uses Redis server time so every worker sees the same clock.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'updated_at', 'blocked_until')
+local requests = tonumber(state[1]) or rpm
+local tokens = tonumber(state[2]) or tpm
+local elapsed = math.max(0, now - (tonumber(state[3]) or now))
+local blocked_until = tonumber(state[4]) or 0
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+tokens = math.min(tpm, tokens + elapsed * tpm / 60)
+local wait = 0
+if blocked_until > now then
+    wait = blocked_until - now
+else
+    if requests < 1 then wait = (1 - requests) * 60 / rpm end
+    if tokens < cost then wait = math.max(wait, (cost - tokens) * 60 / tpm) end
+end
+if wait == 0 then
+    requests = requests - 1
+    tokens = tokens - cost
+end
+redis.call('HSET', KEYS[1], 'requests', requests, 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], 300)
+return tostring(wait)
+"""
+
+# Push blocked_until forward (never back) by ARGV[1] seconds from now
+_BLOCK_SCRIPT = """
+local t = redis.call('TIME')
+local until_ = tonumber(t[1]) + tonumber(t[2]) / 1000000 + tonumber(ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'blocked_until')) or 0
+if until_ > current then
+    redis.call('HSET', KEYS[1], 'blocked_until', until_)
+    redis.call('EXPIRE', KEYS[1], 300)
+end
+return 1
+"""
+
+_redis: Optional[redis.Redis] = None
+_redis_down_until = 0.0
+_limiters: dict[str, "LLMRateLimiter"] = {}
+
+
+def _get_redis() -> Optional[redis.Redis]:
+    global _redis
+    if not settings.llm_rate_limit_use_redis or time.monotonic() < _redis_down_until:
+        return None
+    if _redis is None:
+        _redis = redis.Redis.from_url(settings.redis_url)
+    return _redis
+
+
+def _redis_failed(e: Exception) -> None:
+    global _redis_down_until
+    print(f"Warning: LLM rate limiter falling back to in-process buckets: {e}")
+    _redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Rough token count of prompt texts (about 4 characters per token)"""
+    return sum(len(text) for text in texts) // 4
+
+
+def is_rate_limit_error(e: BaseException) -> bool:
+    """Whether an LLM client error is an HTTP 429 (OpenAI and Anthropic SDKs alike)"""
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status == 429
+
+
+def retry_after_seconds(e: BaseException) -> Optional[float]:
+    """The retry-after delay an LLM provider sent with a 429, if any"""
+    headers = getattr(getattr(e, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is not None:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return None
+
+
+class LLMRateLimiter:
+    """
+    Token bucket limiting requests and tokens per minute for one provider/model.
+
+    Buckets live in Redis (LLM_RATE_LIMIT_USE_REDIS) so all workers share one
+    budget; when Redis is unreachable each process falls back to its own
+    buckets. A 429 blocks every worker for the provider's retry-after, or an
+    exponential backoff when none was sent. Callers wait for budget instead
+    of failing.
+    """
+
+    def __init__(self, provider: str, model: str, limit: RateLimit):
+        self.key = f"{REDIS_KEY_PREFIX}{provider}:{model}"
+        self.limit = limit
+        self.strikes = 0  # consecutive 429s, drives the backoff
+
+        # In-process fallback state
+        self._requests = float(limit.requests_per_minute)
+        self._tokens = float(limit.tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+
+    def _take_local(self, cost: int) -> float:
+        now = time.monotonic()
+        rpm, tpm = self.limit
+        elapsed = now - self._updated_at
+        self._requests = min(rpm, self._requests + elapsed * rpm / 60)
+        self._tokens = min(tpm, self._tokens + elapsed * tpm / 60)
+        self._updated_at = now
+
+        if self._blocked_until > now:
+            return self._blocked_until - now
+        wait = 0.0
+        if self._requests < 1:
+            wait = (1 - self._requests) * 60 / rpm
+        if self._tokens < cost:
+            wait = max(wait, (cost - self._tokens) * 60 / tpm)
+        if wait == 0:
+            self._requests -= 1
+            self._tokens -= cost
+        return wait
+
+    async def _take(self, cost: int) -> float:
+        client = _get_redis()
+        if client is not None:
+            try:
+                wait = await client.eval(  # type: ignore[misc]
+                    _ACQUIRE_SCRIPT, 1, self.key, *self.limit, cost
+                )
+                return float(wait)
+            except redis.RedisError as e:
+                _redis_failed(e)
+        return self._take_local(cost)
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request and `tokens` tokens fit in the budget, then take them"""
+        cost = min(tokens, self.limit.tokens_per_minute)
+        while True:
+            wait = await self._take(cost)
+            if wait <= 0:
+                return
+            # Jitter so waiting workers do not all retry at the same instant
+            await asyncio.sleep(wait + random.uniform(0, 0.1 * wait))
+
+    async def backoff(self, retry_after: Optional[float] = None) -> float:
+        """
+        Record a 429 and block the provider/model for all workers.
+
+        Args:
+            retry_after: Delay the provider asked for, in seconds
+
+        Returns:
+            The delay applied, in seconds
+        """
+        self.strikes += 1
+        delay = retry_after
+        if delay is None:
+            delay = BASE_BACKOFF * 2 ** (self.strikes - 1)
+        delay = min(delay, settings.llm_max_backoff)
+
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        client = _get_redis()
+        if client is not None:
+            try:
+                await client.eval(_BLOCK_SCRIPT, 1, self.key, delay)  # type: ignore[misc]
+            except redis.RedisError as e:
+                _redis_failed(e)
+        return delay
+
+    def succeeded(self) -> None:
+        """Reset the backoff after a successful request"""
+        self.strikes = 0
+
+
+def get_rate_limiter(provider: str, model: str) -> LLMRateLimiter:
+    """
+    Get the process-wide limiter for a provider/model.
+
+    Budgets default to DEFAULT_RATE_LIMITS for the provider;
+    LLM_REQUESTS_PER_MINUTE and LLM_TOKENS_PER_MINUTE override them.
+    """
+    key = f"{provider}:{model}"
+    if key not in _limiters:
+        default = DEFAULT_RATE_LIMITS.get(provider, DEFAULT_RATE_LIMITS["openai"])
+        limit = RateLimit(
+            requests_per_minute=settings.llm_requests_per_minute or default.requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute or default.tokens_per_minute,
+        )
+        _limiters[key] = LLMRateLimiter(provider, model, limit)
+    return _limiters[key]
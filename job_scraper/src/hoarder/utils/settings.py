@@ -9,7 +9,40 @@ class Settings(BaseSettings):
 
 
     db_url: Annotated[str, Field(default="")]
+    db_echo: Annotated[bool, Field(default=False)]
+    db_pool_size: Annotated[int, Field(default=5)]
+    db_max_overflow: Annotated[int, Field(default=10)]
+    db_pool_recycle: Annotated[int, Field(default=1800)]  # seconds, -1 disables
+    db_pool_pre_ping: Annotated[bool, Field(default=True)]
+    html_compression_level: Annotated[int, Field(default=10)]  # zstd level for stored page HTML
+    outbox_batch_size: Annotated[int, Field(default=100)]
+    outbox_poll_interval: Annotated[float, Field(default=1.0)]  # seconds between idle polls
+    outbox_max_backoff: Annotated[float, Field(default=30.0)]  # seconds, while the broker is down
+    redis_url: Annotated[str, Field(default="redis://localhost:6379/0")]
+    summary_cache_ttl: Annotated[int, Field(default=30 * 24 * 3600)]  # seconds
+    summary_cache_max_entries: Annotated[int, Field(default=50_000)]
+    summary_cache_use_redis: Annotated[bool, Field(default=False)]
+    company_cache_max_entries: Annotated[int, Field(default=2000)]  # 0 disables the cache
+    company_cache_ttl: Annotated[float, Field(default=600.0)]  # seconds
+    sql_statement_budget: Annotated[int, Field(default=0)]  # per API request/Celery task, warns past it; 0 off
+    html_parser: Annotated[str, Field(default="auto")]  # auto, selectolax or bs4
+    max_request_body_size: Annotated[int, Field(default=20 * 1024 * 1024)]  # bytes, after decompression
+    llm_max_concurrency: Annotated[int, Field(default=20)]  # in-flight LLM requests per batch
+    llm_rate_limit_use_redis: Annotated[bool, Field(default=True)]  # share budgets across workers
+    llm_requests_per_minute: Annotated[int, Field(default=0)]  # 0 uses the provider default
+    llm_tokens_per_minute: Annotated[int, Field(default=0)]  # 0 uses the provider default
+    llm_max_retries: Annotated[int, Field(default=5)]  # retries after a 429
+    llm_max_backoff: Annotated[float, Field(default=60.0)]  # seconds
+    summary_batch_size: Annotated[int, Field(default=50)]  # posts per summarize_pending_job_posts task
+    summary_sweep_interval: Annotated[float, Field(default=300.0)]  # seconds between beat sweeps, 0 off
+    scrape_max_concurrency: Annotated[int, Field(default=16)]  # in-flight page fetches
+    scrape_per_host_concurrency: Annotated[int, Field(default=2)]  # in-flight fetches per host
+    scrape_per_host_delay: Annotated[float, Field(default=1.0)]  # seconds between request starts per host
+    scrape_max_retries: Annotated[int, Field(default=3)]  # retries after a timeout, 429 or 5xx
+    scrape_max_backoff: Annotated[float, Field(default=30.0)]  # seconds
+    scrape_timeout: Annotated[float, Field(default=10.0)]  # seconds per request
+    scrape_batch_size: Annotated[int, Field(default=50)]  # fetched pages saved per transaction
     llm_provider: Annotated[str, Field(default="openai")]
     openai_key: Annotated[str, Field(alias="openai_api_key", default="")]
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
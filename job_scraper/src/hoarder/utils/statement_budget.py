@@ -0,0 +1,103 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class StatementBudgetExceeded(AssertionError):
+    """A code path ran more SQL statements than its budget allows"""
+
+
+class StatementCounter:
+    """
+    SQL statements run by one code path (an API request, a task, a test block).
+
+    Counters nest: a statement counts towards every counter active around it.
+    """
+
+    def __init__(
+        self, name: str, budget: Optional[int] = None, parent: Optional["StatementCounter"] = None
+    ):
+        self.name = name
+        self.budget = budget
+        self.parent = parent
+        self.statements: list[str] = []
+        self._token: Optional[Token[Optional[StatementCounter]]] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def report(self) -> str:
+        """The count against the budget, followed by every statement (condensed)"""
+        lines = [f"{self.name} ran {self.count} SQL statements (budget {self.budget})"]
+        for number, statement in enumerate(self.statements, start=1):
+            lines.append(f"  {number}. {' '.join(statement.split())[:200]}")
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[StatementCounter]] = ContextVar("statement_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _current.get()
+    while counter is not None:
+        counter.statements.append(statement)
+        counter = counter.parent
+
+
+def start_counting(name: str, budget: Optional[int] = None) -> StatementCounter:
+    """
+    Count the statements run from here on in this context, until stop_counting.
+
+    The counter follows the context into asyncio tasks and SQLAlchemy's
+    async greenlets, so statements of an async session are attributed to the
+    request or task that awaited them.
+    """
+    counter = StatementCounter(name, budget, parent=_current.get())
+    counter._token = _current.set(counter)
+    return counter
+
+
+def stop_counting(counter: StatementCounter) -> None:
+    if counter._token is not None:
+        _current.reset(counter._token)
+        counter._token = None
+
+
+@contextmanager
+def count_statements(
+    name: str = "block", budget: Optional[int] = None
+) -> Iterator[StatementCounter]:
+    """Count the SQL statements run inside the block"""
+    counter = start_counting(name, budget)
+    try:
+        yield counter
+    finally:
+        stop_counting(counter)
+
+
+@contextmanager
+def statement_budget(budget: int, name: str = "block") -> Iterator[StatementCounter]:
+    """
+    Fail with StatementBudgetExceeded if the block runs more than `budget` statements.
+
+    For tests, to catch N+1 queries and other regressions:
+
+        with statement_budget(3, "summarize_jobs"):
+            await ai_service.summarize_jobs(job_post_ids)
+
+    The check runs when the block completes; a block that raised keeps its
+    own exception.
+    """
+    with count_statements(name, budget) as counter:
+        yield counter
+    if counter.exceeded:
+        raise StatementBudgetExceeded(counter.report())
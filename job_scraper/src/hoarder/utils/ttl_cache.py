@@ -0,0 +1,69 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Collection, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Small in-process LRU cache whose entries also expire after `ttl` seconds.
+
+    Holds at most `max_entries` items, evicting the least recently used.
+    Safe to share between threads. Each process has its own copy, so
+    invalidation only reaches the current process; the TTL bounds how long
+    other processes can serve a stale entry.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """The cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: K, value: V) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_value(self, value: V) -> None:
+        """Drop every key that maps to `value` (a linear scan)"""
+        self.discard_values([value])
+
+    def discard_values(self, values: Collection[V]) -> None:
+        """Drop every key that maps to any of `values` (one linear scan)"""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0] in values]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,63 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only say where a click came from. Anything else is
+# kept: some boards identify the posting in the query (e.g. ?gh_jid=, ?jk=).
+TRACKING_PARAMS = {
+    "gh_src",
+    "lever-source",
+    "lever-origin",
+    "source",
+    "src",
+    "ref",
+    "referrer",
+    "trk",
+    "trackingid",
+    "refid",
+    "gclid",
+    "fbclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a job page URL so variants of the same posting compare equal.
+
+    Lowercases the scheme and host, drops default ports, the fragment,
+    tracking parameters (utm_*, gh_src, ...) and trailing slashes, and sorts
+    the remaining query parameters. The path keeps its case, since some
+    boards' job IDs are case-sensitive.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+
+    host = (parts.hostname or "").rstrip(".")
+    try:
+        port = parts.port
+    except ValueError:  # not a number; leave it for the fetch to reject
+        port = None
+        host = parts.netloc.lower()
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name)
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
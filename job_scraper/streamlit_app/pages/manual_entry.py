@@ -1,8 +1,29 @@
+import asyncio
+from typing import Optional
+
 import streamlit as st
-from src.hoarder.utils.database import get_session
+from src.hoarder.models import JobPost
+from src.hoarder.utils.database import get_async_session_factory
 from src.hoarder.services.job_service import JobService
 
 
+async def _create_job_post(
+    company_name: str,
+    job_title: str,
+    job_description: str,
+    job_url: Optional[str],
+    industry: Optional[str],
+) -> JobPost:
+    async with get_async_session_factory()() as session:
+        return await JobService(session).create_job_post(
+            company_name=company_name,
+            job_title=job_title,
+            job_description=job_description,
+            job_url=job_url,
+            industry=industry,
+        )
+
+
 def show() -> None:
     """Display the manual job entry page"""
     st.title("Manual Job Entry")
@@ -57,15 +78,15 @@ def show() -> None:
                 return
 
             # Save to database
-            session = get_session()
             try:
-                job_service = JobService(session)
-                job_post = job_service.create_job_post(
-                    company_name=company_name,
-                    job_title=job_title,
-                    job_description=job_description,
-                    job_url=job_url if job_url else None,
-                    industry=industry if industry else None,
+                job_post = asyncio.run(
+                    _create_job_post(
+                        company_name=company_name,
+                        job_title=job_title,
+                        job_description=job_description,
+                        job_url=job_url if job_url else None,
+                        industry=industry if industry else None,
+                    )
                 )
 
                 st.success(
@@ -74,8 +95,6 @@ def show() -> None:
 
             except Exception as e:
                 st.error(f"Error saving job posting: {str(e)}")
-            finally:
-                session.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark process-pool HTML extraction over stored job pages.
+
+Usage:
+    python test/scripts/benchmark_bulk_extraction.py [pages] [chunk_size]
+
+Stores `pages` copies of the site fixtures (each made unique, so blobs are
+not deduplicated) in a throwaway SQLite database, then runs
+bulk_extraction.extract_job_pages over all of them with 1, 2, 4 and 8
+worker processes and reports pages/sec and the speedup over one worker.
+Nothing is written back, so only reading and parsing are measured.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+
+from src.hoarder.models import Base
+from src.hoarder.repositories import JobPageRepository
+from src.hoarder.services.bulk_extraction import DEFAULT_CHUNK_SIZE, extract_job_pages
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+
+FIXTURES = project_root / "test" / "fixtures" / "sites"
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+async def seed_pages(count: int) -> None:
+    fixtures = [
+        (f"https://example.com/{path.stem}", path.read_text(encoding="utf-8"))
+        for path in sorted(FIXTURES.glob("*.html"))
+    ]
+    async with get_async_session_factory()() as session:
+        job_page_repo = JobPageRepository(session)
+        for start in range(0, count, 500):
+            await job_page_repo.create_many(
+                [
+                    (f"{url}/{i}", f"{html}<!-- copy {i} -->")
+                    for i in range(start, min(start + 500, count))
+                    for url, html in [fixtures[i % len(fixtures)]]
+                ]
+            )
+
+
+async def extract_all(workers: int, chunk_size: int) -> int:
+    async with get_async_session_factory()() as session:
+        extracted = 0
+        async for chunk in extract_job_pages(session, workers=workers, chunk_size=chunk_size):
+            extracted += len(chunk)
+        return extracted
+
+
+def benchmark_bulk_extraction(count: int, chunk_size: int) -> None:
+    print(f"Extracting {count} pages in chunks of {chunk_size} ({os.cpu_count()} CPUs)\n")
+
+    baseline = None
+    for workers in WORKER_COUNTS:
+        start = time.perf_counter()
+        extracted = asyncio.run(extract_all(workers, chunk_size))
+        elapsed = time.perf_counter() - start
+        assert extracted == count, extracted
+
+        rate = count / elapsed
+        baseline = baseline or rate
+        print(f"{workers} worker(s)  {rate:8.1f} pages/s  {rate / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK_SIZE
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bulk_extraction.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+        asyncio.run(seed_pages(count))
+        asyncio.run(dispose_async_engine())
+        benchmark_bulk_extraction(count, chunk_size)
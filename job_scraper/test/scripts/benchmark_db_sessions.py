@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request latency of POST /job-collection/page.
+
+Usage:
+    python test/scripts/benchmark_db_sessions.py [requests]
+
+Compares the old behaviour (a new async engine built for every request)
+against the shared process-wide engine registry, using a throwaway SQLite
+database so the real job_scraper.db is not touched.
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import AsyncGenerator
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.hoarder.api_server import app
+from src.hoarder.models import Base
+from src.hoarder.utils.database import get_async_session
+from src.hoarder.utils.settings import settings
+
+PAGE_HTML = "<html><body>" + "<div class='job-description'>Lorem ipsum</div>" * 200 + "</body></html>"
+
+
+async def get_async_session_per_request() -> AsyncGenerator[AsyncSession, None]:
+    """The pre-registry dependency: one engine (and pool) per request"""
+    async_engine = create_async_engine(settings.db_url, echo=False)
+    async_session = async_sessionmaker(async_engine, class_=AsyncSession)
+
+    async with async_session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+            await async_engine.dispose()
+
+
+def run(client: TestClient, requests: int) -> list[float]:
+    """POST the sample page `requests` times and return latencies in ms"""
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        response = client.post(
+            "/job-collection/page",
+            json={"url": f"https://example.com/jobs/{i}", "page_html": PAGE_HTML},
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return latencies
+
+
+def report(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<22} mean {statistics.mean(latencies):7.2f} ms   "
+        f"median {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms"
+    )
+
+
+def benchmark_db_sessions(requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+        print(f"Benchmarking {requests} requests against {db_path}\n")
+
+        app.dependency_overrides[get_async_session] = get_async_session_per_request
+        with TestClient(app) as client:
+            before = run(client, requests)
+        app.dependency_overrides.clear()
+
+        with TestClient(app) as client:
+            after = run(client, requests)
+
+        report("engine per request", before)
+        report("shared engine", after)
+        print(
+            f"\nSpeedup (mean): {statistics.mean(before) / statistics.mean(after):.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    benchmark_db_sessions(count)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML parser backends over saved job pages.
+
+Usage:
+    python test/scripts/benchmark_html_parsers.py [limit] [html_dir]
+
+Runs the scraper's extraction (title, og:site_name, description) with every
+installed backend over up to `limit` job_page rows from the configured
+database, or over the *.html files in `html_dir` when given, and reports
+pages/sec per backend plus how many descriptions differ from BeautifulSoup.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.hoarder.extraction import PARSER_BACKENDS, parse_html
+from src.hoarder.repositories import JobPageRepository
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+
+ROUNDS = 3
+
+
+async def load_corpus_from_db(limit: int) -> list[str]:
+    async with get_async_session_factory()() as session:
+        job_page_repo = JobPageRepository(session)
+        corpus = []
+        for job_page in await job_page_repo.get_all(limit=limit):
+            html = await job_page_repo.get_html(job_page.page_id)
+            if html:
+                corpus.append(html)
+    await dispose_async_engine()
+    return corpus
+
+
+def load_corpus_from_dir(html_dir: Path, limit: int) -> list[str]:
+    paths = sorted(html_dir.glob("*.html"))[:limit]
+    return [path.read_text(encoding="utf-8", errors="replace") for path in paths]
+
+
+def extract(html: str, backend: str) -> tuple:
+    """The same lookups scrape_job_page does"""
+    page = parse_html(html, backend)
+    return (
+        page.first_text("h1"),
+        page.first_attribute('meta[property="og:site_name"]', "content"),
+        page.description(),
+    )
+
+
+def benchmark_html_parsers(corpus: list[str]) -> None:
+    size_mb = sum(len(html.encode("utf-8")) for html in corpus) / 1e6
+    print(f"Benchmarking {len(corpus)} pages ({size_mb:.1f} MB), best of {ROUNDS} rounds\n")
+
+    reference = [extract(html, "bs4") for html in corpus]
+    for backend in PARSER_BACKENDS:
+        best = float("inf")
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            results = [extract(html, backend) for html in corpus]
+            best = min(best, time.perf_counter() - start)
+
+        differing = sum(1 for ours, theirs in zip(results, reference) if ours != theirs)
+        print(
+            f"{backend:<12} {len(corpus) / best:8.1f} pages/s  "
+            f"{size_mb / best:6.1f} MB/s  {differing} page(s) differ from bs4"
+        )
+
+
+if __name__ == "__main__":
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    if len(sys.argv) > 2:
+        corpus = load_corpus_from_dir(Path(sys.argv[2]), limit)
+    else:
+        corpus = asyncio.run(load_corpus_from_db(limit))
+
+    if not corpus:
+        print("No job pages found - save some pages or pass a directory of .html files")
+        sys.exit(1)
+    benchmark_html_parsers(corpus)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark write throughput of manual-entry and API ingestion.
+
+Usage:
+    python test/scripts/benchmark_ingestion_writes.py [count]
+
+Compares the old per-repository commit + refresh flow against the
+single-transaction UnitOfWork flow used by JobService.create_job_post
+(manual entry) and JobPageService.create_job_page (API ingestion). Uses a
+throwaway SQLite database; tasks only reach the outbox table, not the broker.
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+
+from src.hoarder.models import Base
+from src.hoarder.repositories import CompanyRepository, JobPageRepository, JobPostRepository
+from src.hoarder.services.job_page_service import JobPageService
+from src.hoarder.services.job_service import JobService
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+
+COMPANIES = [f"Company {i}" for i in range(20)]
+DESCRIPTION = "We are hiring an engineer to build data pipelines. " * 40
+PAGE_HTML = "<html><body>" + "<div class='job-description'>Lorem ipsum</div>" * 200 + "</body></html>"
+
+
+async def job_posts_per_repository_commit(count: int) -> None:
+    """Old manual-entry flow: get_or_create and create each commit and refresh"""
+    async with get_async_session_factory()() as session:
+        company_repo = CompanyRepository(session)
+        job_post_repo = JobPostRepository(session)
+        for i in range(count):
+            company = await company_repo.get_or_create(name=COMPANIES[i % len(COMPANIES)])
+            await job_post_repo.create(
+                company_id=company.id, title=f"Engineer {i}", description=DESCRIPTION
+            )
+
+
+async def job_posts_unit_of_work(count: int) -> None:
+    """New manual-entry flow: one transaction per JobService.create_job_post"""
+    async with get_async_session_factory()() as session:
+        job_service = JobService(session)
+        for i in range(count):
+            await job_service.create_job_post(
+                company_name=COMPANIES[i % len(COMPANIES)],
+                job_title=f"Engineer {i}",
+                job_description=DESCRIPTION,
+            )
+
+
+async def job_pages_per_repository_commit(count: int) -> None:
+    """Old API ingestion flow: JobPageRepository.create commits and refreshes"""
+    async with get_async_session_factory()() as session:
+        job_page_repo = JobPageRepository(session)
+        for i in range(count):
+            await job_page_repo.create(url=f"https://example.com/a/{i}", page_html=PAGE_HTML + str(i))
+
+
+async def job_pages_unit_of_work(count: int) -> None:
+    """New API ingestion flow: JobPageService.create_job_page flushes and commits once"""
+    async with get_async_session_factory()() as session:
+        job_page_service = JobPageService(session)
+        for i in range(count):
+            await job_page_service.create_job_page(
+                url=f"https://example.com/b/{i}", page_html=PAGE_HTML + str(i)
+            )
+
+
+async def timed(label: str, flow, count: int) -> float:
+    start = time.perf_counter()
+    await flow(count)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {count / elapsed:8.1f} writes/s")
+    return elapsed
+
+
+async def benchmark_ingestion_writes(count: int) -> None:
+    print(f"Benchmarking {count} writes per flow\n")
+
+    before = await timed("manual entry, commit per repository", job_posts_per_repository_commit, count)
+    after = await timed("manual entry, unit of work", job_posts_unit_of_work, count)
+    print(f"  speedup: {before / after:.2f}x\n")
+
+    before = await timed("API ingestion, commit + refresh", job_pages_per_repository_commit, count)
+    after = await timed("API ingestion, unit of work", job_pages_unit_of_work, count)
+    print(f"  speedup: {before / after:.2f}x")
+
+    await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+        asyncio.run(benchmark_ingestion_writes(count))
@@ -12,6 +12,7 @@ This script tests the AIService by:
 3. Displaying the results
 """
 
+import asyncio
 import sys
 import os
 from pathlib import Path
@@ -20,12 +21,12 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.hoarder.utils.database import get_session
+from src.hoarder.utils.database import get_async_session_factory
 from src.hoarder.services.ai_service import AIService
-from src.hoarder.repositories import JobPostRepository
+from src.hoarder.repositories import CompanyRepository, JobPostRepository
 
 
-def test_ai_summarization(job_id: int) -> None:
+async def test_ai_summarization(job_id: int) -> None:
     """Test AI summarization for a given job post ID."""
     print(f"\n{'=' * 60}")
     print(f"Testing AI Summarization for Job Post ID: {job_id}")
@@ -45,11 +46,11 @@ def test_ai_summarization(job_id: int) -> None:
         print("Please set ANTHROPIC_API_KEY in your .env file")
         return
 
-    session = get_session()
+    session = get_async_session_factory()()
     try:
         # 1. Verify job exists
         job_post_repo = JobPostRepository(session)
-        job_post = job_post_repo.get_by_id(job_id)
+        job_post = await job_post_repo.get_by_id(job_id, with_description=True)
 
         if not job_post:
             print(f"❌ Error: Job post with ID {job_id} not found")
@@ -57,7 +58,8 @@ def test_ai_summarization(job_id: int) -> None:
 
         print(f"✓ Found job post:")
         print(f"   - Title: {job_post.title}")
-        print(f"   - Company: {job_post.company.name}")
+        company = await CompanyRepository(session).get_by_id(job_post.company_id)
+        print(f"   - Company: {company.name if company else 'Unknown'}")
         print(f"   - Description length: {len(job_post.description)} characters\n")
 
         # 2. Call AIService
@@ -65,7 +67,7 @@ def test_ai_summarization(job_id: int) -> None:
         print("(This may take a few seconds...)\n")
 
         ai_service = AIService(session, provider=provider)
-        summarized_job = ai_service.summarize_job(job_id)
+        summarized_job = await ai_service.summarize_job(job_id)
 
         if not summarized_job:
             print("❌ Error: Failed to summarize job post")
@@ -106,7 +108,7 @@ def test_ai_summarization(job_id: int) -> None:
 
         traceback.print_exc()
     finally:
-        session.close()
+        await session.close()
 
 
 if __name__ == "__main__":
@@ -121,4 +123,4 @@ if __name__ == "__main__":
         print(f"Error: '{sys.argv[1]}' is not a valid integer")
         sys.exit(1)
 
-    test_ai_summarization(job_id)
+    asyncio.run(test_ai_summarization(job_id))
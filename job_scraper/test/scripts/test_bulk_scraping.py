@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent bulk URL scraping against a local stub server.
+
+Usage:
+    python test/scripts/test_bulk_scraping.py [pages]
+
+Starts a threaded HTTP server on 127.0.0.1 that serves the site fixtures
+with a small delay, plus endpoints that fail once with 503, rate-limit
+with 429 + Retry-After (in seconds or as an HTTP date), or always 404, and
+pages without a charset header. Scrapes `pages` job URLs spread over
+two hostnames (127.0.0.1 and localhost) into a throwaway SQLite database
+in batches and checks per-host concurrency caps and delays, retries and
+keep-alive reuse, then prints pages/sec. Also checks that a slow URL source
+doesn't hold up fetches and that fetcher defaults follow the settings.
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, func, select
+
+from src.hoarder.models import Base, JobPage
+from src.hoarder.repositories import JobPageRepository
+from src.hoarder.services.scrape_job_webpage import PageFetcher, scrape_urls
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+
+FIXTURE_HTML = (project_root / "test" / "fixtures" / "sites" / "greenhouse.html").read_text(
+    encoding="utf-8"
+)
+UMLAUT_HTML = (
+    "<html><head><title>Ingenieur für Daten</title></head>"
+    "<body><h1>Ingenieur für Daten</h1></body></html>"
+)
+RESPONSE_DELAY = 0.05  # seconds the stub takes per page
+PER_HOST_CONCURRENCY = 4
+PER_HOST_DELAY = 0.01
+
+
+class StubStats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight: dict[str, int] = defaultdict(int)
+        self.max_in_flight: dict[str, int] = defaultdict(int)
+        self.starts: dict[str, list[float]] = defaultdict(list)
+        self.hits: dict[str, int] = defaultdict(int)
+        self.hit_times: dict[str, list[float]] = defaultdict(list)
+        self.connections: set[tuple[str, int]] = set()
+
+
+stats = StubStats()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is visible
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send(
+        self,
+        status: int,
+        body: str,
+        headers: dict[str, str] = {},
+        encoding: str = "utf-8",
+        content_type: str = "text/html; charset=utf-8",
+    ) -> None:
+        data = body.encode(encoding)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        host = self.headers.get("Host", "").split(":")[0]
+        with stats.lock:
+            stats.in_flight[host] += 1
+            stats.max_in_flight[host] = max(stats.max_in_flight[host], stats.in_flight[host])
+            stats.starts[host].append(time.monotonic())
+            stats.hits[self.path] += 1
+            stats.hit_times[self.path].append(time.monotonic())
+            stats.connections.add(self.client_address)
+            hits = stats.hits[self.path]
+        try:
+            if self.path.startswith("/missing"):
+                self._send(404, "not found")
+            elif self.path.startswith("/flaky") and hits == 1:
+                self._send(503, "try again")
+            elif self.path.startswith("/limited-until") and hits == 1:
+                retry_at = formatdate(time.time() + 2, usegmt=True)
+                self._send(429, "slow down", {"Retry-After": retry_at})
+            elif self.path.startswith("/limited") and hits == 1:
+                self._send(429, "slow down", {"Retry-After": "0.2"})
+            elif self.path.startswith("/no-charset"):
+                self._send(200, UMLAUT_HTML, content_type="text/html")
+            elif self.path.startswith("/meta-charset"):
+                html = UMLAUT_HTML.replace("<head>", '<head><meta charset="windows-1252">')
+                self._send(200, html, encoding="cp1252", content_type="text/html")
+            else:
+                time.sleep(RESPONSE_DELAY)
+                self._send(200, FIXTURE_HTML.replace("</html>", f"<!-- {self.path} --></html>"))
+        finally:
+            with stats.lock:
+                stats.in_flight[host] -= 1
+
+
+async def run_scrape(urls: Iterator[str]) -> list:
+    fetcher = PageFetcher(
+        max_concurrency=16,
+        per_host_concurrency=PER_HOST_CONCURRENCY,
+        per_host_delay=PER_HOST_DELAY,
+        max_retries=2,
+        timeout=5,
+    )
+    async with get_async_session_factory()() as session:
+        with fetcher:
+            results = scrape_urls(urls, session, batch_size=25, fetcher=fetcher)
+            return [result async for result in results]
+
+
+async def get_html(page_id: int) -> str:
+    async with get_async_session_factory()() as session:
+        return await JobPageRepository(session).get_html(page_id)
+
+
+async def count_job_pages() -> int:
+    async with get_async_session_factory()() as session:
+        return (await session.execute(select(func.count()).select_from(JobPage))).scalar_one()
+
+
+def test_bulk_scraping(port: int, pages: int) -> None:
+    job_urls = [
+        f"http://{host}:{port}/job/{i}"
+        for i in range(pages // 2)
+        for host in ("127.0.0.1", "localhost")
+    ]
+    urls = job_urls + [
+        f"http://127.0.0.1:{port}/flaky",
+        f"http://localhost:{port}/limited",
+        f"http://localhost:{port}/limited-until",
+        f"http://127.0.0.1:{port}/missing",
+        f"http://127.0.0.1:{port}/no-charset",
+        f"http://127.0.0.1:{port}/meta-charset",
+        "ftp://example.com/job",
+        job_urls[0],  # duplicate
+    ]
+
+    start = time.perf_counter()
+    results = asyncio.run(run_scrape(iter(urls)))
+    elapsed = time.perf_counter() - start
+
+    by_url = {result.url: result for result in results}
+    assert len(results) == len(urls) - 1, len(results)
+    assert all(by_url[url].page_id for url in job_urls)
+    assert by_url[f"http://127.0.0.1:{port}/flaky"].page_id, by_url
+    assert by_url[f"http://localhost:{port}/limited"].page_id, by_url
+    assert by_url[f"http://127.0.0.1:{port}/missing"].error.startswith("HTTP 404")
+    assert by_url["ftp://example.com/job"].error
+    assert asyncio.run(count_job_pages()) == len(job_urls) + 5
+    print("✓ Pages saved, duplicates fetched once, bad URLs reported")
+
+    for path in ("/no-charset", "/meta-charset"):
+        html = asyncio.run(get_html(by_url[f"http://127.0.0.1:{port}{path}"].page_id))
+        assert "Ingenieur für Daten" in html, html
+    print("✓ Pages without a charset header are decoded from their bytes, not as ISO-8859-1")
+
+    assert stats.hits["/flaky"] == 2 and stats.hits["/limited"] == 2, dict(stats.hits)
+    assert stats.hits["/missing"] == 1, "404s must not be retried"
+    # The date has one-second resolution, so "now + 2s" is 1-2 seconds away
+    first, retry = stats.hit_times["/limited-until"]
+    assert retry - first >= 0.9, retry - first
+    print("✓ 503 and 429 retried (Retry-After in seconds or as a date), 404 not retried")
+
+    for host in ("127.0.0.1", "localhost"):
+        assert stats.max_in_flight[host] <= PER_HOST_CONCURRENCY, dict(stats.max_in_flight)
+        # Individual gaps jitter on arrival; the overall rate must respect the delay
+        starts = sorted(stats.starts[host])
+        span = starts[-1] - starts[0]
+        assert span >= (len(starts) - 1) * PER_HOST_DELAY * 0.9, (span, len(starts))
+    print(
+        f"✓ Per-host limits held (max in flight {dict(stats.max_in_flight)}, "
+        f"{PER_HOST_DELAY}s between requests)"
+    )
+
+    requests_made = sum(stats.hits.values())
+    assert len(stats.connections) < requests_made / 4, (len(stats.connections), requests_made)
+    print(f"✓ Keep-alive: {requests_made} requests over {len(stats.connections)} connections")
+
+    sequential = len(job_urls) * RESPONSE_DELAY
+    print(
+        f"\n{len(results)} URLs in {elapsed:.2f}s ({len(job_urls) / elapsed:.1f} pages/s, "
+        f"~{sequential:.1f}s one at a time)"
+    )
+
+
+def test_slow_url_source(port: int) -> None:
+    def slow_urls() -> Iterator[str]:
+        yield f"http://127.0.0.1:{port}/job/slow-source"
+        time.sleep(0.5)  # e.g. waiting on stdin
+        yield f"http://127.0.0.1:{port}/job/slow-source-2"
+
+    start = time.monotonic()
+    results = asyncio.run(run_scrape(slow_urls()))
+    assert all(result.page_id for result in results) and len(results) == 2, results
+    fetched_at = stats.hit_times["/job/slow-source"][0] - start
+    assert fetched_at < 0.4, f"fetch waited {fetched_at:.2f}s for the next URL"
+    print("✓ Fetches run while the next URL is being read")
+
+
+def test_fetcher_defaults() -> None:
+    max_retries = settings.scrape_max_retries
+    settings.scrape_max_retries = 7
+    try:
+        with PageFetcher(per_host_delay=0, max_retries=None) as fetcher:
+            assert fetcher.max_retries == 7 and fetcher.per_host_delay == 0
+            assert fetcher.max_concurrency == settings.scrape_max_concurrency
+        with PageFetcher(max_retries=0) as fetcher:
+            assert fetcher.max_retries == 0
+    finally:
+        settings.scrape_max_retries = max_retries
+    print("✓ Fetcher defaults are read from the settings when it is created")
+
+
+if __name__ == "__main__":
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "scrape.db"
+            settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+            Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+            test_bulk_scraping(server.server_address[1], pages)
+            test_slow_url_source(server.server_address[1])
+            test_fetcher_defaults()
+            asyncio.run(dispose_async_engine())
+    finally:
+        server.shutdown()
+    print("\nAll bulk scraping tests passed")
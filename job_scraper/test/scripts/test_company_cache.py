@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the company name cache and company upserts.
+
+Usage:
+    python test/scripts/test_company_cache.py
+
+Checks TTLCache expiry and LRU eviction, then resolves company names against
+a throwaway SQLite database: spelling variants share one company, cache hits
+send no SQL, ids from rolled-back transactions are never cached, renames and
+deletes invalidate the cache, and two sessions racing to create the same
+company end up with one row.
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, event, func, select
+
+from src.hoarder.models import Base, Company
+from src.hoarder.repositories import CompanyRepository, UnitOfWork
+from src.hoarder.repositories.company import company_id_cache
+from src.hoarder.utils.database import (
+    dispose_async_engine,
+    get_async_engine,
+    get_async_session_factory,
+)
+from src.hoarder.utils.settings import settings
+from src.hoarder.utils.ttl_cache import TTLCache
+
+
+def test_ttl_cache() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+    print("✓ Least recently used entries are evicted past max_entries")
+
+    time.sleep(0.06)
+    assert cache.get("a") is None and len(cache) == 1
+    print("✓ Entries expire after the TTL")
+
+    cache.put("d", 4)
+    cache.put("e", 4)
+    cache.discard_value(4)
+    assert len(cache) == 0
+    disabled: TTLCache[str, int] = TTLCache(max_entries=0, ttl=60)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None
+    print("✓ discard_value drops every key for a value; max_entries=0 disables caching")
+
+
+@contextmanager
+def count_statements():
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+async def count_companies(session) -> int:
+    return (await session.execute(select(func.count()).select_from(Company))).scalar_one()
+
+
+async def test_company_resolution() -> None:
+    session_factory = get_async_session_factory()
+
+    async with session_factory() as session:
+        async with UnitOfWork(session) as uow:
+            ids = {
+                await uow.companies.get_or_create_id(name)
+                for name in ("Acme Robotics", "  acme   robotics", "ACME ROBOTICS")
+            }
+            assert len(ids) == 1, ids
+            assert "acme robotics" not in company_id_cache._entries
+        (acme_id,) = ids
+        assert company_id_cache.get("acme robotics") == acme_id
+        assert await count_companies(session) == 1
+        print("✓ Case and spacing variants resolve to one company, cached once committed")
+
+    async with session_factory() as session:
+        with count_statements() as statements:
+            assert await CompanyRepository(session).get_or_create_id("Acme Robotics") == acme_id
+        assert statements == [], statements
+        print("✓ Cache hits send no SQL")
+
+    async with session_factory() as session:
+        try:
+            async with UnitOfWork(session) as uow:
+                await uow.companies.get_or_create_id("Rolled Back Inc")
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+        assert company_id_cache.get("rolled back inc") is None
+        assert "company_ids_pending" not in session.info
+        assert await count_companies(session) == 1
+        print("✓ Companies created in a rolled-back transaction are never cached")
+
+    async with session_factory() as session:
+        companies = CompanyRepository(session)
+        await companies.update(acme_id, name="Acme Automation")
+        assert company_id_cache.get("acme robotics") is None
+        assert await companies.get_or_create_id("acme automation") == acme_id
+        robotics_id = await companies.get_or_create_id("Acme Robotics")
+        assert robotics_id != acme_id
+
+        assert await companies.delete(robotics_id)
+        assert company_id_cache.get("acme robotics") is None
+        recreated_id = await companies.get_or_create_id("Acme Robotics")
+        assert await companies.get_by_id(recreated_id) is not None
+        print("✓ Renames and deletes invalidate cached names")
+
+
+async def test_concurrent_creation() -> None:
+    """Two sessions miss the cache and race to create the same company"""
+    session_factory = get_async_session_factory()
+    company_id_cache.clear()
+
+    async with session_factory() as first, session_factory() as second:
+        first_uow = UnitOfWork(first)
+        first_id = await first_uow.companies.get_or_create_id("Globex")  # not committed yet
+
+        # Blocks on the first session's write lock, then hits the conflict
+        racing = asyncio.create_task(CompanyRepository(second).get_or_create_id("GLOBEX"))
+        await asyncio.sleep(0.1)
+        await first.commit()
+        second_id = await racing
+
+        assert first_id == second_id, (first_id, second_id)
+        rows = await second.execute(select(Company).filter(Company.normalized_name == "globex"))
+        assert len(rows.scalars().all()) == 1
+        print("✓ Concurrent creation of the same company yields one row")
+
+
+if __name__ == "__main__":
+    test_ttl_cache()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "companies.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+        asyncio.run(test_company_resolution())
+        asyncio.run(test_concurrent_creation())
+        asyncio.run(dispose_async_engine())
+    print("\nAll company cache tests passed")
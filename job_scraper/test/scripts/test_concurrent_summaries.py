@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent job summarization with a stand-in LLM.
+
+Usage:
+    python test/scripts/test_concurrent_summaries.py
+
+Seeds a throwaway SQLite database with job posts and runs
+AIService.summarize_jobs against a local stand-in for the chat model (no API
+calls). One job post is summarized by another worker while its LLM request
+is in flight, so saving it fails. Checks that the other summaries are stored
+and still readable afterwards (a failed write must not expire them), and
+that a rerun finds the saved summaries instead of calling the LLM again.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, func, select
+
+from src.hoarder.models import Base, JobPost, SummarizedJob
+from src.hoarder.repositories import UnitOfWork
+from src.hoarder.services.ai_service import AIService
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+
+TITLES = ["Backend Engineer", "Data Engineer", "Broken Engineer", "Site Reliability Engineer"]
+
+
+class StandInLLM:
+    """Answers every prompt with a summary; "Broken" posts are saved by another worker first"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        user_prompt = messages[-1].content
+        title = user_prompt.splitlines()[0].removeprefix("Job Title: ")
+        if title.startswith("Broken"):
+            await save_elsewhere(title)
+        return SimpleNamespace(
+            content=json.dumps(
+                {
+                    "summary": f"Summary of {title}",
+                    "technical_skills": ["Python"],
+                    "seniority_level": "Senior",
+                    "estimated_salary_min": None,
+                    "estimated_salary_max": None,
+                }
+            )
+        )
+
+
+async def save_elsewhere(title: str) -> None:
+    """Store a summary of the post with this title from a separate session"""
+    async with get_async_session_factory()() as session:
+        job_post_id = (
+            await session.execute(select(JobPost.id).filter(JobPost.title == title))
+        ).scalar_one()
+        async with UnitOfWork(session) as uow:
+            await uow.summarized_jobs.create(job_post_id, "Saved elsewhere", "[]", "Senior")
+
+
+async def seed() -> list[int]:
+    async with get_async_session_factory()() as session:
+        async with UnitOfWork(session) as uow:
+            company_id = await uow.companies.get_or_create_id("Acme")
+            job_posts = [
+                await uow.job_posts.create(company_id, title, f"Build things as a {title}")
+                for title in TITLES
+            ]
+        return [job_post.id for job_post in job_posts]
+
+
+async def test_failed_save_keeps_other_results(job_post_ids: list[int]) -> None:
+    llm = StandInLLM()
+    async with get_async_session_factory()() as session:
+        ai_service = AIService(session)
+        ai_service.llm = llm
+        results = await ai_service.summarize_jobs(job_post_ids)
+
+        broken_id = job_post_ids[TITLES.index("Broken Engineer")]
+        assert results[broken_id] is None, results
+        # Attribute access must not need a refresh (MissingGreenlet under AsyncSession)
+        summaries = {
+            job_post_id: summary.summary
+            for job_post_id, summary in results.items()
+            if summary is not None
+        }
+        assert len(summaries) == len(TITLES) - 1, summaries
+        assert summaries[job_post_ids[0]] == "Summary of Backend Engineer", summaries
+        count = select(func.count()).select_from(SummarizedJob)
+        stored = (await session.execute(count)).scalar_one()
+        assert stored == len(TITLES), stored  # including the one saved elsewhere
+        assert llm.calls == len(TITLES), llm.calls
+        print("✓ A summary that fails to save leaves the others stored and readable")
+
+    llm = StandInLLM()
+    async with get_async_session_factory()() as session:
+        ai_service = AIService(session)
+        ai_service.llm = llm
+        results = await ai_service.summarize_jobs(job_post_ids[:2])
+        assert all(results.values()) and llm.calls == 0, (results, llm.calls)
+        print("✓ Job posts with a saved summary are not sent to the LLM again")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")  # the stand-in makes no API calls
+    settings.summary_cache_use_redis = False
+    settings.llm_rate_limit_use_redis = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "summaries.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+        job_post_ids = asyncio.run(seed())
+        asyncio.run(test_failed_save_keeps_other_results(job_post_ids))
+        asyncio.run(dispose_async_engine())
+    print("\nAll concurrent summary tests passed")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Test script for conditional re-fetching and change detection of job pages.
+
+Usage:
+    python test/scripts/test_conditional_refetch.py
+
+Starts a local stub server with job pages that send an ETag or a
+Last-Modified header (and answer matching conditional requests with 304),
+one whose markup churns on every request while its job fields stay the
+same, one whose title changes between fetches, and one that answers every
+request with 304. Scrapes them twice into a throwaway SQLite database and
+checks that only the real change produces a new capture and a new
+promotion task, that unchanged pages' validators are written in one
+UPDATE, and that a 304 to a first, unconditional fetch is an error.
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import uuid
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, func, select
+
+from src.hoarder.models import Base, JobPage, TaskOutbox
+from src.hoarder.services.job_page_service import JobPageService
+from src.hoarder.services.scrape_job_webpage import (
+    PageFetcher,
+    ScrapeResult,
+    scrape_and_save_job_webpage,
+    scrape_urls,
+)
+from src.hoarder.services.scraper import page_content_hash
+from src.hoarder.tasks.job_page_promotion import promote_job_page_task
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+from src.hoarder.utils.statement_budget import count_statements
+
+FIXTURE_HTML = (project_root / "test" / "fixtures" / "sites" / "greenhouse.html").read_text(
+    encoding="utf-8"
+)
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Jul 2026 09:00:00 GMT"
+
+
+class StubStats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.hits: dict[str, int] = defaultdict(int)
+        self.not_modified: dict[str, int] = defaultdict(int)
+
+
+stats = StubStats()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send(self, status: int, body: str, headers: dict[str, str] = {}) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        with stats.lock:
+            stats.hits[self.path] += 1
+            hits = stats.hits[self.path]
+
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == ETAG:
+                stats.not_modified[self.path] += 1
+                self._send(304, "", {"ETag": ETAG})
+            else:
+                self._send(200, FIXTURE_HTML, {"ETag": ETAG})
+        elif self.path == "/last-modified":
+            if self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                stats.not_modified[self.path] += 1
+                self._send(304, "", {"Last-Modified": LAST_MODIFIED})
+            else:
+                self._send(200, FIXTURE_HTML, {"Last-Modified": LAST_MODIFIED})
+        elif self.path == "/churn":
+            # A fresh CSRF token and cache-busting script on every response
+            token = uuid.uuid4().hex
+            page_html = FIXTURE_HTML.replace(
+                "</body>",
+                f'<input type="hidden" name="csrf" value="{token}">'
+                f'<script src="/analytics.js?v={token}"></script></body>',
+            )
+            self._send(200, page_html, {"ETag": f'"{token}"'})
+        elif self.path == "/always-304":
+            self._send(304, "")
+        elif self.path == "/changing":
+            title = "Senior Platform Engineer" if hits == 1 else "Staff Platform Engineer"
+            self._send(200, FIXTURE_HTML.replace("Senior Platform Engineer", title))
+        else:
+            self._send(404, "not found")
+
+
+async def run_scrape(urls: list[str]) -> dict[str, ScrapeResult]:
+    fetcher = PageFetcher(per_host_concurrency=4, per_host_delay=0, max_retries=0, timeout=5)
+    async with get_async_session_factory()() as session:
+        with fetcher:
+            results = scrape_urls(urls, session, fetcher=fetcher)
+            return {result.url: result async for result in results}
+
+
+async def count_rows() -> tuple[int, int]:
+    async with get_async_session_factory()() as session:
+        pages = (await session.execute(select(func.count()).select_from(JobPage))).scalar_one()
+        promotions = (
+            await session.execute(
+                select(func.count())
+                .select_from(TaskOutbox)
+                .filter(TaskOutbox.task_name == promote_job_page_task.name)
+            )
+        ).scalar_one()
+    return pages, promotions
+
+
+async def get_latest(url: str) -> JobPage:
+    async with get_async_session_factory()() as session:
+        return await JobPageService(session).get_job_page_by_url(url)
+
+
+def test_content_hash() -> None:
+    url = "https://boards.greenhouse.io/acmerobotics/jobs/4012345"
+    churned = FIXTURE_HTML.replace("</body>", "<script>var csrf = 'abc123';</script></body>")
+    changed = FIXTURE_HTML.replace("Senior Platform Engineer", "Staff Platform Engineer")
+    assert page_content_hash(url, FIXTURE_HTML) == page_content_hash(url, churned)
+    assert page_content_hash(url, FIXTURE_HTML) != page_content_hash(url, changed)
+    print("✓ Content hash ignores markup churn and tracks job fields")
+
+
+def test_conditional_refetch(port: int) -> None:
+    urls = [
+        f"http://127.0.0.1:{port}/{path}"
+        for path in ("etag", "last-modified", "churn", "changing")
+    ]
+    etag_url, last_modified_url, churn_url, changing_url = urls
+
+    first = asyncio.run(run_scrape(urls))
+    assert all(result.page_id and not result.unchanged for result in first.values()), first
+    assert asyncio.run(count_rows()) == (4, 4)
+    page = asyncio.run(get_latest(etag_url))
+    assert page.etag == ETAG and page.content_sha256, page
+    assert asyncio.run(get_latest(last_modified_url)).last_modified == LAST_MODIFIED
+    print("✓ First fetch stores pages with their validators and content hash")
+
+    churn_etag = asyncio.run(get_latest(churn_url)).etag
+    with count_statements("second scrape") as counter:
+        second = asyncio.run(run_scrape(urls))
+    for url in (etag_url, last_modified_url, churn_url):
+        assert second[url].unchanged and second[url].page_id == first[url].page_id, second[url]
+    assert stats.not_modified == {"/etag": 1, "/last-modified": 1}, dict(stats.not_modified)
+    print("✓ Re-fetch sends If-None-Match / If-Modified-Since and honours 304")
+
+    assert asyncio.run(get_latest(churn_url)).etag != churn_etag
+    validator_updates = [statement for statement in counter.statements if "SET etag" in statement]
+    assert len(validator_updates) == 1, counter.report()
+    print("✓ Markup-only changes are unchanged; their new validators are kept, in one UPDATE")
+
+    assert not second[changing_url].unchanged
+    assert second[changing_url].page_id != first[changing_url].page_id
+    assert asyncio.run(count_rows()) == (5, 5)
+    print("✓ Only the real change is saved and queued for promotion")
+
+    bogus_url = f"http://127.0.0.1:{port}/always-304"
+    bogus = asyncio.run(run_scrape([bogus_url]))[bogus_url]
+    assert bogus.page_id is None and "304" in bogus.error, bogus
+    assert asyncio.run(count_rows()) == (5, 5)
+    print("✓ A 304 to a fetch with no earlier capture is reported as an error")
+
+
+async def scrape_blank_url() -> None:
+    async with get_async_session_factory()() as session:
+        assert await scrape_and_save_job_webpage("   ", session) is None
+
+
+def test_blank_url() -> None:
+    asyncio.run(scrape_blank_url())
+    print("✓ A blank URL is skipped without an error")
+
+
+if __name__ == "__main__":
+    test_content_hash()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "refetch.db"
+            settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+            Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+            test_conditional_refetch(server.server_address[1])
+            test_blank_url()
+            asyncio.run(dispose_async_engine())
+    finally:
+        server.shutdown()
+    print("\nAll conditional re-fetch tests passed")
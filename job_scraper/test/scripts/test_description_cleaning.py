@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for boilerplate stripping of job descriptions.
+
+Usage:
+    python test/scripts/test_description_cleaning.py
+
+Runs a job page with a cookie banner, nav menu, share buttons and footer
+through the extraction stage, with every installed parser backend, and
+checks that only the posting is left.
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.hoarder.extraction import (
+    PARSER_BACKENDS,
+    clean_description,
+    clean_text,
+    extract_description,
+)
+from src.hoarder.utils.rate_limiter import estimate_tokens
+
+PAGE_HTML = """
+<html>
+<head><title>Data Engineer</title><script>window.analytics = {};</script></head>
+<body class="has-sidebar">
+  <div id="cookie-banner">We use cookies to improve your experience. <button>Accept all</button></div>
+  <nav><a href="/">Home</a><a href="/jobs">Jobs</a><a href="/login">Sign in</a></nav>
+  <div class="site-menu"><ul><li>Careers</li><li>Teams</li><li>Locations</li></ul></div>
+  <main>
+    <h1>Data Engineer</h1>
+    <div class="share-buttons">Share this job</div>
+    <div class="job-description">
+      <p>We are looking for a   Data Engineer to build our   ingestion pipelines.</p>
+      <ul>
+        <li>5+ years of Python</li>
+        <li>Experience with Airflow and dbt</li>
+      </ul>
+      <p>Apply now</p>
+    </div>
+    <aside class="related-jobs"><h2>Similar jobs</h2><p>Analytics Engineer</p></aside>
+  </main>
+  <footer>Privacy Policy | Terms of Use | © 2025 Example Corp. All rights reserved.</footer>
+</body>
+</html>
+"""
+
+
+def test_html_description(backend: Optional[str] = None) -> None:
+    # Without a backend, through clean_description as job posts are cleaned
+    if backend is None:
+        cleaned = clean_description(PAGE_HTML)
+    else:
+        cleaned = extract_description(PAGE_HTML, backend)
+
+    assert "Data Engineer to build our ingestion pipelines." in cleaned
+    assert "5+ years of Python" in cleaned
+    assert "Experience with Airflow and dbt" in cleaned
+    for boilerplate in ("cookies", "Sign in", "Careers", "Share this job", "Apply now",
+                        "Similar jobs", "Privacy Policy", "All rights reserved", "analytics"):
+        assert boilerplate not in cleaned, f"boilerplate left in description: {boilerplate!r}"
+
+    before, after = estimate_tokens(PAGE_HTML), estimate_tokens(cleaned)
+    label = backend or "clean_description"
+    print(f"✓ HTML description ({label}): {before} -> {after} tokens ({before - after} saved)")
+
+
+def test_plain_text_description() -> None:
+    text = "Skip to content\n\n  Senior   Backend Engineer  \nGo and Postgres\nGo and Postgres\nApply now!\n"
+    cleaned = clean_text(text)
+
+    assert cleaned == "Senior Backend Engineer\nGo and Postgres", cleaned
+    assert clean_description(text) == cleaned
+    print("✓ Plain text description")
+
+
+if __name__ == "__main__":
+    test_html_description()
+    for backend in PARSER_BACKENDS:
+        test_html_description(backend)
+    test_plain_text_description()
+    print("\nAll description cleaning tests passed")
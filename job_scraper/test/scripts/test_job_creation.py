@@ -3,21 +3,23 @@
 Test script to verify end-to-end job creation with Celery queueing.
 """
 
-from src.hoarder.utils.database import get_session
+import asyncio
+
+from src.hoarder.utils.database import get_async_session_factory
 from src.hoarder.services.job_service import JobService
 
 
-def test_job_creation():
+async def test_job_creation():
     """Test creating a job post and queueing it for processing"""
     print("Testing job creation with Celery queue...")
     print("=" * 50)
 
-    session = get_session()
+    session = get_async_session_factory()()
     try:
         job_service = JobService(session)
 
         print("\n1. Creating test job post...")
-        job_post = job_service.create_job_post(
+        job_post = await job_service.create_job_post(
             company_name="Test Company",
             job_title="Test Software Engineer",
             job_description="This is a test job description for testing purposes.",
@@ -52,8 +54,8 @@ def test_job_creation():
         return None
 
     finally:
-        session.close()
+        await session.close()
 
 
 if __name__ == "__main__":
-    test_job_creation()
+    asyncio.run(test_job_creation())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for promoting saved job pages to job posts.
+
+Usage:
+    python test/scripts/test_job_page_promotion.py
+
+Saves the site fixtures as job pages in a throwaway SQLite database, runs
+the chunked promotion backfill, and checks that each page becomes one job
+post linked to it, that the high-water mark makes reruns skip finished
+pages, and that saving a page queues its promotion. A concurrent duplicate
+is reported as already promoted, while any other constraint failure is
+raised. Runs once with in-process extraction and once with a process pool.
+Tasks only reach the outbox table, not the broker.
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import IntegrityError
+
+from src.hoarder.models import Base, JobPost, TaskOutbox
+from src.hoarder.repositories import PipelineCheckpointRepository
+from src.hoarder.services.bulk_extraction import ExtractedPage, extract_page
+from src.hoarder.services.job_page_promotion import PROMOTION_CHECKPOINT, JobPagePromotionService
+from src.hoarder.services.job_page_service import JobPageService
+from src.hoarder.services.scraper import JobData
+from src.hoarder.tasks.job_page_promotion import promote_job_page_task
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+
+FIXTURES = project_root / "test" / "fixtures" / "sites"
+EMPTY_PAGE = "<html><body><nav><a>Home</a></nav></body></html>"
+
+
+def load_pages() -> list[tuple[str, str, dict]]:
+    expected = json.loads((FIXTURES / "expected.json").read_text(encoding="utf-8"))
+    return [
+        (case["url"], (FIXTURES / f"{name}.html").read_text(encoding="utf-8"), case)
+        for name, case in expected.items()
+    ]
+
+
+async def test_job_page_promotion(workers: int) -> None:
+    print(f"Promotion with {workers} extraction worker(s)")
+    pages = load_pages()
+
+    async with get_async_session_factory()() as session:
+        job_page_service = JobPageService(session)
+        results = await job_page_service.create_job_pages([(url, html) for url, html, _ in pages])
+        empty_page, _ = await job_page_service.create_job_page(
+            "https://example.com/empty", EMPTY_PAGE
+        )
+        page_ids = [result.page_id for result in results]
+
+        queued = await session.execute(
+            select(TaskOutbox.args).filter(TaskOutbox.task_name == promote_job_page_task.name)
+        )
+        assert sorted(json.loads(args)[0] for args in queued.scalars()) == page_ids + [empty_page.page_id]
+        print("✓ Saved pages are queued for promotion")
+
+        promotion_service = JobPagePromotionService(session)
+        first_run = [
+            result
+            async for result in promotion_service.promote_job_pages(batch_size=3, limit=4, workers=workers)
+        ]
+        assert [result.page_id for result in first_run] == page_ids[:4], first_run
+        assert await PipelineCheckpointRepository(session).get(PROMOTION_CHECKPOINT) == page_ids[3]
+        print("✓ Limited run stops at the limit and records the high-water mark")
+
+        second_run = [
+            result
+            async for result in promotion_service.promote_job_pages(batch_size=3, workers=workers)
+        ]
+        assert [result.page_id for result in second_run] == page_ids[4:] + [empty_page.page_id]
+        assert second_run[-1].error == "no job posting found on page", second_run[-1]
+        print("✓ Rerun resumes after the high-water mark")
+
+        for (url, _, case), page_id in zip(pages, page_ids):
+            job_post = (
+                await session.execute(select(JobPost).filter(JobPost.job_page_id == page_id))
+            ).scalar_one()
+            assert job_post.title == case["title"], (url, job_post.title)
+            assert job_post.url == url
+        print("✓ Every fixture page became one linked job post")
+
+        rerun = await promotion_service.promote_job_page(page_ids[0])
+        assert rerun.job_post_id is None and rerun.error == "already promoted", rerun
+        assert [result async for result in promotion_service.promote_job_pages()] == []
+        count = (await session.execute(select(func.count()).select_from(JobPost))).scalar_one()
+        assert count == len(pages), count
+        print("✓ Promotion is idempotent")
+
+        # The insert itself, as when another worker wins the race after the check
+        url, html, _ = pages[0]
+        duplicate = await promotion_service._save(extract_page(page_ids[0], url, html))
+        assert duplicate.error == "already promoted", duplicate
+
+        # A NULL title violates a constraint other than the job_page_id index
+        chunk = []
+        for title in ("Engineer", None):
+            url = f"https://example.com/{title}"
+            job_page, _ = await job_page_service.create_job_page(url, html)
+            job_data = JobData("Acme", title, "Build it.")
+            chunk.append(ExtractedPage(job_page.page_id, url, job_data, None))
+        try:
+            await promotion_service._save_chunk(chunk)
+        except IntegrityError:
+            pass
+        else:
+            raise AssertionError("a failed insert was reported as already promoted")
+        promoted = await promotion_service.job_post_repo.get_promoted_page_ids(
+            [page.page_id for page in chunk]
+        )
+        assert set(promoted) == {chunk[0].page_id}, promoted
+        print("✓ Only a duplicate job post counts as already promoted, other failures raise\n")
+
+
+if __name__ == "__main__":
+    for workers in (1, 2):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "promotion.db"
+            settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+            Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+            asyncio.run(test_job_page_promotion(workers))
+            asyncio.run(dispose_async_engine())
+    print("All job page promotion tests passed")
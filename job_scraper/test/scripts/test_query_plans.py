@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression tests for the repositories.
+
+Usage:
+    python test/scripts/test_query_plans.py [-v]
+
+Seeds a throwaway SQLite database, calls every repository method while
+recording the SQL it sends, and runs EXPLAIN QUERY PLAN on each SELECT,
+UPDATE and DELETE. Fails if a query scans a whole table without an index,
+unless the case lists that table as an expected scan (with the reason next
+to it). -v prints every plan.
+"""
+
+import asyncio
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, NamedTuple
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import zstandard
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.hoarder.models import Base, Company, JobPage, JobPost, PageBlob, SummarizedJob
+from src.hoarder.repositories import (
+    CompanyRepository,
+    CompressionDictionaryRepository,
+    JobPageRepository,
+    JobPostRepository,
+    PageBlobRepository,
+    PipelineCheckpointRepository,
+    SummarizedJobRepository,
+    SummaryCacheRepository,
+    TaskOutboxRepository,
+)
+from src.hoarder.utils.database import (
+    dispose_async_engine,
+    get_async_engine,
+    get_async_session_factory,
+)
+from src.hoarder.utils.settings import settings
+from src.hoarder.utils.urls import canonicalize_url
+
+COMPANIES = 200
+JOB_POSTS = 2000
+PAGE_DATA = zstandard.ZstdCompressor().compress(b"<p/>")
+
+# "SEARCH job_post ..." is an index lookup. "SCAN job_post" reads the whole
+# table, "SCAN job_post USING [COVERING] INDEX ..." the whole of an index;
+# both cost O(rows). Constant rows and subquery results don't count.
+FULL_SCAN = re.compile(r"\bSCAN (?!CONSTANT\b)([A-Za-z_]\w*)")
+EXPLAINED = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+class PlanCase(NamedTuple):
+    name: str
+    call: Callable[[AsyncSession], Awaitable[Any]]
+    allowed_scans: frozenset[str] = frozenset()
+
+
+async def consume(rows) -> list:
+    return [row async for row in rows]
+
+
+CASES = [
+    # company
+    PlanCase("CompanyRepository.create", lambda s: CompanyRepository(s).create("Initech")),
+    PlanCase("CompanyRepository.get_by_id", lambda s: CompanyRepository(s).get_by_id(7)),
+    PlanCase("CompanyRepository.get_by_ids", lambda s: CompanyRepository(s).get_by_ids([1, 2, 3])),
+    PlanCase(
+        "CompanyRepository.get_by_name",
+        lambda s: CompanyRepository(s).get_by_name("ACME 42"),
+    ),
+    PlanCase(
+        "CompanyRepository.get_or_create_id",
+        lambda s: CompanyRepository(s).get_or_create_id("acme  43"),
+    ),
+    PlanCase(
+        "CompanyRepository.get_or_create", lambda s: CompanyRepository(s).get_or_create("New Co")
+    ),
+    PlanCase(
+        "CompanyRepository.get_all", lambda s: CompanyRepository(s).get_all(after_id=50, limit=20)
+    ),
+    PlanCase(
+        "CompanyRepository.get_all(with_job_posts)",
+        lambda s: CompanyRepository(s).get_all(after_id=50, limit=20, with_job_posts=True),
+    ),
+    PlanCase(
+        "CompanyRepository.update",
+        lambda s: CompanyRepository(s).update(7, industry="Robotics"),
+    ),
+    PlanCase("CompanyRepository.delete", lambda s: CompanyRepository(s).delete(COMPANIES + 1)),
+    PlanCase(
+        "CompanyRepository.delete_many", lambda s: CompanyRepository(s).delete_many([7, 8])
+    ),
+    # job_post
+    PlanCase(
+        "JobPostRepository.create",
+        lambda s: JobPostRepository(s).create(company_id=7, title="SRE", description="Keep it up"),
+    ),
+    PlanCase("JobPostRepository.get_by_id", lambda s: JobPostRepository(s).get_by_id(9, True)),
+    PlanCase("JobPostRepository.get_by_ids", lambda s: JobPostRepository(s).get_by_ids([4, 5, 6])),
+    PlanCase(
+        "JobPostRepository.get_unsummarized_ids",
+        lambda s: JobPostRepository(s).get_unsummarized_ids(50),
+        # Anti-join walking job_post in id order; stops after `limit` rows
+        frozenset({"job_post"}),
+    ),
+    PlanCase(
+        "JobPostRepository.get_promoted_page_ids",
+        lambda s: JobPostRepository(s).get_promoted_page_ids([1, 2, 3]),
+    ),
+    PlanCase(
+        "JobPostRepository.get_description",
+        lambda s: JobPostRepository(s).get_description(9),
+    ),
+    PlanCase(
+        "JobPostRepository.get_all", lambda s: JobPostRepository(s).get_all(after_id=100, limit=50)
+    ),
+    PlanCase(
+        "JobPostRepository.get_all(with_company)",
+        lambda s: JobPostRepository(s).get_all(after_id=100, limit=50, with_company=True),
+    ),
+    PlanCase(
+        "JobPostRepository.get_without_clean_description",
+        lambda s: JobPostRepository(s).get_without_clean_description(after_id=100, limit=50),
+        # One-off backfill; walks by primary key from after_id until `limit` matches
+        frozenset({"job_post"}),
+    ),
+    PlanCase(
+        "JobPostRepository.get_by_company_id", lambda s: JobPostRepository(s).get_by_company_id(7)
+    ),
+    PlanCase("JobPostRepository.update", lambda s: JobPostRepository(s).update(9, title="Staff")),
+    PlanCase(
+        "JobPostRepository.update_clean_descriptions",
+        lambda s: JobPostRepository(s).update_clean_descriptions({11: "Build", 12: "Ship"}),
+    ),
+    PlanCase("JobPostRepository.delete", lambda s: JobPostRepository(s).delete(JOB_POSTS - 1)),
+    PlanCase(
+        "JobPostRepository.delete_many", lambda s: JobPostRepository(s).delete_many([20, 30])
+    ),
+    # job_page / page_blob
+    PlanCase(
+        "JobPageRepository.create",
+        lambda s: JobPageRepository(s).create(
+            "https://jobs.example.com/one", "<p>one</p>", content_sha256="c1x"
+        ),
+    ),
+    PlanCase("JobPageRepository.get_by_id", lambda s: JobPageRepository(s).get_by_id(3)),
+    PlanCase(
+        "JobPageRepository.get_by_url",
+        lambda s: JobPageRepository(s).get_by_url("https://jobs.example.com/3?utm_source=x"),
+    ),
+    PlanCase(
+        "JobPageRepository.get_capture",
+        lambda s: JobPageRepository(s).get_capture("https://jobs.example.com/3", "c3"),
+    ),
+    PlanCase(
+        "JobPageRepository.get_capture_ids",
+        lambda s: JobPageRepository(s).get_capture_ids(
+            [("https://jobs.example.com/3", "c3"), ("https://jobs.example.com/4", "c4")]
+        ),
+    ),
+    PlanCase(
+        "JobPageRepository.update_validators",
+        lambda s: JobPageRepository(s).update_validators({3: ('"v2"', None)}),
+    ),
+    PlanCase("JobPageRepository.get_html", lambda s: JobPageRepository(s).get_html(3)),
+    PlanCase(
+        "JobPageRepository.get_compressed",
+        lambda s: JobPageRepository(s).get_compressed(after_id=10, limit=20),
+    ),
+    PlanCase(
+        "JobPageRepository.get_all", lambda s: JobPageRepository(s).get_all(after_id=10, limit=20)
+    ),
+    PlanCase(
+        "JobPageRepository.count",
+        lambda s: JobPageRepository(s).count(),
+        # Counting every row; SQLite walks the smallest index
+        frozenset({"job_page"}),
+    ),
+    PlanCase(
+        "JobPageRepository.stream_all",
+        lambda s: consume(JobPageRepository(s).stream_all(after_id=JOB_POSTS - 20)),
+    ),
+    PlanCase(
+        "JobPageRepository.create_many",
+        lambda s: JobPageRepository(s).create_many(
+            [("https://jobs.example.com/new", "<p>new</p>")]
+        ),
+    ),
+    PlanCase(
+        "JobPageRepository.update",
+        lambda s: JobPageRepository(s).update(5, page_html="<p>changed</p>", content_sha256="x5"),
+    ),
+    PlanCase("JobPageRepository.delete", lambda s: JobPageRepository(s).delete(6)),
+    PlanCase("JobPageRepository.delete_many", lambda s: JobPageRepository(s).delete_many([7, 8])),
+    PlanCase(
+        "JobPageRepository.delete_created_before",
+        lambda s: JobPageRepository(s).delete_created_before(datetime(2000, 1, 1)),
+    ),
+    PlanCase("PageBlobRepository.get_html", lambda s: PageBlobRepository(s).get_html("blob-3")),
+    PlanCase(
+        "PageBlobRepository.get_sample",
+        lambda s: PageBlobRepository(s).get_sample(10),
+        # Random sample for dictionary training, run by hand
+        frozenset({"page_blob"}),
+    ),
+    PlanCase(
+        "PageBlobRepository.store_many",
+        lambda s: PageBlobRepository(s).store_many(["<p>a</p>", "<p>b</p>"]),
+    ),
+    PlanCase(
+        "CompressionDictionaryRepository.get_by_id",
+        lambda s: CompressionDictionaryRepository(s).get_by_id(1),
+    ),
+    PlanCase(
+        "CompressionDictionaryRepository.get_all_data",
+        lambda s: CompressionDictionaryRepository(s).get_all_data(),
+        # Every dictionary, shipped to extraction workers; a handful of rows
+        frozenset({"compression_dictionary"}),
+    ),
+    PlanCase(
+        "CompressionDictionaryRepository.get_latest_id",
+        lambda s: CompressionDictionaryRepository(s).get_latest_id(),
+    ),
+    # summarized_job
+    PlanCase(
+        "SummarizedJobRepository.create",
+        lambda s: SummarizedJobRepository(s).create(1, "Builds things", "[]", "Mid"),
+    ),
+    PlanCase(
+        "SummarizedJobRepository.get_by_id",
+        lambda s: SummarizedJobRepository(s).get_by_id(4),
+    ),
+    PlanCase(
+        "SummarizedJobRepository.get_by_job_post_id",
+        lambda s: SummarizedJobRepository(s).get_by_job_post_id(11),
+    ),
+    PlanCase(
+        "SummarizedJobRepository.get_by_job_post_ids",
+        lambda s: SummarizedJobRepository(s).get_by_job_post_ids([11, 12]),
+    ),
+    PlanCase(
+        "SummarizedJobRepository.get_all",
+        lambda s: SummarizedJobRepository(s).get_all(after_id=5, limit=10),
+    ),
+    PlanCase(
+        "SummarizedJobRepository.get_all(with_job_post)",
+        lambda s: SummarizedJobRepository(s).get_all(after_id=5, limit=10, with_job_post=True),
+    ),
+    PlanCase(
+        "SummarizedJobRepository.update",
+        lambda s: SummarizedJobRepository(s).update(2, seniority_level="Staff"),
+    ),
+    PlanCase("SummarizedJobRepository.delete", lambda s: SummarizedJobRepository(s).delete(3)),
+    PlanCase(
+        "SummarizedJobRepository.delete_many",
+        lambda s: SummarizedJobRepository(s).delete_many([4, 5]),
+    ),
+    # summary cache, outbox, checkpoints
+    PlanCase(
+        "SummaryCacheRepository.get",
+        lambda s: SummaryCacheRepository(s).get("key-1", datetime.now() - timedelta(days=30)),
+    ),
+    PlanCase(
+        "SummaryCacheRepository.put",
+        lambda s: SummaryCacheRepository(s).put("key-new", "gpt", "v1", "{}"),
+    ),
+    PlanCase(
+        "SummaryCacheRepository.evict",
+        lambda s: SummaryCacheRepository(s).evict(datetime.now() - timedelta(days=30), 1000),
+        # Size check counts the cache, which eviction keeps under its max_entries
+        frozenset({"summary_cache"}),
+    ),
+    PlanCase(
+        "SummaryCacheRepository.count",
+        lambda s: SummaryCacheRepository(s).count(),
+        # Counting every row, for stats
+        frozenset({"summary_cache"}),
+    ),
+    PlanCase("TaskOutboxRepository.add", lambda s: TaskOutboxRepository(s).add("noop", [1])),
+    PlanCase(
+        "TaskOutboxRepository.add_many",
+        lambda s: TaskOutboxRepository(s).add_many("noop", [[2], [3]]),
+    ),
+    PlanCase(
+        "TaskOutboxRepository.get_pending",
+        lambda s: TaskOutboxRepository(s).get_pending(100),
+        # Oldest first by primary key, stopping at `limit`; relayed rows are deleted
+        frozenset({"task_outbox"}),
+    ),
+    PlanCase(
+        "TaskOutboxRepository.record_failure",
+        lambda s: TaskOutboxRepository(s).record_failure([1, 2], "broker down"),
+    ),
+    PlanCase(
+        "TaskOutboxRepository.delete_many",
+        lambda s: TaskOutboxRepository(s).delete_many([1]),
+    ),
+    PlanCase(
+        "PipelineCheckpointRepository.get",
+        lambda s: PipelineCheckpointRepository(s).get("job_page_promotion"),
+    ),
+    PlanCase(
+        "PipelineCheckpointRepository.set",
+        lambda s: PipelineCheckpointRepository(s).set("job_page_promotion", 42),
+    ),
+]
+
+
+def seed(db_url: str) -> None:
+    """Fill the tables the cases read with enough rows that a scan would matter"""
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Company),
+            [
+                {"id": i, "name": f"Acme {i}", "normalized_name": f"acme {i}"}
+                for i in range(1, COMPANIES + 2)
+            ],
+        )
+        conn.execute(
+            insert(PageBlob),
+            [
+                {
+                    "sha256": f"blob-{i}",
+                    "compression": "zstd",
+                    "size": 5,
+                    "compressed_size": 5,
+                    "data": PAGE_DATA,
+                }
+                for i in range(1, JOB_POSTS + 1)
+            ],
+        )
+        conn.execute(
+            insert(JobPage),
+            [
+                {
+                    "page_id": i,
+                    "url": f"https://jobs.example.com/{i}",
+                    "canonical_url": canonicalize_url(f"https://jobs.example.com/{i}"),
+                    "content_sha256": f"c{i}",
+                    "html_sha256": f"blob-{i}",
+                    "html_size": 5,
+                    "html_compression": "zstd",
+                }
+                for i in range(1, JOB_POSTS + 1)
+            ],
+        )
+        conn.execute(
+            insert(JobPost),
+            [
+                {
+                    "id": i,
+                    "company_id": i % COMPANIES + 1,
+                    "title": f"Engineer {i}",
+                    "description": "Build things",
+                    "job_page_id": i if i % 2 else None,
+                }
+                for i in range(1, JOB_POSTS + 1)
+            ],
+        )
+        conn.execute(
+            insert(SummarizedJob),
+            [
+                {
+                    "id": i,
+                    "job_post_id": i * 10,
+                    "summary": "Builds things",
+                    "technical_skills": "[]",
+                    "seniority_level": "Mid",
+                }
+                for i in range(1, JOB_POSTS // 10 + 1)
+            ],
+        )
+    engine.dispose()
+
+
+def full_scans(
+    db: sqlite3.Connection, statement: str, parameters: Any
+) -> tuple[list[str], set[str]]:
+    """EXPLAIN QUERY PLAN one statement: its plan lines and the tables it fully scans"""
+    plan = [row[-1] for row in db.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())]
+    scanned = {match for line in plan for match in FULL_SCAN.findall(line)}
+    return plan, scanned
+
+
+async def run_case(case: PlanCase, statements: list[tuple[str, Any]]) -> None:
+    statements.clear()
+    async with get_async_session_factory()() as session:
+        await case.call(session)
+
+
+def test_query_plans(db_path: Path, verbose: bool) -> None:
+    statements: list[tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(get_async_engine().sync_engine, "before_cursor_execute", record)
+    db = sqlite3.connect(db_path)
+    failures = []
+    explained = 0
+    for case in CASES:
+        asyncio.run(run_case(case, statements))
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith(EXPLAINED):
+                continue
+            plan, scanned = full_scans(db, statement, parameters)
+            explained += 1
+            if verbose:
+                print(f"{case.name}: {' | '.join(plan)}")
+            unexpected = scanned - case.allowed_scans
+            if unexpected:
+                failures.append(f"{case.name} scans {sorted(unexpected)}:\n  {statement}\n  {plan}")
+    db.close()
+
+    assert not failures, "Full table scans on hot paths:\n" + "\n".join(failures)
+    print(f"✓ {explained} statements from {len(CASES)} repository methods use indexes")
+
+
+def test_indexes_are_needed(db_path: Path) -> None:
+    """The hot lookups this suite guards would scan without their index"""
+    # No statement cache: a cached EXPLAIN would keep showing the dropped index
+    db = sqlite3.connect(db_path, cached_statements=0)
+    checks = [
+        ("uq_company_normalized_name", "SELECT id FROM company WHERE normalized_name = ?", ("x",)),
+        ("ix_job_post_company_id", "SELECT id FROM job_post WHERE company_id = ?", (7,)),
+    ]
+    for index, statement, parameters in checks:
+        _, scanned = full_scans(db, statement, parameters)
+        assert not scanned, (index, scanned)
+        db.execute(f"DROP INDEX {index}")
+        _, scanned = full_scans(db, statement, parameters)
+        assert scanned, (index, "planner still avoids a scan without the index")
+    db.close()
+    print("✓ Dropping uq_company_normalized_name / ix_job_post_company_id brings back full scans")
+
+
+if __name__ == "__main__":
+    verbose = "-v" in sys.argv[1:]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "plans.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        seed(f"sqlite:///{db_path}")
+
+        test_query_plans(db_path, verbose)
+        asyncio.run(dispose_async_engine())
+        test_indexes_are_needed(db_path)
+    print("\nAll query plan tests passed")
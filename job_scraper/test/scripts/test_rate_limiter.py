@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM rate limiter.
+
+Usage:
+    python test/scripts/test_rate_limiter.py
+
+Checks 429 detection and retry-after parsing, then drives LLMRateLimiter
+with small budgets: requests and tokens past the budget wait for the
+bucket to refill, a 429 blocks callers for retry-after (or an exponential
+backoff), and AIService retries a rate-limited call on a local stand-in
+chat model. Runs on in-process buckets, checks that an unreachable Redis
+falls back to them, and when a Redis server answers at REDIS_URL, that two
+limiters for the same model share one budget there.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import redis.asyncio as redis
+
+from src.hoarder.services.ai_service import AIService
+from src.hoarder.utils import rate_limiter
+from src.hoarder.utils.rate_limiter import (
+    LLMRateLimiter,
+    RateLimit,
+    estimate_tokens,
+    get_rate_limiter,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+from src.hoarder.utils.settings import settings
+
+
+class RateLimited(Exception):
+    """Shaped like the OpenAI/Anthropic SDK errors: status_code plus the HTTP response"""
+
+    def __init__(self, headers: dict[str, str]):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        self.response = SimpleNamespace(status_code=429, headers=headers)
+
+
+class StandInLLM:
+    """Answers with a 429 (retry-after 0.2s) first, then succeeds"""
+
+    def __init__(self) -> None:
+        self.calls: list[float] = []
+
+    async def ainvoke(self, messages):
+        self.calls.append(time.monotonic())
+        if len(self.calls) == 1:
+            raise RateLimited({"retry-after": "0.2"})
+        return SimpleNamespace(content='{"summary": "ok"}')
+
+
+def use_redis(enabled: bool, url: Optional[str] = None) -> None:
+    settings.llm_rate_limit_use_redis = enabled
+    settings.redis_url = url or settings.redis_url
+    rate_limiter._redis = None  # rebuilt from the settings on next use
+    rate_limiter._redis_down_until = 0.0
+
+
+async def timed(coroutine) -> float:
+    start = time.monotonic()
+    await coroutine
+    return time.monotonic() - start
+
+
+def test_errors() -> None:
+    assert estimate_tokens("a" * 400, "b" * 400) == 200
+    assert is_rate_limit_error(RateLimited({}))
+    assert not is_rate_limit_error(ValueError("bad request"))
+    assert retry_after_seconds(RateLimited({"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(RateLimited({"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(RateLimited({"retry-after": "soon"})) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+    print("✓ 429s are recognized and retry-after(-ms) is read")
+
+
+async def test_local_buckets() -> None:
+    use_redis(False)
+
+    # 600 requests per minute refill one every 0.1s once the bucket is empty
+    limiter = LLMRateLimiter("test", "requests", RateLimit(600, 10_000_000))
+    assert await timed(asyncio.gather(*(limiter.acquire(1) for _ in range(600)))) < 0.1
+    assert 0.09 <= await timed(limiter.acquire(1)) < 0.3
+    print("✓ Requests past the per-minute budget wait for the bucket to refill")
+
+    # 6000 tokens per minute refill 100 per second
+    limiter = LLMRateLimiter("test", "tokens", RateLimit(1000, 6000))
+    assert await timed(limiter.acquire(10_000)) < 0.1  # capped at the whole budget
+    assert 0.45 <= await timed(limiter.acquire(50)) < 0.8
+    print("✓ Tokens past the per-minute budget wait for the bucket to refill")
+
+    limiter = LLMRateLimiter("test", "backoff", RateLimit(1000, 1_000_000))
+    assert await limiter.backoff(0.3) == 0.3
+    assert 0.29 <= await timed(limiter.acquire(1)) < 0.5
+    limiter.succeeded()
+    assert limiter.strikes == 0
+    assert [await limiter.backoff() for _ in range(3)] == [1.0, 2.0, 4.0]
+    settings.llm_max_backoff = 3.0
+    try:
+        assert await limiter.backoff() == 3.0
+    finally:
+        settings.llm_max_backoff = 60.0
+    print("✓ A 429 blocks callers for retry-after, else backs off exponentially up to the cap")
+
+
+def test_limiter_registry() -> None:
+    assert get_rate_limiter("openai", "gpt-4o-mini") is get_rate_limiter("openai", "gpt-4o-mini")
+    assert get_rate_limiter("anthropic", "claude").limit == RateLimit(50, 40_000)
+    settings.llm_requests_per_minute = 7
+    try:
+        assert get_rate_limiter("openai", "custom").limit == RateLimit(7, 200_000)
+    finally:
+        settings.llm_requests_per_minute = 0
+    print("✓ One limiter per provider/model, with provider defaults and setting overrides")
+
+
+async def test_ai_service_retries() -> None:
+    use_redis(False)
+    ai_service = AIService(session=None)  # _complete never touches the database
+    ai_service.llm = llm = StandInLLM()
+    content = await ai_service._complete("system", "user", asyncio.Semaphore(1))
+    assert content == '{"summary": "ok"}' and len(llm.calls) == 2, llm.calls
+    assert llm.calls[1] - llm.calls[0] >= 0.2, llm.calls
+    assert ai_service.rate_limiter.strikes == 0
+    print("✓ AIService waits out a 429's retry-after, then retries")
+
+
+async def test_redis_buckets() -> None:
+    use_redis(True, "redis://127.0.0.1:1/0")  # nothing listens on port 1
+    limiter = LLMRateLimiter("test", "fallback", RateLimit(600, 10_000_000))
+    assert await timed(limiter.acquire(1)) < 0.1
+    assert rate_limiter._redis_down_until > time.monotonic()
+    print("✓ With Redis unreachable the limiter falls back to in-process buckets")
+
+    use_redis(True, os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    client = rate_limiter._get_redis()
+    try:
+        await client.ping()
+    except redis.RedisError:
+        print("- No Redis server at REDIS_URL, skipping shared buckets")
+        await client.aclose()
+        return
+
+    # Two workers' limiters for one model draw from one budget of 60 requests
+    limit = RateLimit(60, 10_000_000)
+    first, second = LLMRateLimiter("test", "shared", limit), LLMRateLimiter("test", "shared", limit)
+    await client.delete(first.key)
+    try:
+        await asyncio.gather(*(first.acquire(1) for _ in range(30)))
+        await asyncio.gather(*(second.acquire(1) for _ in range(30)))
+        assert 0.9 <= await timed(second.acquire(1)) < 1.5
+    finally:
+        await client.delete(first.key)
+        await client.aclose()
+    print("✓ With Redis, limiters for the same model share one budget")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")  # the stand-in makes no API calls
+
+    test_errors()
+    asyncio.run(test_local_buckets())
+    test_limiter_registry()
+    asyncio.run(test_ai_service_retries())
+    asyncio.run(test_redis_buckets())
+    print("\nAll rate limiter tests passed")
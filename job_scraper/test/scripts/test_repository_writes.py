@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test script for set-based repository updates and deletes.
+
+Usage:
+    python test/scripts/test_repository_writes.py
+
+Runs against a throwaway SQLite database and checks that updates are a
+single UPDATE ... RETURNING that leaves loaded objects current, that storing
+many pages looks up the compression dictionary once, and that the bulk
+deletes clean up after themselves: deleted pages detach their job posts and
+drop blobs nothing else uses, deleted posts take their summaries along, and
+companies that still have posts are kept.
+"""
+
+import asyncio
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, event, func, select, update
+
+from src.hoarder.models import Base, JobPage, PageBlob, SummarizedJob
+from src.hoarder.repositories import (
+    CompanyRepository,
+    JobPageRepository,
+    JobPostRepository,
+    SummarizedJobRepository,
+)
+from src.hoarder.repositories.company import company_id_cache
+from src.hoarder.utils.database import (
+    dispose_async_engine,
+    get_async_engine,
+    get_async_session_factory,
+)
+from src.hoarder.utils.settings import settings
+
+
+@contextmanager
+def count_statements():
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_async_engine().sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def keywords(statements: list[str]) -> list[str]:
+    return [statement.split()[0].upper() for statement in statements]
+
+
+async def count(session, model) -> int:
+    return (await session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+async def test_updates() -> None:
+    async with get_async_session_factory()() as session:
+        companies = CompanyRepository(session)
+        job_posts = JobPostRepository(session)
+        company = await companies.create("Acme")
+        job_post = await job_posts.create(company.id, "Engineer", "Build robots")
+
+        with count_statements() as statements:
+            updated = await job_posts.update(job_post.id, title="Staff Engineer")
+        assert keywords(statements) == ["UPDATE"], statements
+        assert updated is job_post and job_post.title == "Staff Engineer", updated
+        print("✓ An update is one UPDATE ... RETURNING and refreshes the loaded object")
+
+        assert (await job_posts.update(job_post.id)).title == "Staff Engineer"
+        assert await job_posts.update(10_000, title="Missing") is None
+        print("✓ Updating nothing returns the row; updating a missing row returns None")
+
+        renamed = await companies.update(company.id, name="  ACME Corp")
+        assert renamed.normalized_name == "acme corp", renamed
+        assert await companies.get_or_create_id("acme corp") == company.id
+        print("✓ Company renames keep normalized_name in step")
+
+
+async def test_page_deletes() -> None:
+    async with get_async_session_factory()() as session:
+        pages = JobPageRepository(session)
+        job_posts = JobPostRepository(session)
+        company = await CompanyRepository(session).create("Initech")
+
+        shared = [
+            await pages.create(f"https://jobs.example.com/{i}", "<p>same</p>") for i in (1, 2)
+        ]
+        own = await pages.create("https://jobs.example.com/3", "<p>only mine</p>")
+        promoted = await job_posts.create(company.id, "SRE", "Keep it up", job_page_id=own.page_id)
+        assert await count(session, PageBlob) == 2
+
+        updated = await pages.update(shared[1].page_id, page_html="<p>new</p>")
+        assert updated.html_sha256 != shared[0].html_sha256
+        assert await count(session, PageBlob) == 3
+        await pages.update(shared[1].page_id, page_html="<p>same</p>")
+        assert await count(session, PageBlob) == 2
+        print("✓ Replacing a page's HTML drops the blob it no longer uses")
+
+        batch = JobPageRepository(session)
+        with count_statements() as statements:
+            stored = [
+                await batch.create(f"https://jobs.example.com/{i}", f"<p>page {i}</p>")
+                for i in range(5, 8)
+            ]
+        lookups = [statement for statement in statements if "compression_dictionary" in statement]
+        assert len(lookups) == 1, lookups
+        assert await batch.get_html(stored[-1].page_id) == "<p>page 7</p>"
+        assert await batch.delete_many([job_page.page_id for job_page in stored]) == 3
+        print("✓ Storing pages looks up the compression dictionary once per repository")
+
+        assert await pages.delete_many([shared[0].page_id, own.page_id, 10_000]) == 2
+        assert await count(session, PageBlob) == 1  # "<p>same</p>" is still used by page 2
+        await session.refresh(promoted)
+        assert promoted.job_page_id is None, promoted
+        print("✓ Deleting pages detaches their job posts and drops unused blobs only")
+
+        recent = await pages.create("https://jobs.example.com/4", "<p>recent</p>")
+        await session.execute(
+            update(JobPage)
+            .where(JobPage.page_id == shared[1].page_id)
+            .values(created_at=datetime.now() - timedelta(days=90))
+        )
+        await session.commit()
+        assert await pages.delete_created_before(datetime.now() - timedelta(days=30)) == 1
+        remaining = (await session.execute(select(JobPage.page_id))).scalars().all()
+        assert remaining == [recent.page_id], remaining
+        print("✓ delete_created_before removes only pages older than the cutoff")
+
+
+async def test_post_and_company_deletes() -> None:
+    async with get_async_session_factory()() as session:
+        companies = CompanyRepository(session)
+        job_posts = JobPostRepository(session)
+        summaries = SummarizedJobRepository(session)
+
+        busy_id = await companies.get_or_create_id("Globex")
+        idle_id = await companies.get_or_create_id("Hooli")
+        posts = [await job_posts.create(busy_id, f"Role {i}", "Do things") for i in range(3)]
+        for job_post in posts:
+            await summaries.create(job_post.id, "Summary", "[]", "Senior")
+
+        assert await job_posts.delete(posts[0].id)
+        assert await job_posts.delete_many([posts[1].id, 10_000]) == 1
+        assert await count(session, SummarizedJob) == 1
+        print("✓ Deleting job posts deletes their summaries too")
+
+        assert await companies.delete_many([busy_id, idle_id]) == 1
+        assert await companies.get_by_id(busy_id) is not None
+        assert company_id_cache.get("hooli") is None and company_id_cache.get("globex") == busy_id
+        print("✓ Companies with job posts are kept; deleted ones leave the cache")
+
+        remaining = await summaries.get_by_job_post_id(posts[2].id)
+        assert await summaries.delete_many([remaining.id]) == 1
+        assert await job_posts.delete(posts[2].id) and await companies.delete(busy_id)
+        assert await job_posts.get_by_company_id(busy_id) == []
+        assert await companies.get_by_id(busy_id) is None
+        print("✓ Summaries, then posts, then their company can be deleted by ID")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "writes.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+        asyncio.run(test_updates())
+        asyncio.run(test_page_deletes())
+        asyncio.run(test_post_and_company_deletes())
+        asyncio.run(dispose_async_engine())
+    print("\nAll repository write tests passed")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for compressed request bodies and the decoded size cap.
+
+Usage:
+    python test/scripts/test_request_decompression.py
+
+Drives RequestDecompressionMiddleware directly over ASGI with gzip, zstd
+and plain bodies split into chunks, and checks that bodies within the limit
+reach the app decoded, while highly compressible bodies that expand past the
+limit get 413 without ever being decoded whole.
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import zstandard
+
+from src.hoarder.api.decompression import RequestDecompressionMiddleware
+
+LIMIT = 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+
+
+async def post(body: bytes, encoding: str | None = None) -> tuple[int, bytes]:
+    """POST `body` in chunks through the middleware; return the status and what the app read"""
+    received: list[bytes] = []
+
+    async def app(scope, receive, send) -> None:
+        message = await receive()
+        received.append(message["body"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    chunks = [body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    sent: list[dict] = []
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    headers = [(b"content-encoding", encoding.encode())] if encoding else []
+    scope = {"type": "http", "method": "POST", "path": "/", "headers": headers}
+    await RequestDecompressionMiddleware(app, max_body_size=LIMIT)(scope, receive, send)
+    return sent[0]["status"], b"".join(received)
+
+
+async def test_decoding() -> None:
+    payload = json.dumps([{"url": f"https://jobs.example.com/{i}"} for i in range(2000)]).encode()
+
+    assert await post(gzip.compress(payload), "gzip") == (200, payload)
+    assert await post(zstandard.ZstdCompressor().compress(payload), "zstd") == (200, payload)
+    assert await post(payload) == (200, payload)
+    print("✓ gzip, zstd and plain bodies within the limit reach the app decoded")
+
+    status, _ = await post(b"not zstd at all", "zstd")
+    assert status == 400, status
+    status, _ = await post(payload, "br")
+    assert status == 415, status
+    print("✓ Corrupt bodies get 400 and unknown encodings 415")
+
+
+async def test_size_cap() -> None:
+    # A few KB that expand to 200 MB; decoding must stop just past the limit
+    bomb = b"\0" * (200 * 1024 * 1024)
+    zstd_bomb = zstandard.ZstdCompressor(level=19).compress(bomb)
+    gzip_bomb = gzip.compress(bomb, compresslevel=9)
+    assert len(zstd_bomb) < LIMIT and len(gzip_bomb) < LIMIT
+
+    for encoding, body in (("zstd", zstd_bomb), ("gzip", gzip_bomb)):
+        tracemalloc.start()
+        status, received = await post(body, encoding)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert (status, received) == (413, b""), (encoding, status)
+        assert peak < 4 * LIMIT, (encoding, peak)
+    print("✓ Highly compressible zstd and gzip bodies past the limit get 413")
+
+    status, _ = await post(b"x" * (LIMIT + 1))
+    assert status == 413, status
+    print("✓ Plain bodies past the limit get 413")
+
+
+if __name__ == "__main__":
+    asyncio.run(test_decoding())
+    asyncio.run(test_size_cap())
+    print("\nAll request decompression tests passed")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-domain site extractors.
+
+Usage:
+    python test/scripts/test_site_extractors.py [--benchmark]
+
+Checks URL dispatch, then runs every page in test/fixtures/sites through
+extract_job with every installed parser backend and compares the result
+against test/fixtures/sites/expected.json. With --benchmark, also reports
+pages/sec per board and backend.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.hoarder.extraction import PARSER_BACKENDS, extract_job, get_site_extractor, parse_html
+
+FIXTURES = project_root / "test" / "fixtures" / "sites"
+ROUNDS = 200
+
+
+def load_fixtures() -> dict[str, tuple[str, dict]]:
+    expected = json.loads((FIXTURES / "expected.json").read_text(encoding="utf-8"))
+    return {
+        name: ((FIXTURES / f"{name}.html").read_text(encoding="utf-8"), case)
+        for name, case in expected.items()
+    }
+
+
+def test_dispatch() -> None:
+    cases = {
+        "https://boards.greenhouse.io/acme/jobs/1": "greenhouse",
+        "https://JOBS.LEVER.CO/globex/abc": "lever",
+        "https://acme.wd5.myworkdayjobs.com/en-US/External/job/x": "workday",
+        "https://www.linkedin.com/jobs/view/123": "linkedin",
+        "https://careers.example.com/jobs/1": "generic",
+        "https://notlinkedin.com/jobs/1": "generic",
+        "not a url": "generic",
+    }
+    for url, name in cases.items():
+        assert get_site_extractor(url).name == name, (url, get_site_extractor(url).name)
+    print("✓ Dispatch by domain")
+
+
+def test_fixture(name: str, html: str, case: dict, backend: str) -> None:
+    assert get_site_extractor(case["url"]).name == case["extractor"]
+    data = extract_job(parse_html(html, backend), case["url"])
+
+    assert data.title == case["title"], (name, data.title)
+    assert data.company_name == case["company_name"], (name, data.company_name)
+    assert data.description, name
+    for text in case["description_contains"]:
+        assert text in data.description, f"{name}: missing {text!r} in {data.description!r}"
+    for text in case["description_excludes"]:
+        assert text not in data.description, f"{name}: boilerplate {text!r} left in description"
+    print(f"✓ {name} ({backend})")
+
+
+def benchmark_site_extractors(fixtures: dict[str, tuple[str, dict]]) -> None:
+    print(f"\nBenchmarking extract_job, {ROUNDS} rounds per page\n")
+    for name, (html, case) in fixtures.items():
+        rates = []
+        for backend in PARSER_BACKENDS:
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                extract_job(parse_html(html, backend), case["url"])
+            rates.append(f"{backend} {ROUNDS / (time.perf_counter() - start):8.1f} pages/s")
+        print(f"{name:<16} " + "  ".join(rates))
+
+
+if __name__ == "__main__":
+    fixtures = load_fixtures()
+
+    test_dispatch()
+    for backend in PARSER_BACKENDS:
+        for name, (html, case) in fixtures.items():
+            test_fixture(name, html, case, backend)
+    print("\nAll site extractor tests passed")
+
+    if "--benchmark" in sys.argv[1:]:
+        benchmark_site_extractors(fixtures)
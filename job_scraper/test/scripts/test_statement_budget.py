@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for eager loading and the SQL statement budget.
+
+Usage:
+    python test/scripts/test_statement_budget.py
+
+Checks that statement_budget counts statements across nested blocks and
+asyncio tasks and fails past its budget, then seeds a throwaway SQLite
+database and checks that related data loaded through the repositories'
+with_* options costs a fixed number of queries however many rows come back,
+while an unplanned lazy load raises instead of querying.
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import InvalidRequestError
+
+from src.hoarder.models import Base
+from src.hoarder.repositories import (
+    CompanyRepository,
+    JobPostRepository,
+    SummarizedJobRepository,
+    UnitOfWork,
+)
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+from src.hoarder.utils.statement_budget import (
+    StatementBudgetExceeded,
+    count_statements,
+    statement_budget,
+)
+
+COMPANIES = 5
+POSTS_PER_COMPANY = 4
+
+
+async def test_budget() -> None:
+    async with get_async_session_factory()() as session:
+
+        async def ping() -> None:
+            await session.execute(text("SELECT 1"))
+
+        with count_statements("outer") as outer:
+            with statement_budget(2, "inner") as inner:
+                await ping()
+                await asyncio.gather(asyncio.create_task(ping()))
+            await ping()
+        assert (inner.count, outer.count) == (2, 3), (inner.count, outer.count)
+        print("✓ Statements count towards every enclosing counter, across asyncio tasks")
+
+        try:
+            with statement_budget(1, "too many"):
+                await ping()
+                await ping()
+        except StatementBudgetExceeded as e:
+            assert "too many ran 2 SQL statements (budget 1)" in str(e), e
+            assert "SELECT 1" in str(e), e
+        else:
+            raise AssertionError("budget was not enforced")
+
+        try:
+            with statement_budget(0):
+                raise KeyError("own error")
+        except KeyError:
+            pass
+        print("✓ Exceeding the budget fails with the offending SQL; other errors pass through")
+
+
+async def seed() -> None:
+    async with get_async_session_factory()() as session:
+        async with UnitOfWork(session) as uow:
+            for c in range(COMPANIES):
+                company_id = await uow.companies.get_or_create_id(f"Company {c}")
+                for p in range(POSTS_PER_COMPANY):
+                    job_post = await uow.job_posts.create(company_id, f"Role {c}.{p}", "Do things")
+                    await uow.summarized_jobs.create(job_post.id, "Summary", "[]", "Senior")
+
+
+async def test_eager_loading() -> None:
+    posts = COMPANIES * POSTS_PER_COMPANY
+
+    async with get_async_session_factory()() as session:
+        with statement_budget(1, "job posts with companies"):
+            job_posts = await JobPostRepository(session).get_all(with_company=True)
+            names = {job_post.company.name for job_post in job_posts}
+        assert len(job_posts) == posts and len(names) == COMPANIES, names
+
+        with statement_budget(1, "job posts by ID with companies"):
+            job_posts = await JobPostRepository(session).get_by_ids(
+                [1, 2, 3], with_description=True, with_company=True
+            )
+            assert [job_post.company.name for job_post in job_posts] == ["Company 0"] * 3
+        print(f"✓ {posts} job posts and their companies load in one query")
+
+    async with get_async_session_factory()() as session:
+        with statement_budget(2, "companies with job posts"):
+            companies = await CompanyRepository(session).get_all(with_job_posts=True)
+            assert sum(len(company.job_posts) for company in companies) == posts
+        print(f"✓ {COMPANIES} companies and their job posts load in two queries")
+
+    async with get_async_session_factory()() as session:
+        with statement_budget(1, "summaries with job posts"):
+            summaries = await SummarizedJobRepository(session).get_all(with_job_post=True)
+            titles = [
+                f"{summary.job_post.title} at {summary.job_post.company.name}"
+                for summary in summaries
+            ]
+        assert len(titles) == posts and titles[0] == "Role 0.0 at Company 0", titles
+        print(f"✓ {posts} summaries with their job posts and companies load in one query")
+
+    async with get_async_session_factory()() as session:
+        job_post = await JobPostRepository(session).get_by_id(1)
+        try:
+            job_post.company
+        except InvalidRequestError:
+            pass
+        else:
+            raise AssertionError("lazy load did not raise")
+        company = await CompanyRepository(session).get_by_id(job_post.company_id)
+        with statement_budget(0, "company already in the session"):
+            assert job_post.company is company
+        print("✓ Lazy loads that need SQL raise; identity-map hits still work")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "budget.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+        asyncio.run(test_budget())
+        asyncio.run(seed())
+        asyncio.run(test_eager_loading())
+        asyncio.run(dispose_async_engine())
+    print("\nAll statement budget tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for JSON-LD, microdata and OpenGraph job extraction.
+
+Usage:
+    python test/scripts/test_structured_data.py
+
+Checks that title, company, description, salary and skills are read from
+each kind of structured data, with every installed parser backend.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.hoarder.extraction import PARSER_BACKENDS, extract_structured_data, parse_html, parse_salary
+
+JSON_LD_PAGE = """
+<html><head>
+<meta property="og:title" content="Backend Engineer | Example Board">
+<meta property="og:site_name" content="Example Board">
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "WebSite", "name": "Example Board"},
+  {"@type": "JobPosting",
+   "title": "Backend Engineer",
+   "description": "&lt;p&gt;Build APIs in &lt;b&gt;Go&lt;/b&gt;.&lt;/p&gt;&lt;p&gt;Apply now&lt;/p&gt;",
+   "hiringOrganization": {"@type": "Organization", "name": "Acme Corp"},
+   "industry": "Software",
+   "skills": "Go, PostgreSQL, Kubernetes",
+   "baseSalary": {"@type": "MonetaryAmount", "currency": "USD",
+                  "value": {"@type": "QuantitativeValue", "minValue": 60, "maxValue": 75, "unitText": "HOUR"}}}
+]}
+</script>
+</head><body><h1>Ignored heading</h1></body></html>
+"""
+
+MICRODATA_PAGE = """
+<html><body>
+<div itemscope itemtype="https://schema.org/JobPosting">
+  <h1 itemprop="title">Data Scientist</h1>
+  <div itemprop="hiringOrganization" itemscope itemtype="https://schema.org/Organization">
+    <span itemprop="name">Globex</span>
+  </div>
+  <div itemprop="baseSalary" itemscope itemtype="https://schema.org/MonetaryAmount">
+    <meta itemprop="currency" content="USD">
+    <span itemprop="value" itemscope itemtype="https://schema.org/QuantitativeValue">
+      <meta itemprop="minValue" content="120000"><meta itemprop="maxValue" content="150000">
+      <meta itemprop="unitText" content="YEAR">
+    </span>
+  </div>
+  <div itemprop="description"><p>Model churn.</p><p>Model churn.</p></div>
+</div>
+</body></html>
+"""
+
+OPEN_GRAPH_PAGE = """
+<html><head>
+<meta property="og:title" content="QA Engineer">
+<meta property="og:site_name" content="Initech">
+<meta property="og:description" content="Teaser text">
+</head><body><p>Full description</p></body></html>
+"""
+
+
+def test_json_ld(backend: str) -> None:
+    data = extract_structured_data(parse_html(JSON_LD_PAGE, backend))
+
+    assert data.title == "Backend Engineer", data
+    assert data.company_name == "Acme Corp", data
+    assert data.description == "Build APIs in Go.", data
+    assert data.industry == "Software", data
+    assert (data.salary_min, data.salary_max) == (124800, 156000), data
+    assert data.technical_skills == ["Go", "PostgreSQL", "Kubernetes"], data
+    assert data.summary_fields() == {
+        "estimated_salary_min": 124800,
+        "estimated_salary_max": 156000,
+        "technical_skills": ["Go", "PostgreSQL", "Kubernetes"],
+    }
+    print(f"✓ JSON-LD ({backend})")
+
+
+def test_microdata(backend: str) -> None:
+    data = extract_structured_data(parse_html(MICRODATA_PAGE, backend))
+
+    assert data.title == "Data Scientist", data
+    assert data.company_name == "Globex", data
+    assert data.description == "Model churn.", data
+    assert (data.salary_min, data.salary_max) == (120000, 150000), data
+    assert data.technical_skills is None
+    print(f"✓ Microdata ({backend})")
+
+
+def test_open_graph(backend: str) -> None:
+    data = extract_structured_data(parse_html(OPEN_GRAPH_PAGE, backend))
+
+    assert data.title == "QA Engineer", data
+    assert data.company_name == "Initech", data
+    assert data.description is None, "og:description teasers must not replace the page text"
+    assert data.summary_fields() == {}
+    print(f"✓ OpenGraph ({backend})")
+
+
+def test_parse_salary() -> None:
+    assert parse_salary(95000) == (95000, 95000)
+    assert parse_salary({"currency": "USD", "value": "$85,000"}) == (85000, 85000)
+    assert parse_salary({"currency": "EUR", "value": 70000}) == (None, None)
+    assert parse_salary({"minValue": 5000, "unitText": "MONTH"}) == (60000, None)
+    print("✓ Salary parsing")
+
+
+if __name__ == "__main__":
+    for backend in PARSER_BACKENDS:
+        test_json_ld(backend)
+        test_microdata(backend)
+        test_open_graph(backend)
+    test_parse_salary()
+    print("\nAll structured data tests passed")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM summary cache.
+
+Usage:
+    python test/scripts/test_summary_cache.py
+
+Against a throwaway SQLite database: checks that cache keys ignore case and
+spacing but not the model or prompt version, that misses, hits and expired
+entries are counted and evicted as they should be, and that summarizing a
+repost of cached content skips the LLM (a local stand-in chat model, no API
+calls), while a malformed response is not cached, and that a description
+saved without a cleaned copy is cleaned once, off the event loop. Then
+switches Redis on: with Redis unreachable the cache falls back to SQLite,
+and when a Redis server answers at REDIS_URL, hits are served from it.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import redis.asyncio as redis
+from sqlalchemy import create_engine, func, select, update
+
+from src.hoarder.models import Base, SummaryCacheEntry
+from src.hoarder.repositories import UnitOfWork
+from src.hoarder.services import ai_service as ai_service_module, summary_cache
+from src.hoarder.services.ai_service import AIService
+from src.hoarder.services.summary_cache import SummaryCache, summary_cache_key
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+
+RESULT = {"summary": "Builds pipelines", "technical_skills": ["Python"], "seniority_level": "Mid"}
+
+
+class StandInLLM:
+    def __init__(self, result: Optional[dict] = None) -> None:
+        self.calls = 0
+        self.result = result or RESULT
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return SimpleNamespace(content=json.dumps(self.result))
+
+
+def use_redis(enabled: bool, url: Optional[str] = None) -> None:
+    settings.summary_cache_use_redis = enabled
+    settings.redis_url = url or settings.redis_url
+    summary_cache._redis = None  # rebuilt from the settings on next use
+
+
+async def age_entries(session, seconds: int, column=SummaryCacheEntry.created_at) -> None:
+    """Move cache timestamps back, as CURRENT_TIMESTAMP only has one-second resolution"""
+    past = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=seconds)
+    await session.execute(update(SummaryCacheEntry).values({column: past}))
+    await session.commit()
+
+
+async def count_entries(session) -> int:
+    count = select(func.count()).select_from(SummaryCacheEntry)
+    return (await session.execute(count)).scalar_one()
+
+
+def test_keys() -> None:
+    key = summary_cache_key("Data Engineer", "Build  pipelines", "Acme", "gpt-4o-mini", "2")
+    assert key == summary_cache_key("data engineer ", "build pipelines", "ACME", "gpt-4o-mini", "2")
+    assert key != summary_cache_key("Data Engineer", "Build pipelines", "Acme", "gpt-4o", "2")
+    assert key != summary_cache_key("Data Engineer", "Build pipelines", "Acme", "gpt-4o-mini", "3")
+    print("✓ Keys ignore case and spacing, but not the model or prompt version")
+
+
+async def test_sqlite_tier() -> None:
+    use_redis(False)
+    async with get_async_session_factory()() as session:
+        cache = SummaryCache(session)
+        assert cache.redis is None
+        stats_before = dict(summary_cache._stats)
+
+        assert await cache.get("a" * 64) is None
+        await cache.put("a" * 64, "gpt-4o-mini", "2", RESULT)
+        assert await cache.get("a" * 64) == RESULT
+        assert summary_cache._stats["misses"] == stats_before["misses"] + 1
+        assert summary_cache._stats["db_hits"] == stats_before["db_hits"] + 1
+        print("✓ A miss, then a put, then a hit from SQLite, each counted")
+
+        await age_entries(session, settings.summary_cache_ttl + 60)
+        assert await cache.get("a" * 64) is None
+        await cache.put("b" * 64, "gpt-4o-mini", "2", RESULT)
+        assert await count_entries(session) == 1
+        print("✓ Expired entries miss and are evicted on the next put")
+
+        settings.summary_cache_max_entries = 2
+        try:
+            await cache.put("c" * 64, "gpt-4o-mini", "2", RESULT)
+            await age_entries(session, 60, SummaryCacheEntry.last_used_at)
+            assert await cache.get("b" * 64) == RESULT  # now the most recently used
+            await cache.put("d" * 64, "gpt-4o-mini", "2", RESULT)
+            keys = set((await session.execute(select(SummaryCacheEntry.key))).scalars())
+            assert keys == {"b" * 64, "d" * 64}, keys
+        finally:
+            settings.summary_cache_max_entries = 50_000
+        print("✓ Past max entries, the least recently used entry is evicted")
+
+
+async def test_reposts_skip_llm() -> None:
+    use_redis(False)
+    async with get_async_session_factory()() as session:
+        async with UnitOfWork(session) as uow:
+            company_id = await uow.companies.get_or_create_id("Initech")
+            first, repost = [
+                await uow.job_posts.create(company_id, title, "Build  the data platform.")
+                for title in ("Data Engineer", "data engineer")
+            ]
+
+        llm = StandInLLM()
+        ai_service = AIService(session)
+        ai_service.llm = llm
+        assert (await ai_service.summarize_job(first.id)).summary == RESULT["summary"]
+        assert (await ai_service.summarize_job(repost.id)).summary == RESULT["summary"]
+        assert llm.calls == 1, llm.calls
+        print("✓ A repost of cached content is summarized without calling the LLM")
+
+
+async def test_malformed_response_not_cached() -> None:
+    use_redis(False)
+    async with get_async_session_factory()() as session:
+        async with UnitOfWork(session) as uow:
+            company_id = await uow.companies.get_or_create_id("Umbrella")
+            first, repost = [
+                await uow.job_posts.create(company_id, "Platform Engineer", "Run the platform.")
+                for _ in range(2)
+            ]
+        entries = await count_entries(session)
+
+        ai_service = AIService(session)
+        ai_service.llm = StandInLLM({"summary": "No seniority", "technical_skills": ["Go"]})
+        assert await ai_service.summarize_job(first.id) is None
+        assert await count_entries(session) == entries
+
+        ai_service.llm = llm = StandInLLM()
+        assert (await ai_service.summarize_job(repost.id)).summary == RESULT["summary"]
+        assert llm.calls == 1, llm.calls
+        print("✓ A malformed response is neither saved nor cached, so a repost asks the LLM again")
+
+
+async def test_description_cleaned_once() -> None:
+    use_redis(False)
+    async with get_async_session_factory()() as session:
+        async with UnitOfWork(session) as uow:
+            company_id = await uow.companies.get_or_create_id("Hooli")
+            job_post = await uow.job_posts.create(
+                company_id, "Site Reliability Engineer", "<div><p>Keep it up.</p></div>"
+            )
+
+        threads: list[int] = []
+        clean_description = ai_service_module.clean_description
+
+        def counting_clean(description: str) -> str:
+            threads.append(threading.get_ident())
+            return clean_description(description)
+
+        ai_service_module.clean_description = counting_clean
+        try:
+            ai_service = AIService(session)
+            ai_service.llm = StandInLLM()
+            assert await ai_service.summarize_job(job_post.id) is not None
+        finally:
+            ai_service_module.clean_description = clean_description
+        assert len(threads) == 1 and threads[0] != threading.get_ident(), threads
+        print("✓ A description without a cleaned copy is cleaned once, in a worker thread")
+
+
+async def test_redis_switch() -> None:
+    use_redis(True, "redis://127.0.0.1:1/0")  # nothing listens on port 1
+    async with get_async_session_factory()() as session:
+        cache = SummaryCache(session)
+        assert cache.redis is not None
+        await cache.put("e" * 64, "gpt-4o-mini", "2", RESULT)
+        assert await cache.get("e" * 64) == RESULT
+        print("✓ With Redis unreachable the cache falls back to SQLite")
+
+    use_redis(True, os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        await summary_cache._get_redis().ping()
+    except redis.RedisError:
+        print("- No Redis server at REDIS_URL, skipping the Redis tier")
+        return
+
+    async with get_async_session_factory()() as session:
+        cache = SummaryCache(session)
+        key = "f" * 64
+        await cache.put(key, "gpt-4o-mini", "2", RESULT)
+        redis_hits = summary_cache._stats["redis_hits"]
+        assert await cache.get(key) == RESULT
+        assert summary_cache._stats["redis_hits"] == redis_hits + 1
+        await cache.redis.delete(summary_cache.REDIS_KEY_PREFIX + key)
+    await summary_cache._get_redis().aclose()
+    print("✓ With Redis enabled, hits are served from Redis")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")  # the stand-in makes no API calls
+    settings.llm_rate_limit_use_redis = False
+
+    test_keys()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "summary_cache.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+        asyncio.run(test_sqlite_tier())
+        asyncio.run(test_reposts_skip_llm())
+        asyncio.run(test_malformed_response_not_cached())
+        asyncio.run(test_description_cleaned_once())
+        asyncio.run(test_redis_switch())
+        asyncio.run(dispose_async_engine())
+    print("\nAll summary cache tests passed")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for canonical job page URLs and duplicate-capture detection.
+
+Usage:
+    python test/scripts/test_url_canonicalization.py
+
+Checks canonicalize_url on common tracking variants, then saves fixture
+pages into a throwaway SQLite database under several URL variants, one at a
+time and in batches, and checks that duplicates resolve to the existing
+capture (no new row, no promotion task), changed content becomes a new
+version, content that changes back resolves to the earlier version (now
+the latest), pages stored without a content hash are keyed by their HTML,
+and the duplicate lookup is served by the unique index.
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import IntegrityError
+
+from src.hoarder.models import Base, JobPage, TaskOutbox
+from src.hoarder.services.job_page_service import JobPageService
+from src.hoarder.utils.database import dispose_async_engine, get_async_session_factory
+from src.hoarder.utils.settings import settings
+from src.hoarder.utils.urls import canonicalize_url
+
+FIXTURE_HTML = (project_root / "test" / "fixtures" / "sites" / "greenhouse.html").read_text(
+    encoding="utf-8"
+)
+CHANGED_HTML = FIXTURE_HTML.replace("Senior Platform Engineer", "Staff Platform Engineer")
+URL = "https://boards.greenhouse.io/acmerobotics/jobs/4012345"
+
+
+def test_canonicalize_url() -> None:
+    variants = [
+        URL,
+        URL + "/",
+        URL + "?gh_src=8a7f6e#app",
+        URL + "?utm_source=linkedin&utm_medium=social",
+        "HTTPS://Boards.Greenhouse.IO:443/acmerobotics/jobs/4012345",
+    ]
+    canonical = [canonicalize_url(url) for url in variants]
+    assert set(canonical) == {URL}, canonical
+    print("✓ Tracking params, fragments, trailing slashes, case and default ports are dropped")
+
+    assert (
+        canonicalize_url("https://www.indeed.com/viewjob?jk=abc123&from=serp&utm_campaign=x")
+        == "https://www.indeed.com/viewjob?from=serp&jk=abc123"
+    )
+    assert canonicalize_url("https://example.com/Jobs/ABC") == "https://example.com/Jobs/ABC"
+    assert canonicalize_url("http://localhost:8080/job") == "http://localhost:8080/job"
+    print("✓ Identifying params, path case and non-default ports are kept")
+
+
+async def count_rows(session) -> tuple[int, int]:
+    pages = (await session.execute(select(func.count()).select_from(JobPage))).scalar_one()
+    tasks = (await session.execute(select(func.count()).select_from(TaskOutbox))).scalar_one()
+    return pages, tasks
+
+
+async def test_duplicate_captures() -> None:
+    async with get_async_session_factory()() as session:
+        job_page_service = JobPageService(session)
+
+        first = await job_page_service.create_job_page(URL + "?gh_src=abc", FIXTURE_HTML)
+        assert not first.duplicate and first.job_page.canonical_url == URL, first
+        first_sha256 = first.job_page.content_sha256
+        churned_html = FIXTURE_HTML.replace("</body>", "<!-- t --></body>")
+        again = await job_page_service.create_job_page(
+            URL + "/?utm_source=linkedin#apply", churned_html
+        )
+        assert again.duplicate and again.job_page.page_id == first.job_page.page_id, again
+        assert await count_rows(session) == (1, 1)
+        print("✓ A URL variant with the same job content resolves to the existing page")
+
+        changed = await job_page_service.create_job_page(URL + "?utm_source=x", CHANGED_HTML)
+        assert not changed.duplicate and changed.job_page.page_id != first.job_page.page_id
+        latest = await job_page_service.get_job_page_by_url(URL + "#top")
+        assert latest.page_id == changed.job_page.page_id, latest
+        print("✓ Changed content is stored as a new version; lookups return the latest")
+
+        reverted = await job_page_service.create_job_page(URL, FIXTURE_HTML)
+        assert reverted.duplicate and reverted.job_page.page_id == first.job_page.page_id
+        latest = await job_page_service.get_job_page_by_url(URL)
+        assert latest.page_id == first.job_page.page_id, latest
+        assert await count_rows(session) == (2, 2)
+        print("✓ Content that changes back resolves to the earlier page, which becomes the latest")
+
+        other_url = "https://jobs.lever.co/acme/9f8e7d"
+        results = await job_page_service.create_job_pages(
+            [
+                (URL + "?ref=newsletter", FIXTURE_HTML),
+                (other_url, FIXTURE_HTML),
+                (other_url + "?lever-source=LinkedIn", FIXTURE_HTML),
+                ("not a url", FIXTURE_HTML),
+            ]
+        )
+        assert results[0].page_id == first.job_page.page_id and results[0].duplicate, results
+        assert results[1].page_id and not results[1].duplicate, results
+        assert results[2].page_id == results[1].page_id and results[2].duplicate, results
+        assert results[3].error, results
+        assert await count_rows(session) == (3, 3)
+        print("✓ Batches report stored and in-batch duplicates with the existing page_id")
+
+        repo = job_page_service.job_page_repo
+        unhashed = await repo.create("https://example.com/job/1", "<p>No job content</p>")
+        assert unhashed.content_sha256 == unhashed.html_sha256, unhashed
+        try:
+            await repo.create("https://example.com/job/1?utm_source=x", "<p>No job content</p>")
+        except IntegrityError:
+            await session.rollback()
+        else:
+            raise AssertionError("a page stored without a content hash was saved twice")
+        assert await count_rows(session) == (4, 3)
+        print("✓ Pages stored without a content hash are keyed (and deduplicated) by their HTML")
+
+        plan = await session.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT page_id FROM job_page "
+                "WHERE canonical_url = :url AND content_sha256 = :sha256"
+            ),
+            {"url": URL, "sha256": first_sha256},
+        )
+        detail = " ".join(row[-1] for row in plan)
+        assert "uq_job_page_canonical_url_content_sha256" in detail, detail
+        print(f"✓ Duplicate lookup uses the unique index ({detail})")
+
+
+if __name__ == "__main__":
+    test_canonicalize_url()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "canonical.db"
+        settings.db_url = f"sqlite+aiosqlite:///{db_path}"
+        Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+
+        asyncio.run(test_duplicate_captures())
+        asyncio.run(dispose_async_engine())
+    print("\nAll URL canonicalization tests passed")